@@ -2,7 +2,7 @@ import os
 import json
 import logging
 from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
-from datetime import datetime
+from datetime import datetime, timedelta
 from flask import Flask, request, g, session, current_app
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager, current_user
@@ -10,13 +10,36 @@ import pymysql
 from dotenv import load_dotenv
 import uuid
 from app.utils.daily_logger import setup_logger  # 새 로깅 모듈 import
+from app.utils.activity_writer import ActivityLogWriter
+from app.utils.activity_recorder import ActivityRecorder
+from app.utils.log_formatter import StructuredJsonFormatter
+from app.utils.category_cache import CategoryCache
+from app.utils.user_cache import UserCache
+from app.utils.response_size import measure_response_size
+from app.utils.session_store import init_session_store
+from app.utils.page_cursor import PageCursorStore
+from app.utils.request_metrics import RequestMetrics
+from app.utils.query_stats import QueryInstrumentation
+from app.utils.activity_classifier import ActivityClassifier
+from app.utils.db_pool import DatabasePool, build_engine_options
+from app.utils.db_router import DatabaseRouter, RoutingSession, replica_binds
 
 # .env 파일 로드
 load_dotenv()
 
-# SQLAlchemy 객체 생성
-db = SQLAlchemy()
+# SQLAlchemy 객체 생성 (읽기 복제본 라우팅 세션)
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 login_manager = LoginManager()
+activity_writer = ActivityLogWriter()
+activity_recorder = ActivityRecorder(activity_writer)
+category_cache = CategoryCache()
+user_cache = UserCache()
+request_metrics = RequestMetrics()
+query_instrumentation = QueryInstrumentation()
+activity_classifier = ActivityClassifier()
+db_pool = DatabasePool()
+db_router = DatabaseRouter()
+page_cursors = PageCursorStore()
 
 def create_app():
     app = Flask(__name__, 
@@ -25,19 +48,107 @@ def create_app():
     
     # 설정 로드
     app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev_key')
-    app.config['SQLALCHEMY_DATABASE_URI'] = f"mysql+pymysql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
+    # DATABASE_URL 이 있으면 우선 사용 (로컬 부하 테스트용 SQLite 등), 없으면 DB_* 설정으로 MySQL 연결
+    app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL') or f"mysql+pymysql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    # DB 연결 풀 설정 (MySQL 은 유휴 연결을 끊으므로 DB_POOL_RECYCLE 을 wait_timeout 보다 짧게 유지)
+    pool_settings = dict(
+        pool_size=int(os.getenv('DB_POOL_SIZE', 5)),
+        max_overflow=int(os.getenv('DB_MAX_OVERFLOW', 10)),
+        pool_timeout=int(os.getenv('DB_POOL_TIMEOUT', 30)),
+        pool_recycle=int(os.getenv('DB_POOL_RECYCLE', 1800)),
+        pool_pre_ping=os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true',
+        connect_timeout=int(os.getenv('DB_CONNECT_TIMEOUT', 10)),
+    )
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = build_engine_options(app.config['SQLALCHEMY_DATABASE_URI'], **pool_settings)
+    # 읽기 복제본 (쉼표로 여러 개) - 카탈로그/검색 뷰의 조회만 복제본으로, 쓰기 이후 DB_REPLICA_STICKY_SECONDS 동안 주 DB
+    app.config['SQLALCHEMY_BINDS'] = {
+        key: {'url': url, **build_engine_options(url, **pool_settings)}
+        for key, url in replica_binds(os.getenv('REPLICA_DATABASE_URLS')).items()
+    }
+    app.config['DB_REPLICA_STICKY_SECONDS'] = float(os.getenv('DB_REPLICA_STICKY_SECONDS', 5))
+    # 워커 시작 시 연결 풀/캐시 준비 (gunicorn post_worker_init), 미리 열 연결 수 (기본 DB_POOL_SIZE)
+    app.config['DB_WARMUP'] = os.getenv('DB_WARMUP', 'true').lower() == 'true'
+    app.config['DB_WARMUP_CONNECTIONS'] = int(os.getenv('DB_WARMUP_CONNECTIONS')) if os.getenv('DB_WARMUP_CONNECTIONS') else None
     app.config['UPLOAD_FOLDER'] = os.getenv('UPLOAD_FOLDER', '../static/uploads')
     
+    # 활동 로그 비동기 일괄 저장 설정
+    app.config['ACTIVITY_LOG_ASYNC'] = os.getenv('ACTIVITY_LOG_ASYNC', 'true').lower() == 'true'
+    app.config['ACTIVITY_LOG_QUEUE_SIZE'] = int(os.getenv('ACTIVITY_LOG_QUEUE_SIZE', 10000))
+    app.config['ACTIVITY_LOG_BATCH_SIZE'] = int(os.getenv('ACTIVITY_LOG_BATCH_SIZE', 500))
+    app.config['ACTIVITY_LOG_FLUSH_INTERVAL'] = float(os.getenv('ACTIVITY_LOG_FLUSH_INTERVAL', 1.0))
+    
+    # event_type 별 샘플링/저장 정책 파일 (JSON, 없으면 모든 이벤트를 파일+DB에 기록)
+    app.config['ACTIVITY_POLICY_FILE'] = os.getenv('ACTIVITY_POLICY_FILE')
+    
+    # 날짜별 파일 핸들러 모드 (default | buffered) 및 버퍼 flush 조건
+    app.config['LOG_HANDLER_MODE'] = os.getenv('LOG_HANDLER_MODE', 'default')
+    app.config['LOG_BUFFER_SIZE'] = int(os.getenv('LOG_BUFFER_SIZE', 64 * 1024))
+    app.config['LOG_FLUSH_INTERVAL'] = float(os.getenv('LOG_FLUSH_INTERVAL', 1.0))
+    app.config['LOG_FLUSH_LEVEL'] = os.getenv('LOG_FLUSH_LEVEL', 'ERROR')
+    
+    # 멀티 프로세스 로그 수집기 설정 (gunicorn.conf.py 가 수집기 프로세스를 실행)
+    app.config['LOG_COLLECTOR_ENABLED'] = os.getenv('LOG_COLLECTOR_ENABLED', 'false').lower() == 'true'
+    app.config['LOG_COLLECTOR_SOCKET'] = os.getenv('LOG_COLLECTOR_SOCKET')
+    
+    # 로그 압축 및 보관 기간 정리 설정
+    app.config['LOG_MAINTENANCE_ENABLED'] = os.getenv('LOG_MAINTENANCE_ENABLED', 'false').lower() == 'true'
+    app.config['LOG_RETENTION_DAYS'] = int(os.getenv('LOG_RETENTION_DAYS', 30))
+    app.config['LOG_MAINTENANCE_INTERVAL'] = int(os.getenv('LOG_MAINTENANCE_INTERVAL', 3600))
+    
+    # 큐 기반 파일 로깅 설정 (LOG_QUEUE_OVERFLOW: block | drop_oldest | sample)
+    app.config['LOG_QUEUE_ENABLED'] = os.getenv('LOG_QUEUE_ENABLED', 'false').lower() == 'true'
+    app.config['LOG_QUEUE_SIZE'] = int(os.getenv('LOG_QUEUE_SIZE', 10000))
+    app.config['LOG_QUEUE_OVERFLOW'] = os.getenv('LOG_QUEUE_OVERFLOW', 'block')
+    app.config['LOG_QUEUE_SAMPLE_RATE'] = int(os.getenv('LOG_QUEUE_SAMPLE_RATE', 10))
+    
+    # 카테고리 트리 캐시 유효 시간 (초, 0 이면 요청마다 DB 조회)
+    app.config['CATEGORY_CACHE_TTL'] = float(os.getenv('CATEGORY_CACHE_TTL', 300))
+    
+    # 요청 간 사용자 행 캐시 (초, 0 이면 요청 안에서만 재사용) 및 최대 사용자 수
+    app.config['USER_CACHE_TTL'] = float(os.getenv('USER_CACHE_TTL', 0))
+    app.config['USER_CACHE_SIZE'] = int(os.getenv('USER_CACHE_SIZE', 10000))
+    
+    # 세션 저장소 (cookie | memory | sqlite | redis) - cookie 외에는 쿠키에 세션 ID 만 저장
+    app.config['SESSION_BACKEND'] = os.getenv('SESSION_BACKEND', 'cookie')
+    app.config['SESSION_SQLITE_PATH'] = os.getenv('SESSION_SQLITE_PATH', './sessions.sqlite3')
+    app.config['SESSION_REDIS_URL'] = os.getenv('SESSION_REDIS_URL', 'redis://localhost:6379/0')
+    app.config['SESSION_TTL'] = int(os.getenv('SESSION_TTL', 7 * 24 * 3600))
+    # 세션 저장소 만료와 쿠키 만료를 같은 값으로
+    app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(seconds=app.config['SESSION_TTL'])
+    
+    # 요청 단계별 지연 시간 지표 (/metrics) - 워커 간 합산용 스냅샷 디렉터리
+    app.config['METRICS_ENABLED'] = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'
+    app.config['METRICS_DIR'] = os.getenv('METRICS_DIR')
+    app.config['METRICS_FLUSH_INTERVAL'] = float(os.getenv('METRICS_FLUSH_INTERVAL', 5.0))
+    
+    # 요청별 SQL 쿼리 수/DB 시간/느린 쿼리 수집 및 N+1 의심 기준 (같은 모양 쿼리 반복 횟수)
+    app.config['SQL_INSTRUMENTATION_ENABLED'] = os.getenv('SQL_INSTRUMENTATION_ENABLED', 'true').lower() == 'true'
+    app.config['SQL_SLOW_QUERY_COUNT'] = int(os.getenv('SQL_SLOW_QUERY_COUNT', 3))
+    app.config['SQL_N_PLUS_ONE_THRESHOLD'] = int(os.getenv('SQL_N_PLUS_ONE_THRESHOLD', 5))
+    
     # 인스턴스 초기화
+    # (request_metrics 는 요청 시작/종료 시각을 재야 하므로 다른 before/after_request 보다 먼저 등록)
+    request_metrics.init_app(app)
+    query_instrumentation.init_app(app)
     db.init_app(app)
+    db_router.init_app(app)
     login_manager.init_app(app)
+    activity_writer.init_app(app)
+    activity_recorder.init_app(app)
+    category_cache.init_app(app)
+    user_cache.init_app(app)
+    db_pool.init_app(app)
+    request_metrics.register_samples(db_pool.metric_samples)
     login_manager.login_view = 'auth.login'
     
     # 로깅 설정
     # 날짜별 로깅 설정 적용
     setup_logger(app)
     
+    # 서버 측 세션 저장소 (로깅 설정 이후 - 대체 경고를 로그로 남기기 위함)
+    init_session_store(app)
+    
     # 블루프린트 등록
     from app.routes.auth import auth_bp
     from app.routes.main import main_bp
@@ -49,22 +160,22 @@ def create_app():
     app.register_blueprint(products_bp)
     app.register_blueprint(api_bp, url_prefix='/api')
     
+    # 블루프린트가 등록한 endpoint 별 활동 분류기 조회 테이블 생성
+    activity_classifier.init_app(app)
+    
     # 요청 처리 전에 실행되는 함수
     @app.before_request
     def before_request():
-        g.user = None
-        if 'user_id' in session:
-            from app.models.user import User
-            g.user = User.query.get(session['user_id'])
+        # 로그인 사용자 (Flask-Login 의 load_user 와 같은 요청 범위 캐시를 사용하므로 조회는 최대 1번)
+        user_id = session.get('_user_id') or session.get('user_id')
+        g.user = user_cache.get(user_id) if user_id else None
         
         # 요청 고유 ID 생성
         g.request_id = str(uuid.uuid4())
         
-        # 모든 요청에서 카테고리 목록 가져오기
-        # 내비게이션 메뉴에서 사용하기 위함
+        # 내비게이션 메뉴용 카테고리 트리 (프로세스 내 캐시 스냅샷, DB 조회 없음)
         if not request.path.startswith('/static'):
-            from app.models import Category
-            g.all_categories = Category.query.all()
+            g.category_tree = category_cache.get()
         
         # 시작 시간 기록
         g.request_start_time = datetime.now()
@@ -87,8 +198,8 @@ def create_app():
     def after_request(response):
         from flask_login import current_user
         
-        # 정적 파일은 로깅 제외
-        if request.path.startswith('/static'):
+        # 정적 파일과 지표 수집 요청은 로깅 제외
+        if request.path.startswith('/static') or request.endpoint == 'metrics':
             return response
         
         # 이전 페이지 체류 시간 계산 및 로깅
@@ -97,13 +208,12 @@ def create_app():
         
         # 페이지 및 API 호출 타임스탬프 기록 (JavaScript 호출이 없는 페이지를 위한 백업)
         if not current_path.startswith('/api/log/'):  # 로깅 API 자체는 제외
-            # 이전 페이지 경로와 시간이 세션에 있으면 체류 시간 계산
-            if 'last_page' in session and 'last_page_time' in session:
-                last_path = session.get('last_page')
-                last_time_str = session.get('last_page_time')
+            # 현재 페이지를 기록하고, 같은 세션의 이전 페이지가 있으면 체류 시간 계산 (세션 밖 저장소)
+            previous_page = page_cursors.swap(g.session_id, current_path, current_time)
+            if previous_page is not None:
+                last_path, last_time = previous_page
                 
                 try:
-                    last_time = datetime.fromisoformat(last_time_str)
                     dwell_time_seconds = (current_time - last_time).total_seconds()
                     
                     # 유효한 체류 시간인 경우에만 로깅 (1초부터 30분까지)
@@ -131,51 +241,49 @@ def create_app():
                             'ip_address': request.remote_addr
                         }
                         
-                        # 로깅
-                        activity_logger = logging.getLogger('user_activity')
-                        activity_logger.info(json.dumps(log_data))
-                        
-                        # DB에 저장 (필요한 경우)
-                        if product_id:
-                            from app.models.log import UserActivityLog
-                            try:
-                                log_entry = UserActivityLog(
-                                    user_id=current_user.id if current_user.is_authenticated else None,
-                                    session_id=g.session_id if hasattr(g, 'session_id') else None,
-                                    activity_type='page_dwell',
-                                    entity_type='product',
-                                    entity_id=product_id,
-                                    details=json.dumps(log_data),
-                                    ip_address=request.remote_addr,
-                                    user_agent=request.user_agent.string if request.user_agent else "Unknown"
-                                )
-                                db.session.add(log_entry)
-                                db.session.commit()
-                            except Exception as e:
-                                db.session.rollback()
-                                app.logger.error(f"체류 시간 DB 저장 오류: {str(e)}")
+                        # 파일 로깅 + DB 저장 (상품 페이지인 경우만) - event_type 별 정책 적용
+                        activity_recorder.record(
+                            log_data,
+                            db=bool(product_id),
+                            user_id=current_user.id if current_user.is_authenticated else None,
+                            session_id=g.session_id if hasattr(g, 'session_id') else None,
+                            activity_type='page_dwell',
+                            entity_type='product',
+                            entity_id=product_id
+                        )
                 except Exception as e:
                     app.logger.error(f"체류 시간 계산 오류: {str(e)}")
-            
-            # 현재 페이지 정보 세션에 저장 (다음 요청에서 체류 시간 계산용)
-            session['last_page'] = current_path
-            session['last_page_time'] = current_time.isoformat()
         
         # 모든 웹 요청에 대해 activity 로그 기록 (정적 파일 제외)
-        log_activity(request, response)
+        with request_metrics.phase('activity_log'):
+            log_activity(request, response)
         
         # 요청 처리 결과 로깅
         processing_time = (datetime.now() - g.request_start_time).total_seconds() * 1000
+        
+        # 응답 크기 - 본문을 읽지 않음 (스트리밍 응답은 전송이 끝난 뒤 보낸 바이트 수를 따로 기록)
+        method, path, request_id = request.method, request.path, g.request_id
+        
+        def log_streamed(bytes_sent, completed):
+            app.logger.info(f"스트리밍 응답 종료: {method} {path} - {bytes_sent}바이트",
+                            extra={"data": {
+                                "request_id": request_id,
+                                "response": {"bytes_sent": bytes_sent, "completed": completed}
+                            }})
+        
+        content_length = measure_response_size(response, log_streamed)
         log_data = {
             "data": {
                 "response": {
                     "status_code": response.status_code,
                     "content_type": response.content_type,
-                    "content_length": len(response.get_data()) if response.get_data() else 0
+                    "content_length": content_length,
+                    "streamed": content_length is None and response.is_streamed
                 },
                 "performance": {
                     "processing_time_ms": processing_time
-                }
+                },
+                "db": query_instrumentation.summary()
             }
         }
         
@@ -197,73 +305,6 @@ def setup_logging(app):
     log_dir = os.getenv('LOG_PATH', '../logs')
     os.makedirs(log_dir, exist_ok=True)
     
-    # JSON 형식 포맷터 정의
-    class JsonFormatter(logging.Formatter):
-        def format(self, record):
-            log_record = {
-                "timestamp": datetime.now().isoformat(),
-                "level": record.levelname,
-                "message": record.getMessage(),
-                "module": record.module,
-                "function": record.funcName,
-                "line": record.lineno,
-                "path": record.pathname
-            }
-            
-            # 예외 정보 추가
-            if record.exc_info:
-                log_record["exception"] = {
-                    "type": record.exc_info[0].__name__,
-                    "message": str(record.exc_info[1]),
-                    "traceback": self.formatException(record.exc_info)
-                }
-            
-            # 요청 정보 추가 - 애플리케이션 컨텍스트 내에서만 실행
-            try:
-                from flask import g, request, current_app, has_request_context
-                from flask_login import current_user
-                
-                if has_request_context():
-                    if hasattr(g, 'request_id'):
-                        log_record["request_id"] = g.request_id
-                    
-                    if hasattr(g, 'user') and g.user:
-                        log_record["user_id"] = g.user.id
-                        
-                    if hasattr(current_user, 'id') and current_user.is_authenticated:
-                        log_record["auth_user_id"] = current_user.id
-                    
-                    # HTTP 요청 정보가 있는 경우 추가
-                    try:
-                        log_record["http"] = {
-                            "method": request.method,
-                            "url": request.url,
-                            "path": request.path,
-                            "endpoint": request.endpoint,
-                            "ip": request.remote_addr,
-                            "user_agent": request.user_agent.string if request.user_agent else None,
-                            "referrer": request.referrer
-                        }
-                    except:
-                        # request 객체가 없는 경우 예외 발생
-                        pass
-                    
-                    # 성능 정보 추가
-                    if hasattr(g, 'request_start_time'):
-                        processing_time = (datetime.now() - g.request_start_time).total_seconds()
-                        log_record["performance"] = {
-                            "processing_time_ms": processing_time
-                        }
-            except:
-                # 애플리케이션 컨텍스트 외부에서 실행 시 예외 처리
-                pass
-            
-            # 추가 속성이 있으면 로그에 포함
-            if hasattr(record, 'data') and record.data:
-                log_record.update(record.data)
-                
-            return json.dumps(log_record)
-    
     # 일반 로그 설정 - JSON 포맷
     app_log_file = os.path.join(log_dir, 'app.log')
     app_handler = TimedRotatingFileHandler(
@@ -274,7 +315,7 @@ def setup_logging(app):
         encoding='utf-8'
     )
     app_handler.suffix = '%Y-%m-%d'  # 날짜 접미사 형식 설정
-    app_handler.setFormatter(JsonFormatter())
+    app_handler.setFormatter(StructuredJsonFormatter())
     app_handler.setLevel(logging.INFO)
     app.logger.addHandler(app_handler)
     
@@ -311,56 +352,28 @@ def setup_logging(app):
     # 콘솔 로그 추가 (개발 시 편리함)
     if app.debug:
         console_handler = logging.StreamHandler()
-        console_handler.setFormatter(JsonFormatter())
+        console_handler.setFormatter(StructuredJsonFormatter())
         console_handler.setLevel(logging.DEBUG)
         app.logger.addHandler(console_handler)
         activity_logger.addHandler(console_handler)
 
 def log_activity(request, response=None):
     """사용자 활동을 JSON 형식으로 로깅"""
-    from app.models.log import UserActivityLog
     import traceback
     from flask_login import current_user
     
     try:
-        # 로거 가져오기
-        activity_logger = logging.getLogger('user_activity')
-        
-        # 활동 타입 결정
-        activity_type = None
-        entity_type = None
-        entity_id = None
-        details = {}
-        
-        if '/products/' in request.path and request.method == 'GET':
-            activity_type = 'view'
-            entity_type = 'product'
-            try:
-                entity_id = int(request.path.split('/')[-1])
-            except:
-                pass
-        elif '/search' in request.path:
-            activity_type = 'search'
-            details['search_query'] = request.args.get('q', '')
-            details['results_count'] = 0  # 실제 결과 수는 응답을 처리한 후에 추가
-        elif '/cart/add' in request.path:
-            activity_type = 'cart_add'
-            entity_type = 'product'
-            entity_id = request.form.get('product_id')
-        elif '/cart/remove' in request.path:
-            activity_type = 'cart_remove'
-            entity_type = 'product'
-            entity_id = request.form.get('product_id')
-        elif '/auth/login' in request.path and request.method == 'POST':
-            activity_type = 'login_attempt'
-            details['username_attempt'] = request.form.get('username', '') or request.form.get('email', '')
-        elif '/auth/register' in request.path and request.method == 'POST':
-            activity_type = 'register_attempt'
+        # 활동 타입 결정 (endpoint 별 분류기 - 각 블루프린트에서 등록)
+        event = activity_classifier.classify(request)
+        activity_type = event.activity_type
+        entity_type = event.entity_type
+        entity_id = event.entity_id
+        details = dict(event.details) if event.details else {}
         
         # 기본 로그 데이터 구성
         log_data = {
             "timestamp": datetime.now().isoformat(),
-            "session_id": request.cookies.get('session', 'no_session'),
+            "session_id": g.get('session_id') or 'no_session',
             "event_type": activity_type or 'page_view',
             "user_id": current_user.id if current_user.is_authenticated else None,
             "entity_type": entity_type,
@@ -388,25 +401,17 @@ def log_activity(request, response=None):
                 process_time = (datetime.now() - g.request_start_time).total_seconds()
                 log_data["process_time"] = process_time
         
-        # 로그 기록
-        activity_logger.info(json.dumps(log_data))
-        
-        # DB에 로그 저장
-        activity_log = UserActivityLog(
+        # 파일/DB 기록 - event_type 별 샘플링/저장 정책 적용
+        # (DB는 요청 스레드에서 커밋하지 않고 백그라운드 writer에 위임)
+        activity_recorder.record(
+            log_data,
             user_id=current_user.id if current_user.is_authenticated else None,
-            session_id=request.cookies.get('session', 'no_session'),
+            session_id=g.get('session_id') or 'no_session',
             activity_type=activity_type or 'page_view',
             entity_type=entity_type,
-            entity_id=entity_id,
-            details=json.dumps(log_data),
-            ip_address=request.remote_addr,
-            user_agent=request.user_agent.string if request.user_agent else "Unknown"
+            entity_id=entity_id
         )
-        
-        db.session.add(activity_log)
-        db.session.commit()
     except Exception as e:
         # 오류가 있어도 기본 기능 작동을 방해하지 않도록 예외 처리
         print(f"로그 기록 중 오류 발생: {e}")
-        traceback.print_exc()
-        db.session.rollback()  # DB 트랜잭션 롤백 
\ No newline at end of file
+        traceback.print_exc() 
\ No newline at end of file
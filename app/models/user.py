@@ -1,7 +1,7 @@
 from werkzeug.security import generate_password_hash, check_password_hash
 from flask_login import UserMixin
 from datetime import datetime
-from app import db, login_manager
+from app import db, login_manager, user_cache
 
 class User(db.Model, UserMixin):
     __tablename__ = 'users'
@@ -31,4 +31,5 @@ class User(db.Model, UserMixin):
 
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id)) 
\ No newline at end of file
+    # before_request 의 g.user 와 같은 요청 범위 조회 계층 사용
+    return user_cache.get(user_id) 
\ No newline at end of file
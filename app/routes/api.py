@@ -1,14 +1,15 @@
 from flask import Blueprint, jsonify, request, g, current_app
 from flask_login import current_user, login_required
-from app import db
+from app import db, activity_writer, activity_recorder, activity_classifier, db_pool, db_router
+from app.utils.activity_classifier import ActivityEvent
 from app.models import Product, Category, Order
-import json
-import logging
+from app.utils.daily_logger import get_log_queue_stats
 from datetime import datetime
 
 api_bp = Blueprint('api', __name__)
 
 @api_bp.route('/products', methods=['GET'])
+@db_router.replica_reads
 def get_products():
     """상품 목록 API"""
     category_id = request.args.get('category_id', type=int)
@@ -33,12 +34,14 @@ def get_products():
     return jsonify(result)
 
 @api_bp.route('/products/<int:product_id>', methods=['GET'])
+@db_router.replica_reads
 def get_product(product_id):
     """상품 상세 정보 API"""
     product = Product.query.get_or_404(product_id)
     return jsonify(product.to_dict())
 
 @api_bp.route('/categories', methods=['GET'])
+@db_router.replica_reads
 def get_categories():
     """카테고리 목록 API"""
     categories = Category.query.all()
@@ -49,7 +52,13 @@ def get_categories():
         'parent_id': category.parent_id
     } for category in categories])
 
+@activity_classifier.register('api.search_products')
+def classify_search_products(request):
+    """상품 검색 API"""
+    return ActivityEvent('search', details={'search_query': request.args.get('q', ''), 'results_count': 0})
+
 @api_bp.route('/search', methods=['GET'])
+@db_router.replica_reads
 def search_products():
     """상품 검색 API"""
     query = request.args.get('q', '')
@@ -98,6 +107,81 @@ def get_order(order_id):
     
     return jsonify(order.to_dict())
 
+@api_bp.route('/health', methods=['GET'])
+def health():
+    """서비스 상태 및 활동 로그 writer 지표 API"""
+    return jsonify({
+        'status': 'ok',
+        'activity_writer': activity_writer.stats(),
+        'activity_recorder': activity_recorder.stats(),
+        'log_queue': get_log_queue_stats(),
+        'db_pool': db_pool.stats()
+    })
+
+# 배치 요청 한 번에 허용하는 최대 이벤트 수
+MAX_BATCH_EVENTS = 500
+
+def _build_dwell_log(data, user_id, session_id):
+    """체류 시간 이벤트 로그 데이터 구성"""
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'event_type': 'page_dwell',
+        'user_id': user_id,
+        'session_id': session_id,
+        'product_id': data.get('product_id'),
+        'dwell_time_seconds': data.get('dwell_time_seconds'),
+        'max_scroll_percentage': data.get('max_scroll_percentage', 0),
+        'path': data.get('path'),
+        'referrer': data.get('referrer'),
+        'user_agent': request.user_agent.string if request.user_agent else "Unknown",
+        'ip_address': request.remote_addr
+    }
+
+def _build_click_log(data, user_id, session_id):
+    """클릭 이벤트 로그 데이터 구성"""
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'event_type': 'click_event',
+        'user_id': user_id,
+        'session_id': session_id,
+        'product_id': data.get('product_id'),
+        'element_type': data.get('element_type'),
+        'element_text': data.get('element_text'),
+        'link_href': data.get('link_href'),
+        'position_x_percent': data.get('position_x_percent'),
+        'position_y_percent': data.get('position_y_percent'),
+        'is_cart_action': data.get('is_cart_action', False),
+        'path': data.get('path') or request.referrer,
+        'user_agent': request.user_agent.string if request.user_agent else "Unknown",
+        'ip_address': request.remote_addr
+    }
+
+def _validate_dwell_event(data):
+    """체류 시간 이벤트 검증 - 오류 메시지 또는 None 반환"""
+    dwell_time = data.get('dwell_time_seconds')
+    if isinstance(dwell_time, bool) or not isinstance(dwell_time, (int, float)) or dwell_time < 0:
+        return 'dwell_time_seconds must be a non-negative number'
+    return None
+
+def _validate_click_event(data):
+    """클릭 이벤트 검증 - 오류 메시지 또는 None 반환"""
+    if not data.get('element_type'):
+        return 'element_type is required'
+    return None
+
+# 배치 이벤트 타입별 (검증 함수, 로그 구성 함수, DB activity_type)
+BATCH_EVENT_TYPES = {
+    'dwell_time': (_validate_dwell_event, _build_dwell_log, 'page_dwell'),
+    'click_event': (_validate_click_event, _build_click_log, 'click_event'),
+}
+
+def _product_id_or_none(value):
+    """entity_id 컬럼에 저장할 상품 ID 변환"""
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
 @api_bp.route('/log/dwell-time', methods=['POST'])
 def log_dwell_time():
     """페이지 체류 시간 로깅 API"""
@@ -112,45 +196,22 @@ def log_dwell_time():
         session_id = g.session_id if hasattr(g, 'session_id') else None
         
         # 로그 데이터 구성
-        log_data = {
-            'timestamp': datetime.now().isoformat(),
-            'event_type': 'page_dwell',
-            'user_id': user_id,
-            'session_id': session_id,
-            'product_id': data.get('product_id'),
-            'dwell_time_seconds': data.get('dwell_time_seconds'),
-            'max_scroll_percentage': data.get('max_scroll_percentage', 0),
-            'path': data.get('path'),
-            'referrer': data.get('referrer'),
-            'user_agent': request.user_agent.string if request.user_agent else "Unknown",
-            'ip_address': request.remote_addr
-        }
-        
-        # 로깅
-        activity_logger = logging.getLogger('user_activity')
-        activity_logger.info(json.dumps(log_data))
+        log_data = _build_dwell_log(data, user_id, session_id)
         
-        # DB에도 저장 (필요한 경우)
-        from app.models.log import UserActivityLog
-        
-        log_entry = UserActivityLog(
+        # 파일/DB 기록 - event_type 별 샘플링/저장 정책 적용
+        activity_recorder.record(
+            log_data,
             user_id=user_id,
             session_id=session_id,
             activity_type='page_dwell',
             entity_type='product',
-            entity_id=data.get('product_id'),
-            details=json.dumps(log_data),
-            ip_address=request.remote_addr,
-            user_agent=request.user_agent.string if request.user_agent else "Unknown"
+            entity_id=_product_id_or_none(data.get('product_id'))
         )
-        db.session.add(log_entry)
-        db.session.commit()
         
         return jsonify({'success': True}), 201
     
     except Exception as e:
         current_app.logger.error(f"체류 시간 로깅 오류: {str(e)}")
-        db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
 @api_bp.route('/log/click-event', methods=['POST'])
@@ -167,46 +228,85 @@ def log_click_event():
         session_id = g.session_id if hasattr(g, 'session_id') else None
         
         # 로그 데이터 구성
-        log_data = {
-            'timestamp': datetime.now().isoformat(),
-            'event_type': 'click_event',
-            'user_id': user_id,
-            'session_id': session_id,
-            'product_id': data.get('product_id'),
-            'element_type': data.get('element_type'),
-            'element_text': data.get('element_text'),
-            'link_href': data.get('link_href'),
-            'position_x_percent': data.get('position_x_percent'),
-            'position_y_percent': data.get('position_y_percent'),
-            'is_cart_action': data.get('is_cart_action', False),
-            'path': request.referrer,
-            'user_agent': request.user_agent.string if request.user_agent else "Unknown",
-            'ip_address': request.remote_addr
-        }
-        
-        # 로깅
-        activity_logger = logging.getLogger('user_activity')
-        activity_logger.info(json.dumps(log_data))
+        log_data = _build_click_log(data, user_id, session_id)
         
-        # DB에도 저장 (필요한 경우)
-        from app.models.log import UserActivityLog
-        
-        log_entry = UserActivityLog(
+        # 파일/DB 기록 - event_type 별 샘플링/저장 정책 적용
+        activity_recorder.record(
+            log_data,
             user_id=user_id,
             session_id=session_id,
             activity_type='click_event',
             entity_type='product',
-            entity_id=data.get('product_id'),
-            details=json.dumps(log_data),
-            ip_address=request.remote_addr,
-            user_agent=request.user_agent.string if request.user_agent else "Unknown"
+            entity_id=_product_id_or_none(data.get('product_id'))
         )
-        db.session.add(log_entry)
-        db.session.commit()
         
         return jsonify({'success': True}), 201
     
     except Exception as e:
         current_app.logger.error(f"클릭 이벤트 로깅 오류: {str(e)}")
-        db.session.rollback()
-        return jsonify({'error': str(e)}), 500 
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
+
+@api_bp.route('/log/batch', methods=['POST'])
+def log_batch():
+    """
+    클라이언트 이벤트 일괄 로깅 API
+    요청 형식: {"events": [{"type": "dwell_time" | "click_event", ...}, ...]}
+    sendBeacon 요청은 Content-Type 이 다를 수 있으므로 본문을 JSON 으로 강제 파싱
+    """
+    payload = request.get_json(force=True, silent=True)
+    events = payload.get('events') if isinstance(payload, dict) else payload
+    
+    if not isinstance(events, list) or not events:
+        return jsonify({'error': 'No events provided'}), 400
+    
+    if len(events) > MAX_BATCH_EVENTS:
+        return jsonify({'error': f'Too many events (max {MAX_BATCH_EVENTS})'}), 413
+    
+    try:
+        # 사용자 정보는 배치 전체에 한 번만 계산
+        user_id = current_user.id if current_user.is_authenticated else None
+        session_id = g.session_id if hasattr(g, 'session_id') else None
+        
+        results = []
+        entries = []
+        
+        for index, event in enumerate(events):
+            event_type = event.get('type') if isinstance(event, dict) else None
+            if event_type not in BATCH_EVENT_TYPES:
+                results.append({'index': index, 'status': 'rejected', 'error': 'unknown event type'})
+                continue
+            
+            validate, build_log, activity_type = BATCH_EVENT_TYPES[event_type]
+            error = validate(event)
+            if error:
+                results.append({'index': index, 'status': 'rejected', 'error': error})
+                continue
+            
+            log_data = build_log(event, user_id, session_id)
+            if event.get('client_timestamp'):
+                log_data['client_timestamp'] = event.get('client_timestamp')
+            
+            entries.append((log_data, True, {
+                'user_id': user_id,
+                'session_id': session_id,
+                'activity_type': activity_type,
+                'entity_type': 'product',
+                'entity_id': _product_id_or_none(event.get('product_id'))
+            }))
+            results.append({'index': index, 'status': 'accepted'})
+        
+        if entries:
+            # 파일은 여러 줄을 한 번의 레코드로, DB는 배치 전체를 한 번에 writer 큐에 추가
+            activity_recorder.record_many(entries)
+        
+        accepted = len(entries)
+        return jsonify({
+            'success': accepted > 0,
+            'accepted': accepted,
+            'rejected': len(events) - accepted,
+            'results': results
+        }), 201 if accepted else 400
+    
+    except Exception as e:
+        current_app.logger.error(f"배치 이벤트 로깅 오류: {str(e)}")
+        return jsonify({'error': str(e)}), 500
@@ -1,11 +1,17 @@
 from flask import Blueprint, render_template, redirect, url_for, flash, request, session
 from werkzeug.security import check_password_hash
 from flask_login import login_user, logout_user, login_required, current_user
-from app import db
+from app import db, activity_recorder, activity_classifier
+from app.utils.activity_classifier import ActivityEvent
 from app.models import User
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/auth')
 
+@activity_classifier.register('auth.register', methods=['POST'])
+def classify_register(request):
+    """회원가입 시도"""
+    return ActivityEvent('register_attempt')
+
 @auth_bp.route('/register', methods=['GET', 'POST'])
 def register():
     """사용자 회원가입"""
@@ -58,6 +64,12 @@ def register():
     
     return render_template('auth/register.html')
 
+@activity_classifier.register('auth.login', methods=['POST'])
+def classify_login(request):
+    """로그인 시도"""
+    username = request.form.get('username', '') or request.form.get('email', '')
+    return ActivityEvent('login_attempt', details={'username_attempt': username})
+
 @auth_bp.route('/login', methods=['GET', 'POST'])
 def login():
     """사용자 로그인"""
@@ -80,10 +92,7 @@ def login():
             
             # 로그인 실패 로그 기록
             try:
-                import json
                 from datetime import datetime
-                import logging
-                from app.models.log import UserActivityLog
                 
                 # 로그 데이터 구성
                 log_data = {
@@ -96,26 +105,17 @@ def login():
                     'reason': 'invalid_credentials'
                 }
                 
-                # 로거를 통해 로깅
-                activity_logger = logging.getLogger('user_activity')
-                activity_logger.info(json.dumps(log_data))
-                
-                # DB에 로그 저장 - 실패한 사용자 이름으로 저장
-                log_entry = UserActivityLog(
+                # 파일/DB 기록 - event_type 별 샘플링/저장 정책 적용
+                activity_recorder.record(
+                    log_data,
                     user_id=None,  # 로그인 실패이므로 user_id는 None
                     session_id=session.get('session_id'),
                     activity_type='login_failed',
                     entity_type='auth',
-                    entity_id=None,
-                    details=json.dumps(log_data),
-                    ip_address=request.remote_addr,
-                    user_agent=request.user_agent.string if request.user_agent else "Unknown"
+                    entity_id=None
                 )
-                db.session.add(log_entry)
-                db.session.commit()
             except Exception as e:
                 print(f"로그인 실패 로깅 오류: {str(e)}")
-                db.session.rollback()
             
             return render_template('auth/login.html')
         
@@ -124,10 +124,7 @@ def login():
         
         # 명시적으로 로그인 로그 기록
         try:
-            import json
             from datetime import datetime
-            import logging
-            from app.models.log import UserActivityLog
             
             # 로그 데이터 구성
             log_data = {
@@ -140,26 +137,17 @@ def login():
                 'user_agent': request.user_agent.string if request.user_agent else "Unknown"
             }
             
-            # 로거를 통해 로깅
-            activity_logger = logging.getLogger('user_activity')
-            activity_logger.info(json.dumps(log_data))
-            
-            # DB에 로그 저장
-            log_entry = UserActivityLog(
+            # 파일/DB 기록 - event_type 별 샘플링/저장 정책 적용
+            activity_recorder.record(
+                log_data,
                 user_id=user.id,
                 session_id=session.get('session_id'),
                 activity_type='login',
                 entity_type='user',
-                entity_id=user.id,
-                details=json.dumps(log_data),
-                ip_address=request.remote_addr,
-                user_agent=request.user_agent.string if request.user_agent else "Unknown"
+                entity_id=user.id
             )
-            db.session.add(log_entry)
-            db.session.commit()
         except Exception as e:
             print(f"로그인 로깅 오류: {str(e)}")
-            db.session.rollback()
         
         # 리디렉션 URL 처리
         next_page = request.args.get('next')
@@ -177,10 +165,7 @@ def logout():
     """사용자 로그아웃"""
     # 명시적으로 로그아웃 로그 기록
     try:
-        import json
         from datetime import datetime
-        import logging
-        from app.models.log import UserActivityLog
         
         # 로그 데이터 구성
         log_data = {
@@ -193,26 +178,17 @@ def logout():
             'user_agent': request.user_agent.string if request.user_agent else "Unknown"
         }
         
-        # 로거를 통해 로깅
-        activity_logger = logging.getLogger('user_activity')
-        activity_logger.info(json.dumps(log_data))
-        
-        # DB에 로그 저장
-        log_entry = UserActivityLog(
+        # 파일/DB 기록 - event_type 별 샘플링/저장 정책 적용
+        activity_recorder.record(
+            log_data,
             user_id=current_user.id,
             session_id=session.get('session_id'),
             activity_type='logout',
             entity_type='user',
-            entity_id=current_user.id,
-            details=json.dumps(log_data),
-            ip_address=request.remote_addr,
-            user_agent=request.user_agent.string if request.user_agent else "Unknown"
+            entity_id=current_user.id
         )
-        db.session.add(log_entry)
-        db.session.commit()
     except Exception as e:
         print(f"로그아웃 로깅 오류: {str(e)}")
-        db.session.rollback()
     
     logout_user()
     session.clear()
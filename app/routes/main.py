@@ -1,21 +1,29 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, g
 from flask_login import current_user, login_required
-from app import db
-from app.models import Product, Category, CartItem, Order, OrderItem
+from app import db, activity_recorder, category_cache, activity_classifier, db_router
+from app.utils.activity_classifier import ActivityEvent, int_or_none
+from app.models import Product, CartItem, Order, OrderItem
 import uuid
 
 main_bp = Blueprint('main', __name__)
 
 @main_bp.route('/')
+@db_router.replica_reads
 def index():
     """메인 페이지"""
     featured_products = Product.query.order_by(Product.id.desc()).limit(8).all()
-    categories = Category.query.filter_by(parent_id=None).all()
+    categories = category_cache.get().roots
     return render_template('index.html', 
                            featured_products=featured_products,
                            categories=categories)
 
+@activity_classifier.register('main.search')
+def classify_search(request):
+    """상품 검색 (실제 결과 수는 응답을 처리한 후에 추가)"""
+    return ActivityEvent('search', details={'search_query': request.args.get('q', ''), 'results_count': 0})
+
 @main_bp.route('/search')
+@db_router.replica_reads
 def search():
     """상품 검색"""
     query = request.args.get('q', '')
@@ -29,16 +37,14 @@ def search():
             Product.name.ilike(f'%{query}%') | Product.description.ilike(f'%{query}%')
         )
     
-    if category_id:
-        selected_category = Category.query.get(category_id)
-        if selected_category:
-            if selected_category.subcategories:  # 상위 카테고리인 경우
-                # 현재 카테고리 + 모든 하위 카테고리 ID 목록
-                subcategory_ids = [subcat.id for subcat in selected_category.subcategories]
-                category_ids = [category_id] + subcategory_ids
-                products_query = products_query.filter(Product.category_id.in_(category_ids))
-            else:  # 하위 카테고리인 경우
-                products_query = products_query.filter_by(category_id=category_id)
+    category_tree = category_cache.get()
+    selected_category = category_tree.get(category_id) if category_id else None
+    if selected_category:
+        if selected_category.descendant_ids:  # 상위 카테고리인 경우
+            # 현재 카테고리 + 모든 하위 카테고리 ID 목록 (캐시된 트리에서 미리 계산됨)
+            products_query = products_query.filter(Product.category_id.in_(category_tree.subtree_ids(category_id)))
+        else:  # 하위 카테고리인 경우
+            products_query = products_query.filter_by(category_id=category_id)
     
     # 정렬 적용
     if sort == 'price_asc':
@@ -52,21 +58,17 @@ def search():
     page = request.args.get('page', 1, type=int)
     products = products_query.paginate(page=page, per_page=12)
     
-    categories = Category.query.filter_by(parent_id=None).all()
+    categories = category_tree.roots
     
     # 검색 이벤트 로깅
     if query:
         try:
-            import json
-            import logging
             from datetime import datetime
             from flask_login import current_user
-            from app import db
-            from app.models.log import UserActivityLog
             
             # 사용자 정보
             user_id = current_user.id if current_user.is_authenticated else None
-            session_id = request.cookies.get('session') or 'unknown'
+            session_id = g.get('session_id') or 'unknown'
             
             # 로그 데이터 구성
             log_data = {
@@ -85,23 +87,15 @@ def search():
                 'referrer': request.referrer
             }
             
-            # 로깅
-            activity_logger = logging.getLogger('user_activity')
-            activity_logger.info(json.dumps(log_data))
-            
-            # DB에 저장
-            log_entry = UserActivityLog(
+            # 파일/DB 기록 - event_type 별 샘플링/저장 정책 적용
+            activity_recorder.record(
+                log_data,
                 user_id=user_id,
                 session_id=session_id,
                 activity_type='search',
                 entity_type='query',
-                entity_id=None,
-                details=json.dumps(log_data),
-                ip_address=request.remote_addr,
-                user_agent=request.user_agent.string if request.user_agent else "Unknown"
+                entity_id=None
             )
-            db.session.add(log_entry)
-            db.session.commit()
         except Exception as e:
             print(f"검색 로깅 오류: {str(e)}")
     
@@ -120,6 +114,11 @@ def cart():
     total = sum(item.product.price * item.quantity for item in cart_items)
     return render_template('cart.html', cart_items=cart_items, total=total)
 
+@activity_classifier.register('main.add_to_cart', methods=['POST'])
+def classify_add_to_cart(request):
+    """장바구니 추가"""
+    return ActivityEvent('cart_add', 'product', int_or_none(request.form.get('product_id')))
+
 @main_bp.route('/cart/add', methods=['POST'])
 @login_required
 def add_to_cart():
@@ -162,13 +161,10 @@ def add_to_cart():
     
     # 장바구니 추가 이벤트 로깅
     try:
-        import json
-        import logging
         from datetime import datetime
-        from app.models.log import UserActivityLog
         
         # 세션 ID 획득
-        session_id = request.cookies.get('session') or 'unknown'
+        session_id = g.get('session_id') or 'unknown'
         
         # 참조 페이지 정보
         ref_page = request.referrer or 'direct'
@@ -203,29 +199,26 @@ def add_to_cart():
             'ip_address': request.remote_addr
         }
         
-        # 로깅
-        activity_logger = logging.getLogger('user_activity')
-        activity_logger.info(json.dumps(log_data))
-        
-        # DB에 저장
-        log_entry = UserActivityLog(
+        # 파일/DB 기록 - event_type 별 샘플링/저장 정책 적용
+        activity_recorder.record(
+            log_data,
             user_id=current_user.id,
             session_id=session_id,
             activity_type='cart_add',
             entity_type='product',
-            entity_id=product_id,
-            details=json.dumps(log_data),
-            ip_address=request.remote_addr,
-            user_agent=request.user_agent.string if request.user_agent else "Unknown"
+            entity_id=product_id
         )
-        db.session.add(log_entry)
-        db.session.commit()
     except Exception as e:
         print(f"장바구니 추가 로깅 오류: {str(e)}")
     
     flash(f'"{product.name}" 상품이 장바구니에 추가되었습니다.', 'success')
     return redirect(request.referrer or url_for('main.index'))
 
+@activity_classifier.register('main.remove_from_cart', methods=['POST'])
+def classify_remove_from_cart(request):
+    """장바구니 제거 - 폼에는 장바구니 항목 ID 만 있으므로 뷰가 g 에 남긴 상품 ID 사용 (뷰의 cart_remove 기록과 동일)"""
+    return ActivityEvent('cart_remove', 'product', g.get('cart_removed_product_id'))
+
 @main_bp.route('/cart/remove', methods=['POST'])
 @login_required
 def remove_from_cart():
@@ -243,8 +236,8 @@ def remove_from_cart():
         flash('접근 권한이 없습니다.', 'danger')
         return redirect(url_for('main.cart'))
     
-    # 제거할 상품 정보 저장
-    product_id = cart_item.product_id
+    # 제거할 상품 정보 저장 (항목 삭제 후 활동 분류기에서도 사용)
+    product_id = g.cart_removed_product_id = cart_item.product_id
     product_name = cart_item.product.name if hasattr(cart_item, 'product') else "Unknown"
     product_price = float(cart_item.product.price) if hasattr(cart_item, 'product') else 0
     removed_quantity = cart_item.quantity
@@ -255,13 +248,10 @@ def remove_from_cart():
     
     # 장바구니 제거 이벤트 로깅
     try:
-        import json
-        import logging
         from datetime import datetime
-        from app.models.log import UserActivityLog
         
         # 세션 ID 획득
-        session_id = request.cookies.get('session') or 'unknown'
+        session_id = g.get('session_id') or 'unknown'
         
         # 로그 데이터 구성
         log_data = {
@@ -278,23 +268,15 @@ def remove_from_cart():
             'ip_address': request.remote_addr
         }
         
-        # 로깅
-        activity_logger = logging.getLogger('user_activity')
-        activity_logger.info(json.dumps(log_data))
-        
-        # DB에 저장
-        log_entry = UserActivityLog(
+        # 파일/DB 기록 - event_type 별 샘플링/저장 정책 적용
+        activity_recorder.record(
+            log_data,
             user_id=current_user.id,
             session_id=session_id,
             activity_type='cart_remove',
             entity_type='product',
-            entity_id=product_id,
-            details=json.dumps(log_data),
-            ip_address=request.remote_addr,
-            user_agent=request.user_agent.string if request.user_agent else "Unknown"
+            entity_id=product_id
         )
-        db.session.add(log_entry)
-        db.session.commit()
     except Exception as e:
         print(f"장바구니 제거 로깅 오류: {str(e)}")
     
@@ -1,12 +1,14 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash
 from flask_login import current_user, login_required
-from app import db
-from app.models import Product, Category, ProductReview, Order, OrderItem
+from app import db, category_cache, activity_classifier, db_router
+from app.utils.activity_classifier import ActivityEvent
+from app.models import Product, ProductReview, Order, OrderItem
 from sqlalchemy import text
 
 products_bp = Blueprint('products', __name__, url_prefix='/products')
 
 @products_bp.route('/')
+@db_router.replica_reads
 def index():
     """상품 목록 페이지"""
     category_id = request.args.get('category', type=int)
@@ -17,16 +19,14 @@ def index():
     products_query = Product.query
     
     # 카테고리 필터링
-    if category_id:
-        selected_category = Category.query.get(category_id)
-        if selected_category:
-            if selected_category.subcategories:  # 상위 카테고리인 경우
-                # 현재 카테고리 + 모든 하위 카테고리 ID 목록
-                subcategory_ids = [subcat.id for subcat in selected_category.subcategories]
-                category_ids = [category_id] + subcategory_ids
-                products_query = products_query.filter(Product.category_id.in_(category_ids))
-            else:  # 하위 카테고리인 경우
-                products_query = products_query.filter_by(category_id=category_id)
+    category_tree = category_cache.get()
+    selected_category = category_tree.get(category_id) if category_id else None
+    if selected_category:
+        if selected_category.descendant_ids:  # 상위 카테고리인 경우
+            # 현재 카테고리 + 모든 하위 카테고리 ID 목록 (캐시된 트리에서 미리 계산됨)
+            products_query = products_query.filter(Product.category_id.in_(category_tree.subtree_ids(category_id)))
+        else:  # 하위 카테고리인 경우
+            products_query = products_query.filter_by(category_id=category_id)
     
     # 정렬
     if sort == 'price_low':
@@ -40,11 +40,7 @@ def index():
     page = request.args.get('page', 1, type=int)
     products = products_query.paginate(page=page, per_page=12)
     
-    categories = Category.query.all()
-    
-    selected_category = None
-    if category_id:
-        selected_category = Category.query.get(category_id)
+    categories = category_tree.roots
     
     return render_template('products/index.html', 
                            products=products,
@@ -52,7 +48,13 @@ def index():
                            selected_category=selected_category,
                            sort=sort)
 
+@activity_classifier.register('products.detail', methods=['GET'])
+def classify_detail(request):
+    """상품 상세 조회 - 상품 ID 는 URL 변수에서"""
+    return ActivityEvent('view', 'product', request.view_args.get('product_id'))
+
 @products_bp.route('/<int:product_id>')
+@db_router.replica_reads
 def detail(product_id):
     """상품 상세 페이지"""
     product = Product.query.get_or_404(product_id)
@@ -0,0 +1,49 @@
+from collections import namedtuple
+
+# 요청 하나의 활동 분류 결과 (activity_type 이 None 이면 page_view)
+ActivityEvent = namedtuple('ActivityEvent', 'activity_type entity_type entity_id details', defaults=(None, None, None))
+
+_PAGE_VIEW = ActivityEvent(None)
+
+def int_or_none(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+class ActivityClassifier:
+    """
+    endpoint -> 분류 함수 레지스트리
+    - 블루프린트 모듈에서 @activity_classifier.register('products.detail', methods=['GET']) 로 등록
+    - init_app 에서 URL 맵을 기준으로 조회 테이블을 한 번 만들고, 요청마다 request.endpoint 로 바로 찾음
+    - 분류 함수는 request 를 받아 ActivityEvent 를 반환 (엔티티 ID 는 request.view_args 등에서 추출)
+    - 등록되지 않은 endpoint 나 메서드는 page_view
+    """
+
+    def __init__(self):
+        self._registered = {}
+        self._table = {}
+
+    def register(self, endpoint, methods=None):
+        """분류 함수 등록 데코레이터 (methods 가 None 이면 모든 메서드)"""
+        def decorator(func):
+            self._registered[endpoint] = (frozenset(m.upper() for m in methods) if methods else None, func)
+            return func
+        return decorator
+
+    def init_app(self, app):
+        """블루프린트 등록이 끝난 뒤 호출 - URL 맵의 endpoint 별 조회 테이블 생성"""
+        endpoints = {rule.endpoint for rule in app.url_map.iter_rules()}
+        self._table = {endpoint: entry for endpoint, entry in self._registered.items() if endpoint in endpoints}
+        for endpoint in sorted(set(self._registered) - endpoints):
+            app.logger.warning(f"활동 분류기가 등록된 endpoint 가 URL 맵에 없습니다: {endpoint}")
+        app.extensions['activity_classifier'] = self
+
+    def classify(self, request):
+        entry = self._table.get(request.endpoint)
+        if entry is None:
+            return _PAGE_VIEW
+        methods, func = entry
+        if methods is not None and request.method not in methods:
+            return _PAGE_VIEW
+        return func(request) or _PAGE_VIEW
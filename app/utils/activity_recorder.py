@@ -0,0 +1,141 @@
+import json
+import random
+import logging
+import threading
+from flask import request, has_request_context
+
+# 정책 테이블에 없는 event_type 에 적용되는 기본값 (기존 동작: 모두 기록, 파일+DB, details 저장)
+DEFAULT_POLICY = {
+    'sample_rate': 1.0,
+    'sinks': 'both',
+    'store_details': True,
+}
+
+SINKS = ('file', 'db', 'both', 'none')
+
+def load_policy_table(path):
+    """
+    JSON 정책 파일 로드
+    형식: {"default": {...}, "page_view": {"sample_rate": 0.1, "sinks": "file"}, ...}
+    """
+    with open(path, encoding='utf-8') as f:
+        table = json.load(f)
+    for event_type, policy in table.items():
+        if policy.get('sinks', 'both') not in SINKS:
+            raise ValueError(f"{event_type}: 지원하지 않는 sinks 값 {policy.get('sinks')}")
+        rate = policy.get('sample_rate', 1.0)
+        if not 0 <= rate <= 1:
+            raise ValueError(f"{event_type}: sample_rate 는 0~1 사이여야 합니다")
+    return table
+
+class ActivityRecorder:
+    """
+    사용자 활동 이벤트를 event_type 별 정책에 따라 파일/DB 에 기록
+    - sample_rate: 기록 비율 (0~1). 샘플링된 이벤트에는 sample_weight(=1/sample_rate)를 붙여 분석 시 보정 가능
+    - sinks: file | db | both | none
+    - store_details: DB details 컬럼에 전체 로그 JSON 저장 여부
+    """
+
+    def __init__(self, writer=None, table=None):
+        self.writer = writer
+        self.table = {}
+        self._policies = {}
+        self._stats_lock = threading.Lock()
+        self.counters = {'recorded': 0, 'sampled_out': 0}
+        self.set_table(table or {})
+
+    def init_app(self, app, writer=None):
+        if writer is not None:
+            self.writer = writer
+        policy_file = app.config.get('ACTIVITY_POLICY_FILE')
+        if policy_file:
+            self.set_table(load_policy_table(policy_file))
+        app.extensions['activity_recorder'] = self
+
+    def set_table(self, table):
+        """정책 테이블 교체 (event_type 별 정책은 기본값과 병합하여 미리 계산)"""
+        self.table = table
+        self._default = dict(DEFAULT_POLICY, **table.get('default', {}))
+        self._policies = {
+            event_type: dict(self._default, **policy)
+            for event_type, policy in table.items() if event_type != 'default'
+        }
+
+    def policy_for(self, event_type):
+        return self._policies.get(event_type, self._default)
+
+    def record(self, log_data, db=True, **db_fields):
+        """
+        이벤트 한 건 기록
+        :param log_data: 파일에 기록할 로그 딕셔너리 (event_type 필수)
+        :param db: False 이면 정책과 관계없이 DB 에 저장하지 않음
+        :param db_fields: UserActivityLog 컬럼 값 (activity_type, entity_type, entity_id, user_id, session_id 등)
+        :return: 기록 여부 (샘플링으로 제외되면 False)
+        """
+        return self.record_many([(log_data, db, db_fields)]) == 1
+
+    def record_many(self, entries):
+        """
+        여러 이벤트를 한 번에 기록 - 파일은 레코드 하나로, DB 는 writer 에 한 번에 전달
+        :param entries: [(log_data, db, db_fields), ...]
+        :return: 기록된 이벤트 수
+        """
+        lines = []
+        rows = []
+        recorded = 0
+
+        for log_data, db, db_fields in entries:
+            policy = self.policy_for(log_data.get('event_type'))
+            weight = self._sample(policy['sample_rate'])
+            if weight is None:
+                self._incr('sampled_out')
+                continue
+            if weight != 1:
+                log_data['sample_weight'] = weight
+
+            details = json.dumps(log_data)
+            if policy['sinks'] in ('file', 'both'):
+                lines.append(details)
+
+            if db and policy['sinks'] in ('db', 'both'):
+                if not policy['store_details']:
+                    # details 를 저장하지 않더라도 가중치는 남겨 집계 보정에 사용
+                    details = json.dumps({'sample_weight': weight}) if weight != 1 else None
+                rows.append(self._make_row(details, db_fields))
+
+            recorded += 1
+
+        if lines:
+            logging.getLogger('user_activity').info('\n'.join(lines))
+        if rows:
+            self.writer.submit_many(rows)
+
+        with self._stats_lock:
+            self.counters['recorded'] += recorded
+        return recorded
+
+    @staticmethod
+    def _sample(rate):
+        """샘플링 - 포함되면 가중치, 제외되면 None"""
+        if rate >= 1:
+            return 1
+        if rate <= 0 or random.random() >= rate:
+            return None
+        return round(1 / rate, 6)
+
+    @staticmethod
+    def _make_row(details, db_fields):
+        row = dict(db_fields)
+        row['details'] = details
+        if has_request_context():
+            row.setdefault('ip_address', request.remote_addr)
+            row.setdefault('user_agent', request.user_agent.string if request.user_agent else "Unknown")
+        return row
+
+    def stats(self):
+        with self._stats_lock:
+            return dict(self.counters)
+
+    def _incr(self, name):
+        with self._stats_lock:
+            self.counters[name] += 1
@@ -0,0 +1,203 @@
+import os
+import time
+import queue
+import atexit
+import logging
+import threading
+from datetime import datetime
+
+# 큐 종료 신호
+_STOP = object()
+
+# UserActivityLog 컬럼 (executemany 는 모든 행이 같은 키를 가져야 함)
+ACTIVITY_LOG_FIELDS = (
+    'user_id', 'session_id', 'activity_type', 'entity_type', 'entity_id',
+    'details', 'ip_address', 'user_agent', 'created_at'
+)
+
+class ActivityLogWriter:
+    """
+    UserActivityLog 행을 요청 스레드 밖에서 일괄 저장하는 백그라운드 writer
+    - 크기가 제한된 큐에 행을 모으고, 배치 크기 또는 시간 간격에 도달하면
+      multi-row INSERT 한 번으로 DB에 기록
+    - 큐가 가득 차면 잠시 대기(backpressure) 후에도 자리가 없으면 버림(drop)
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.enabled = True
+        self.queue_size = 10000
+        self.batch_size = 500
+        self.flush_interval = 1.0
+        self.put_timeout = 0.05
+
+        self._queue = None
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._counters = {
+            'enqueued': 0,
+            'written': 0,
+            'dropped': 0,
+            'backpressure': 0,
+            'batches': 0,
+            'failed': 0,
+        }
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Flask 설정값으로 writer 초기화"""
+        self.app = app
+        self.enabled = app.config.get('ACTIVITY_LOG_ASYNC', True)
+        self.queue_size = app.config.get('ACTIVITY_LOG_QUEUE_SIZE', self.queue_size)
+        self.batch_size = app.config.get('ACTIVITY_LOG_BATCH_SIZE', self.batch_size)
+        self.flush_interval = app.config.get('ACTIVITY_LOG_FLUSH_INTERVAL', self.flush_interval)
+        self.put_timeout = app.config.get('ACTIVITY_LOG_PUT_TIMEOUT', self.put_timeout)
+        app.extensions['activity_writer'] = self
+
+        # 워커 종료 시 남은 로그를 모두 기록
+        atexit.register(self.stop)
+
+    def submit(self, **fields):
+        """UserActivityLog 한 행을 저장 대기열에 추가"""
+        return self.submit_many([fields]) == 1
+
+    def submit_many(self, rows):
+        """여러 행을 한 번에 추가 - 대기열에 들어간 행 수 반환"""
+        rows = [self._make_row(fields) for fields in rows]
+
+        if not self.enabled:
+            self._write(rows)
+            return len(rows)
+
+        self._ensure_started()
+        return sum(1 for row in rows if self._enqueue(row))
+
+    def _make_row(self, fields):
+        """입력값을 INSERT 용 행 딕셔너리로 정규화"""
+        row = {name: fields.get(name) for name in ACTIVITY_LOG_FIELDS}
+        if row['created_at'] is None:
+            row['created_at'] = datetime.utcnow()
+        return row
+
+    def _enqueue(self, row):
+        """큐에 행 추가 - 가득 차면 잠시 대기 후 버림"""
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            # 큐가 가득 참 - 잠깐 기다렸다가 그래도 안 되면 버림
+            self._incr('backpressure')
+            try:
+                self._queue.put(row, timeout=self.put_timeout)
+            except queue.Full:
+                self._incr('dropped')
+                return False
+
+        self._incr('enqueued')
+        return True
+
+    def stats(self):
+        """큐 깊이와 처리 카운터 반환"""
+        with self._stats_lock:
+            result = dict(self._counters)
+        result['queue_depth'] = self._queue.qsize() if self._queue is not None else 0
+        result['queue_size'] = self.queue_size
+        result['running'] = bool(self._thread and self._thread.is_alive())
+        return result
+
+    def stop(self, timeout=5.0):
+        """남은 행을 모두 기록하고 백그라운드 스레드 종료"""
+        with self._lock:
+            thread = self._thread
+            if thread is None or self._pid != os.getpid():
+                return
+            self._thread = None
+
+        self._queue.put(_STOP)
+        thread.join(timeout)
+
+        if self.app is not None:
+            self.app.logger.info('활동 로그 writer 종료', extra={"data": {"activity_writer": self.stats()}})
+
+    def _ensure_started(self):
+        """필요 시 백그라운드 스레드 시작 (fork 된 워커에서는 새로 시작)"""
+        if self._thread is not None and self._pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._queue = queue.Queue(maxsize=self.queue_size)
+            self._thread = threading.Thread(target=self._run, name='activity-log-writer', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        """큐에서 행을 꺼내 배치 단위로 기록"""
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = None
+
+            stop = item is _STOP
+            if item is not None and not stop:
+                batch.append(item)
+                # 이미 쌓여 있는 행은 대기 없이 배치에 추가
+                while len(batch) < self.batch_size:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stop = True
+                        break
+                    batch.append(item)
+
+            if batch and (stop or len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                self._write(batch)
+                batch = []
+
+            if time.monotonic() >= deadline:
+                deadline = time.monotonic() + self.flush_interval
+
+            if stop:
+                break
+
+    def _write(self, rows):
+        """행 목록을 multi-row INSERT 로 기록 (실패 시 행 단위로 재시도)"""
+        from app import db
+        from app.models.log import UserActivityLog
+
+        table = UserActivityLog.__table__
+        try:
+            with self.app.app_context():
+                with db.engine.begin() as conn:
+                    conn.execute(table.insert(), rows)
+            self._incr('written', len(rows))
+            self._incr('batches')
+            return
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"활동 로그 일괄 저장 실패, 행 단위 재시도: {str(e)}")
+
+        # 일부 행 때문에 배치 전체가 실패한 경우 나머지 행은 살림
+        for row in rows:
+            try:
+                with self.app.app_context():
+                    with db.engine.begin() as conn:
+                        conn.execute(table.insert(), [row])
+                self._incr('written')
+            except Exception as e:
+                self._incr('failed')
+                logging.getLogger(__name__).error(f"활동 로그 저장 오류: {str(e)}")
+        self._incr('batches')
+
+    def _incr(self, name, amount=1):
+        with self._stats_lock:
+            self._counters[name] += amount
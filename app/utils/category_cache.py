@@ -0,0 +1,130 @@
+import time
+import threading
+from collections import namedtuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# 템플릿에서 ORM Category 와 같은 방식(category.name, category.subcategories ...)으로 사용하는 읽기 전용 노드
+CategoryNode = namedtuple('CategoryNode', 'id name description parent_id subcategories descendant_ids')
+
+class CategoryTree:
+    """
+    카테고리 트리의 불변 스냅샷
+    - roots: 최상위 카테고리, all: 전체 카테고리 (ID 순)
+    - 노드마다 하위 카테고리(subcategories)와 모든 자손 ID(descendant_ids)를 미리 계산
+    """
+
+    def __init__(self, rows, version=0):
+        """:param rows: (id, name, description, parent_id) 목록"""
+        self.version = version
+        children = {}
+        for row in rows:
+            children.setdefault(row[3], []).append(row)
+
+        nodes = {}
+
+        def build(row, visiting):
+            category_id = row[0]
+            if category_id in visiting:
+                raise ValueError(f"카테고리 순환 참조: {category_id}")
+            visiting.add(category_id)
+            subcategories = tuple(build(child, visiting) for child in sorted(children.get(category_id, ()), key=lambda r: r[0]))
+            visiting.discard(category_id)
+            descendant_ids = []
+            for subcategory in subcategories:
+                descendant_ids.append(subcategory.id)
+                descendant_ids.extend(subcategory.descendant_ids)
+            node = nodes[category_id] = CategoryNode(row[0], row[1], row[2], row[3], subcategories, tuple(descendant_ids))
+            return node
+
+        ids = {row[0] for row in rows}
+        # 부모가 없거나 존재하지 않는 부모를 가리키는 카테고리를 최상위로 취급
+        root_rows = sorted((row for row in rows if row[3] is None or row[3] not in ids), key=lambda r: r[0])
+        self.roots = tuple(build(row, set()) for row in root_rows)
+        self.nodes = nodes
+        self.all = tuple(nodes[category_id] for category_id in sorted(nodes))
+
+    def get(self, category_id):
+        return self.nodes.get(category_id)
+
+    def subtree_ids(self, category_id):
+        """카테고리 자신과 모든 하위 카테고리 ID (상품 필터용)"""
+        node = self.nodes.get(category_id)
+        if node is None:
+            return ()
+        return (node.id,) + node.descendant_ids
+
+class CategoryCache:
+    """
+    프로세스 내 카테고리 트리 캐시
+    - CATEGORY_CACHE_TTL(초)이 지나면 다시 읽음 (다른 워커의 변경 반영), 0 이면 캐시하지 않음
+    - 이 프로세스에서 Category 를 추가/수정/삭제하고 커밋하면 즉시 무효화
+    - 갱신 중에는 다른 요청 스레드가 기다리지 않고 이전 스냅샷을 사용
+    """
+
+    def __init__(self, app=None):
+        self.ttl = 300
+        self._tree = None
+        self._loaded_at = 0.0
+        self._version = 0
+        self._lock = threading.Lock()
+        self._listening = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.ttl = app.config.get('CATEGORY_CACHE_TTL', self.ttl)
+        app.extensions['category_cache'] = self
+
+        # Session 클래스 리스너는 전역이므로 init_app 이 여러 번 호출돼도 한 번만 등록
+        if not self._listening:
+            event.listen(Session, 'after_flush', self._track_category_changes)
+            event.listen(Session, 'after_commit', self._invalidate_on_commit)
+            event.listen(Session, 'after_rollback', self._clear_on_rollback)
+            self._listening = True
+
+    def _track_category_changes(self, session, flush_context):
+        from app.models import Category
+        for obj in (*session.new, *session.dirty, *session.deleted):
+            if isinstance(obj, Category):
+                session.info['category_changed'] = True
+                break
+
+    def _invalidate_on_commit(self, session):
+        if session.info.pop('category_changed', False):
+            self.invalidate()
+
+    def _clear_on_rollback(self, session):
+        session.info.pop('category_changed', None)
+
+    def invalidate(self):
+        """다음 get() 에서 다시 읽도록 스냅샷 만료"""
+        self._loaded_at = 0.0
+
+    def _expired(self):
+        return self._tree is None or time.monotonic() - self._loaded_at >= self.ttl
+
+    def get(self):
+        """현재 카테고리 트리 스냅샷 (애플리케이션 컨텍스트 필요)"""
+        if not self._expired():
+            return self._tree
+        if self._tree is not None and not self._lock.acquire(blocking=False):
+            # 다른 스레드가 갱신 중
+            return self._tree
+        if self._tree is None:
+            self._lock.acquire()
+        try:
+            if self._expired():
+                self._tree = self._load()
+                self._loaded_at = time.monotonic()
+            return self._tree
+        finally:
+            self._lock.release()
+
+    def _load(self):
+        from app import db
+        from app.models import Category
+        rows = db.session.query(Category.id, Category.name, Category.description, Category.parent_id).all()
+        self._version += 1
+        return CategoryTree([tuple(row) for row in rows], self._version)
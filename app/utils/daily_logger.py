@@ -1,7 +1,15 @@
 import os
+import copy
+import time
+import queue
+import atexit
 import logging
-from datetime import datetime
+import threading
+import weakref
+from datetime import datetime, timedelta
 from logging import FileHandler
+from logging.handlers import QueueHandler, QueueListener
+from app.utils.log_formatter import StructuredJsonFormatter, capture_log_context
 
 class DailyFileHandler(FileHandler):
     """
@@ -38,6 +46,347 @@ class DailyFileHandler(FileHandler):
         
         FileHandler.emit(self, record)
 
+class BufferedDailyFileHandler(DailyFileHandler):
+    """
+    사용자 공간 버퍼를 사용하는 날짜별 파일 핸들러
+    - 다음 자정(rollover) 시각을 한 번만 계산하고, 이후에는 record.created 와 숫자 비교만 수행
+    - 레코드를 버퍼에 모았다가 크기/시간 간격/레벨(기본 ERROR 이상) 조건에서 한 번에 write + flush
+    - rollover 와 버퍼 기록은 핸들러 lock 안에서 수행되어 여러 스레드가 동시에 로깅해도 안전
+    """
+    
+    def __init__(self, base_name, mode='a', encoding=None, delay=False,
+                 buffer_size=64 * 1024, flush_interval=1.0, flush_level=logging.ERROR):
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.flush_level = flush_level
+        self._buffer = []
+        self._buffered_size = 0
+        self._last_flush = time.monotonic()
+        
+        DailyFileHandler.__init__(self, base_name, mode, encoding, delay)
+        self._rollover_at = self._compute_rollover_at(time.time())
+        _register_buffered_handler(self)
+    
+    @staticmethod
+    def _compute_rollover_at(now):
+        """now 기준 다음 로컬 자정의 타임스탬프"""
+        next_day = datetime.fromtimestamp(now) + timedelta(days=1)
+        return next_day.replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
+    
+    def emit(self, record):
+        """레코드를 버퍼에 추가하고 필요 시 파일 전환/flush"""
+        try:
+            msg = self.format(record) + self.terminator
+        except Exception:
+            self.handleError(record)
+            return
+        
+        # handle() 이 이미 lock 을 잡고 있지만, emit 직접 호출 시에도 안전하도록 재진입 lock 사용
+        with self.lock:
+            try:
+                if record.created >= self._rollover_at:
+                    self._flush_buffer()
+                    self._do_rollover(record.created)
+                
+                self._buffer.append(msg)
+                self._buffered_size += len(msg)
+                
+                if (self._buffered_size >= self.buffer_size
+                        or record.levelno >= self.flush_level
+                        or time.monotonic() - self._last_flush >= self.flush_interval):
+                    self._flush_buffer()
+            except Exception:
+                self.handleError(record)
+    
+    def _do_rollover(self, created):
+        """record 시각의 날짜 파일로 전환 (lock 안에서 호출)"""
+        self.today = datetime.fromtimestamp(created).strftime('%Y-%m-%d')
+        self.current_filename = self._get_current_filename()
+        self.baseFilename = os.path.abspath(self.current_filename)
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        if not self.delay:
+            self.stream = self._open()
+        self._rollover_at = self._compute_rollover_at(created)
+    
+    def _flush_buffer(self):
+        """버퍼 내용을 한 번에 파일에 기록 (lock 안에서 호출)"""
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return
+        if self.stream is None:
+            self.stream = self._open()
+        self.stream.write(''.join(self._buffer))
+        self.stream.flush()
+        self._buffer = []
+        self._buffered_size = 0
+    
+    def flush(self):
+        with self.lock:
+            if self._buffer:
+                self._flush_buffer()
+            elif self.stream and hasattr(self.stream, 'flush'):
+                self.stream.flush()
+    
+    def close(self):
+        with self.lock:
+            try:
+                if self._buffer and not getattr(self, '_closed', False):
+                    self._flush_buffer()
+            finally:
+                DailyFileHandler.close(self)
+
+# 버퍼 핸들러를 주기적으로 flush 하는 백그라운드 스레드 (로그가 뜸할 때도 flush_interval 보장)
+_buffered_handlers = weakref.WeakSet()
+_flusher_lock = threading.Lock()
+_flusher_thread = None
+
+_flusher_fork_hook_registered = False
+
+def _register_buffered_handler(handler):
+    global _flusher_fork_hook_registered
+    _buffered_handlers.add(handler)
+    _start_flusher()
+    if not _flusher_fork_hook_registered and hasattr(os, 'register_at_fork'):
+        _flusher_fork_hook_registered = True
+        os.register_at_fork(after_in_child=_restart_flusher_in_child)
+
+def _start_flusher():
+    global _flusher_thread
+    with _flusher_lock:
+        if _flusher_thread is None or not _flusher_thread.is_alive():
+            _flusher_thread = threading.Thread(target=_flush_buffered_handlers, name='log-buffer-flusher', daemon=True)
+            _flusher_thread.start()
+
+def _restart_flusher_in_child():
+    """
+    fork 된 워커(gunicorn --preload)에서 flush 스레드 재시작
+    부모의 미기록 버퍼는 부모가 기록하므로 자식에서는 비워 중복 기록을 막음
+    """
+    global _flusher_thread, _flusher_lock
+    _flusher_lock = threading.Lock()
+    _flusher_thread = None
+    for handler in list(_buffered_handlers):
+        handler._buffer = []
+        handler._buffered_size = 0
+        handler._last_flush = time.monotonic()
+    if _buffered_handlers:
+        _start_flusher()
+
+def _flush_buffered_handlers():
+    while True:
+        handlers = list(_buffered_handlers)
+        interval = min((h.flush_interval for h in handlers), default=1.0)
+        time.sleep(max(0.05, interval))
+        for handler in handlers:
+            if time.monotonic() - handler._last_flush >= handler.flush_interval:
+                try:
+                    handler.flush()
+                except Exception:
+                    pass
+
+def _make_file_handler(app, base_name, logger_name):
+    """
+    LOG_HANDLER_MODE 설정에 따라 날짜별 파일 핸들러 생성 (default | buffered)
+    LOG_COLLECTOR_ENABLED 이면 파일 대신 수집기 프로세스로 전송하는 핸들러 사용
+    """
+    if app.config.get('LOG_COLLECTOR_ENABLED'):
+        from app.utils.log_collector import CollectorLogHandler, default_socket_path
+        return CollectorLogHandler(
+            app.config.get('LOG_COLLECTOR_SOCKET') or default_socket_path(os.path.dirname(base_name)),
+            logger_name,
+            fallback_base_name=base_name
+        )
+    
+    if app.config.get('LOG_HANDLER_MODE', 'default') == 'buffered':
+        return BufferedDailyFileHandler(
+            base_name,
+            buffer_size=app.config.get('LOG_BUFFER_SIZE', 64 * 1024),
+            flush_interval=app.config.get('LOG_FLUSH_INTERVAL', 1.0),
+            flush_level=parse_log_level(app.config.get('LOG_FLUSH_LEVEL', 'ERROR'))
+        )
+    return DailyFileHandler(base_name)
+
+def parse_log_level(name):
+    """로그 레벨 이름(대소문자 무관) -> 숫자 레벨, 알 수 없는 이름이면 시작 시 ValueError"""
+    level = logging._nameToLevel.get(str(name).strip().upper())
+    if level is None:
+        raise ValueError(f"알 수 없는 로그 레벨: {name}")
+    return level
+
+# 큐 로깅 오버플로 정책
+OVERFLOW_POLICIES = ('block', 'drop_oldest', 'sample')
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    크기가 제한된 큐에 로그 레코드를 넣는 핸들러
+    실제 파일 쓰기는 QueueListener 스레드가 담당하므로 요청 스레드는 디스크를 기다리지 않음
+    overflow 정책:
+      - block: 큐에 자리가 날 때까지 대기
+      - drop_oldest: 가장 오래된 레코드를 버리고 새 레코드 추가
+      - sample: 큐가 80% 이상 차면 WARNING 미만 레코드는 N개 중 1개만 유지, 가득 차면 버림
+    """
+    
+    def __init__(self, log_queue, overflow='block', sample_rate=10, capture_context=True):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"지원하지 않는 overflow 정책: {overflow}")
+        QueueHandler.__init__(self, log_queue)
+        self.overflow = overflow
+        # 대상 파일 핸들러가 StructuredJsonFormatter 일 때만 요청 컨텍스트 캡처
+        self.capture_context = capture_context
+        self.sample_rate = max(1, int(sample_rate))
+        self.high_water = int(log_queue.maxsize * 0.8) if log_queue.maxsize > 0 else 0
+        self._sample_counter = 0
+        self._stats_lock = threading.Lock()
+        self.counters = {
+            'enqueued': 0,
+            'dropped': 0,
+            'dropped_oldest': 0,
+            'sampled_out': 0,
+            'blocked': 0,
+        }
+    
+    def prepare(self, record):
+        """
+        요청 컨텍스트를 레코드에 저장한 뒤 메시지를 확정
+        (리스너 스레드에는 요청 컨텍스트가 없으므로 여기서 미리 캡처)
+        """
+        if self.capture_context:
+            capture_log_context(record)
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        record.exc_text = None
+        record.stack_info = None
+        return record
+    
+    def enqueue(self, record):
+        """overflow 정책에 따라 레코드를 큐에 추가"""
+        if self.overflow == 'sample' and self.high_water and record.levelno < logging.WARNING \
+                and self.queue.qsize() >= self.high_water:
+            with self._stats_lock:
+                self._sample_counter += 1
+                keep = self._sample_counter % self.sample_rate == 0
+                if not keep:
+                    self.counters['sampled_out'] += 1
+            if not keep:
+                return
+        
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if self.overflow == 'block':
+                self._incr('blocked')
+                self.queue.put(record)
+            elif self.overflow == 'drop_oldest':
+                try:
+                    self.queue.get_nowait()
+                    self._incr('dropped_oldest')
+                except queue.Empty:
+                    pass
+                try:
+                    self.queue.put_nowait(record)
+                except queue.Full:
+                    self._incr('dropped')
+                    return
+            else:
+                self._incr('dropped')
+                return
+        
+        self._incr('enqueued')
+    
+    def stats(self):
+        """큐 깊이와 드롭 카운터 반환"""
+        with self._stats_lock:
+            result = dict(self.counters)
+        result['queue_depth'] = self.queue.qsize()
+        result['queue_size'] = self.queue.maxsize
+        result['overflow'] = self.overflow
+        return result
+    
+    def _incr(self, name):
+        with self._stats_lock:
+            self.counters[name] += 1
+
+class BlockingSentinelQueueListener(QueueListener):
+    """종료 신호를 큐가 가득 찬 상태에서도 안전하게 넣는 QueueListener"""
+    
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+# 큐 로깅 사용 시 생성된 핸들러/리스너 (지표 조회 및 종료 처리용)
+_queue_handlers = {}
+_queue_listener = None
+_queue_hooks_registered = False
+
+def get_log_queue_stats():
+    """큐 로깅 핸들러별 지표 반환 (큐 로깅을 사용하지 않으면 빈 딕셔너리)"""
+    return {name: handler.stats() for name, handler in _queue_handlers.items()}
+
+def _logger_name_filter(name):
+    """리스너가 레코드를 해당 로거(및 하위 로거)의 파일 핸들러로만 보내도록 하는 필터"""
+    prefix = name + '.'
+    return lambda record: record.name == name or record.name.startswith(prefix)
+
+def _start_queue_logging(app, file_handlers):
+    """
+    로거마다 BoundedQueueHandler 를 두고, 하나의 리스너 스레드가 모든 날짜별 파일을 소유
+    :param file_handlers: {로거 이름: (logger, 파일 핸들러)}
+    """
+    global _queue_listener
+    
+    # create_app 이 여러 번 호출된 경우 이전 리스너 정리
+    _stop_queue_logging()
+    _queue_handlers.clear()
+    
+    queue_size = app.config.get('LOG_QUEUE_SIZE', 10000)
+    overflow = app.config.get('LOG_QUEUE_OVERFLOW', 'block')
+    sample_rate = app.config.get('LOG_QUEUE_SAMPLE_RATE', 10)
+    
+    # 모든 로거가 하나의 큐를 공유하고, 리스너는 로거 이름으로 기록할 파일을 선택
+    shared_queue = queue.Queue(maxsize=queue_size)
+    for name, (logger, file_handler) in file_handlers.items():
+        file_handler.addFilter(_logger_name_filter(name))
+        queue_handler = BoundedQueueHandler(
+            shared_queue, overflow, sample_rate,
+            capture_context=isinstance(file_handler.formatter, StructuredJsonFormatter)
+        )
+        queue_handler.setLevel(file_handler.level)
+        logger.handlers = [queue_handler]
+        _queue_handlers[name] = queue_handler
+    
+    handlers = [file_handler for _, file_handler in file_handlers.values()]
+    _queue_listener = BlockingSentinelQueueListener(shared_queue, *handlers, respect_handler_level=True)
+    _queue_listener.start()
+    
+    global _queue_hooks_registered
+    if not _queue_hooks_registered:
+        _queue_hooks_registered = True
+        # 종료 시 큐에 남은 레코드를 모두 기록
+        atexit.register(_stop_queue_logging)
+        # fork 된 워커(gunicorn --preload)에서는 새 큐로 리스너 스레드를 다시 시작
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=_restart_queue_logging_in_child)
+
+def _stop_queue_logging():
+    """리스너 종료 (큐에 남은 레코드는 모두 파일에 기록됨)"""
+    if _queue_listener is not None and _queue_listener._thread is not None:
+        _queue_listener.stop()
+
+def _restart_queue_logging_in_child():
+    """fork 직후 자식 프로세스에서 큐를 새로 만들고 리스너 스레드 재시작"""
+    if _queue_listener is None or _queue_listener._thread is None:
+        return
+    fresh_queue = queue.Queue(maxsize=_queue_listener.queue.maxsize)
+    _queue_listener.queue = fresh_queue
+    for queue_handler in _queue_handlers.values():
+        queue_handler.queue = fresh_queue
+    _queue_listener._thread = None
+    _queue_listener.start()
+
 def setup_logger(app):
     """
     Flask 애플리케이션을 위한 로깅 설정
@@ -51,13 +400,10 @@ def setup_logger(app):
     
     # 1. 시스템 로그 설정
     app_log_base = os.path.join(log_dir, 'app')
-    app_handler = DailyFileHandler(app_log_base)
+    app_handler = _make_file_handler(app, app_log_base, app.logger.name)
     app_handler.setLevel(logging.INFO)
-    # 기본 Formatter 대신 커스텀 Formatter 사용
-    app_handler.setFormatter(MicrosecondsFormatter(
-        '{"timestamp":"%(asctime)s", "level":"%(levelname)s", "message":"%(message)s", "module":"%(module)s"}',
-        '%Y-%m-%dT%H:%M:%S.%f'
-    ))
+    # 구조화 JSON Formatter 사용 (요청 컨텍스트는 요청당 한 번만 구성)
+    app_handler.setFormatter(StructuredJsonFormatter())
     
     # 기존 핸들러 제거 및 새 핸들러 추가
     app.logger.handlers = []
@@ -66,7 +412,7 @@ def setup_logger(app):
     
     # 2. 사용자 활동 로그 설정
     user_log_base = os.path.join(log_dir, 'user_activity')
-    user_handler = DailyFileHandler(user_log_base)
+    user_handler = _make_file_handler(app, user_log_base, 'user_activity')
     user_handler.setLevel(logging.INFO)
     user_handler.setFormatter(logging.Formatter('%(message)s'))
     
@@ -76,19 +422,36 @@ def setup_logger(app):
     user_logger.setLevel(logging.INFO)
     user_logger.propagate = False
     
+    # 3. 큐 기반 비동기 로깅 (선택) - 파일 쓰기를 단일 리스너 스레드로 이동
+    if app.config.get('LOG_QUEUE_ENABLED'):
+        _start_queue_logging(app, {
+            app.logger.name: (app.logger, app_handler),
+            'user_activity': (user_logger, user_handler),
+        })
+    
+    # 4. 로그 압축/보관 기간 정리 (선택) - 백그라운드 스레드에서 주기적으로 실행
+    if app.config.get('LOG_MAINTENANCE_ENABLED'):
+        _start_log_maintenance(app, log_dir)
+    
     app.logger.info('웹 서비스 시작 - 날짜별 로깅 설정 완료')
     return app
 
-# 커스텀 Formatter 클래스 추가
-class MicrosecondsFormatter(logging.Formatter):
-    """마이크로초까지 표시하는 커스텀 Formatter"""
-    
-    def formatTime(self, record, datefmt=None):
-        """타임스탬프 포맷 처리 (마이크로초 포함)"""
-        created = datetime.fromtimestamp(record.created)
-        if datefmt:
-            # %f를 실제 마이크로초로 교체
-            datefmt = datefmt.replace('%f', f'{created.microsecond:06d}')
-            return created.strftime(datefmt)
-        else:
-            return created.strftime('%Y-%m-%d %H:%M:%S,%f')
\ No newline at end of file
+_log_maintenance = None
+
+def _start_log_maintenance(app, log_dir):
+    global _log_maintenance
+    from app.utils.log_maintenance import LogMaintenance
+    
+    if _log_maintenance is not None:
+        _log_maintenance.stop()
+    else:
+        # fork 된 워커(gunicorn --preload)에서도 정리 스레드가 동작하도록 재시작
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=lambda: _log_maintenance.start())
+    
+    _log_maintenance = LogMaintenance(
+        log_dir,
+        retention_days=app.config.get('LOG_RETENTION_DAYS', 30),
+        interval=app.config.get('LOG_MAINTENANCE_INTERVAL', 3600)
+    )
+    _log_maintenance.start()
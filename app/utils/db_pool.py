@@ -0,0 +1,183 @@
+import time
+import threading
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import configure_mappers
+from sqlalchemy.pool import QueuePool
+
+class TimedQueuePool(QueuePool):
+    """
+    연결 대기 시간과 타임아웃 횟수를 기록하는 QueuePool
+    대기 시간은 큐에서 연결을 기다린 시간만 (새 연결 수립 시간은 connect_seconds 로 따로 기록)
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = {'checkouts': 0, 'wait_seconds': 0.0, 'max_wait_seconds': 0.0,
+                           'timeouts': 0, 'connects': 0, 'connect_seconds': 0.0}
+        self._stats_lock = threading.Lock()
+        self._local = threading.local()
+        # pre-ping 실패 후 재연결도 포함해 실제 DB 연결 수 집계
+        event.listen(self, 'connect', self._count_connect)
+
+    def _count_connect(self, dbapi_connection, connection_record):
+        with self._stats_lock:
+            self.wait_stats['connects'] += 1
+
+    def _create_connection(self):
+        started = time.perf_counter()
+        try:
+            return super()._create_connection()
+        finally:
+            elapsed = time.perf_counter() - started
+            self._local.connect_seconds = getattr(self._local, 'connect_seconds', 0.0) + elapsed
+            with self._stats_lock:
+                self.wait_stats['connect_seconds'] += elapsed
+
+    def _do_get(self):
+        self._local.connect_seconds = 0.0
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self.wait_stats['timeouts'] += 1
+            raise
+        waited = max(time.perf_counter() - started - self._local.connect_seconds, 0.0)
+        with self._stats_lock:
+            stats = self.wait_stats
+            stats['checkouts'] += 1
+            stats['wait_seconds'] += waited
+            if waited > stats['max_wait_seconds']:
+                stats['max_wait_seconds'] = waited
+        return connection
+
+def build_engine_options(uri, pool_size=5, max_overflow=10, pool_timeout=30, pool_recycle=1800,
+                         pool_pre_ping=True, connect_timeout=10):
+    """
+    SQLALCHEMY_ENGINE_OPTIONS 구성
+    - 모든 DB: pool_pre_ping (끊긴 연결을 꺼내기 전에 확인), pool_recycle (오래된 연결 교체)
+    - 메모리 SQLite 를 제외하면 대기 시간을 기록하는 TimedQueuePool 과 크기/overflow/timeout 설정
+    - MySQL: 연결 수립 타임아웃 (pymysql connect_timeout)
+    """
+    url = make_url(uri)
+    options = {'pool_pre_ping': pool_pre_ping, 'pool_recycle': pool_recycle}
+    if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+        return options
+
+    options.update(poolclass=TimedQueuePool, pool_size=pool_size, max_overflow=max_overflow,
+                   pool_timeout=pool_timeout)
+    if url.get_backend_name() == 'mysql':
+        options['connect_args'] = {'connect_timeout': connect_timeout}
+    return options
+
+class DatabasePool:
+    """
+    DB 연결 풀 상태 조회와 워커 시작 시 준비(warmup)
+    - stats(): 바인드별 풀 크기, 사용 중/유휴 연결 수, overflow, 연결 대기 시간 (/api/health)
+    - metric_samples(): 같은 값을 /metrics 스냅샷 샘플로 (request_metrics 가 워커 간 합산)
+    - warmup(): 연결 DB_WARMUP_CONNECTIONS 개를 미리 열고 ORM 매퍼와 카테고리 캐시를 적재
+    """
+
+    def __init__(self, app=None):
+        self.warmup_enabled = True
+        self.warmup_connections = None
+        self._app = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.warmup_enabled = app.config.get('DB_WARMUP', True)
+        self.warmup_connections = app.config.get('DB_WARMUP_CONNECTIONS')
+        self._app = app
+        app.extensions['db_pool'] = self
+
+    def _engines(self):
+        from app import db
+        return {bind or 'default': engine for bind, engine in db.engines.items()}
+
+    def stats(self):
+        """바인드별 연결 풀 상태 (애플리케이션 컨텍스트 필요)"""
+        result = {}
+        for bind, engine in self._engines().items():
+            pool = engine.pool
+            if not isinstance(pool, QueuePool):
+                result[bind] = {'pool_class': type(pool).__name__}
+                continue
+            entry = {
+                'pool_class': type(pool).__name__,
+                'size': pool.size(),
+                'checked_out': pool.checkedout(),
+                'idle': pool.checkedin(),
+                'overflow': max(pool.overflow(), 0),
+                'max_overflow': pool._max_overflow,
+            }
+            wait_stats = getattr(pool, 'wait_stats', None)
+            if wait_stats is not None:
+                checkouts = wait_stats['checkouts']
+                entry.update(
+                    checkouts=checkouts,
+                    total_wait_ms=round(wait_stats['wait_seconds'] * 1000, 3),
+                    avg_wait_ms=round(wait_stats['wait_seconds'] * 1000 / checkouts, 3) if checkouts else 0.0,
+                    max_wait_ms=round(wait_stats['max_wait_seconds'] * 1000, 3),
+                    timeouts=wait_stats['timeouts'],
+                    connects=wait_stats['connects'],
+                    connect_ms=round(wait_stats['connect_seconds'] * 1000, 3),
+                )
+            result[bind] = entry
+        return result
+
+    def metric_samples(self):
+        """/metrics 스냅샷용 샘플 (플러시 스레드에서도 호출되므로 애플리케이션 컨텍스트를 직접 엶)"""
+        # (지표 이름, 타입, 통계 키, 배율) - 워커 간에는 합산, _max 는 최댓값
+        metrics = (
+            ('db_pool_size', 'gauge', 'size', 1),
+            ('db_pool_checked_out', 'gauge', 'checked_out', 1),
+            ('db_pool_idle', 'gauge', 'idle', 1),
+            ('db_pool_overflow', 'gauge', 'overflow', 1),
+            ('db_pool_checkouts_total', 'counter', 'checkouts', 1),
+            ('db_pool_checkout_wait_seconds_total', 'counter', 'total_wait_ms', 0.001),
+            ('db_pool_checkout_wait_seconds_max', 'gauge', 'max_wait_ms', 0.001),
+            ('db_pool_timeouts_total', 'counter', 'timeouts', 1),
+            ('db_pool_connects_total', 'counter', 'connects', 1),
+            ('db_pool_connect_seconds_total', 'counter', 'connect_ms', 0.001),
+        )
+        with self._app.app_context():
+            stats = self.stats()
+        return [(name, kind, (('bind', bind),), entry[key] * scale)
+                for name, kind, key, scale in metrics
+                for bind, entry in stats.items() if key in entry]
+
+    def warmup(self, app):
+        """
+        워커 시작 시 호출 (gunicorn post_worker_init)
+        실패해도 워커는 계속 시작하고, 첫 요청에서 평소처럼 연결을 엽니다
+        """
+        if not self.warmup_enabled:
+            return
+        from app import category_cache
+
+        started = time.perf_counter()
+        opened = {}
+        with app.app_context():
+            try:
+                configure_mappers()
+                for bind, engine in self._engines().items():
+                    pool = engine.pool
+                    count = pool.size() if isinstance(pool, QueuePool) else 1
+                    if self.warmup_connections is not None:
+                        count = min(count, self.warmup_connections)
+                    # 동시에 열어 두어야 서로 다른 연결이 풀에 쌓임 (첫 연결에서 방언 초기화)
+                    connections = [engine.connect() for _ in range(count)]
+                    for connection in connections:
+                        connection.close()
+                    opened[bind] = count
+                category_cache.get()
+            except Exception as e:
+                app.logger.warning(f"DB 연결 풀 준비 실패: {e}")
+                return
+        app.logger.info('DB 연결 풀 준비 완료', extra={"data": {
+            'connections': opened,
+            'warmup_ms': round((time.perf_counter() - started) * 1000, 3),
+        }})
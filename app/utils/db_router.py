@@ -0,0 +1,105 @@
+import time
+import random
+from functools import wraps
+
+from flask import g, session, has_request_context
+from flask_sqlalchemy.session import Session as FlaskSession
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# SQLALCHEMY_BINDS 에서 읽기 복제본으로 취급하는 바인드 키 접두사 (replica_1, replica_2 ...)
+REPLICA_BIND_PREFIX = 'replica_'
+
+# 쓰기 이후 이 시각(epoch)까지 같은 사용자의 읽기를 주 DB 로 보내기 위한 세션 키
+_PRIMARY_UNTIL_KEY = '_db_primary_until'
+
+def replica_binds(urls):
+    """쉼표로 구분한 복제본 URL 목록 -> {바인드 키: URL}"""
+    urls = [url.strip() for url in (urls or '').split(',') if url.strip()]
+    return {f'{REPLICA_BIND_PREFIX}{i}': url for i, url in enumerate(urls, 1)}
+
+class RoutingSession(FlaskSession):
+    """
+    읽기 복제본 라우팅 세션 (db = SQLAlchemy(session_options={'class_': RoutingSession}))
+    DatabaseRouter.replica_reads 뷰 안에서 기본 바인드로 가는 SELECT 만 복제본 엔진으로 보냄
+    flush(쓰기), FOR UPDATE, 텍스트 SQL, 다른 바인드 모델은 항상 원래 엔진 사용
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        engine = super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+        if bind is not None or self._flushing or not has_request_context():
+            return engine
+        replica = g.get('_db_replica')
+        if replica is None or g.get('_db_wrote') or g.get('_db_primary'):
+            return engine
+        if not getattr(clause, 'is_select', False) or getattr(clause, '_for_update_arg', None) is not None:
+            return engine
+        engines = self._db.engines
+        if engine is not engines.get(None):
+            return engine
+        return engines[replica]
+
+class DatabaseRouter:
+    """
+    읽기 전용 뷰의 조회를 읽기 복제본(REPLICA_DATABASE_URLS)으로 보내는 라우터
+    - @db_router.replica_reads 를 붙인 뷰만 복제본 사용, 나머지(장바구니/주문 등)는 주 DB
+    - 요청 하나는 복제본 하나에 고정 (여러 개면 무작위 선택)
+    - 요청 안에서 쓰기(flush)가 있으면 이후 조회는 주 DB, 세션에 기록해 DB_REPLICA_STICKY_SECONDS 동안
+      같은 사용자의 요청도 주 DB 로 보냄 (복제 지연 동안 방금 쓴 리뷰/장바구니가 보이도록)
+    - stick_to_primary(): 현재 요청의 남은 조회를 주 DB 로 고정하는 수동 탈출구
+    """
+
+    def __init__(self, app=None):
+        self.replicas = ()
+        self.sticky_seconds = 5.0
+        self._listening = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        binds = app.config.get('SQLALCHEMY_BINDS') or {}
+        self.replicas = tuple(sorted(key for key in binds if key.startswith(REPLICA_BIND_PREFIX)))
+        self.sticky_seconds = app.config.get('DB_REPLICA_STICKY_SECONDS', self.sticky_seconds)
+        app.extensions['db_router'] = self
+        if not self.replicas:
+            return
+
+        # Session 클래스 리스너는 전역이므로 한 번만 등록 (after_request 는 앱마다)
+        if not self._listening:
+            event.listen(Session, 'after_flush', self._track_writes)
+            self._listening = True
+
+        @app.after_request
+        def _remember_write(response):
+            if g.get('_db_wrote') and self.sticky_seconds > 0:
+                session[_PRIMARY_UNTIL_KEY] = time.time() + self.sticky_seconds
+            return response
+
+    def _track_writes(self, db_session, flush_context):
+        if has_request_context():
+            g._db_wrote = True
+
+    def stick_to_primary(self):
+        """현재 요청의 남은 조회를 주 DB 로 보냄"""
+        g._db_primary = True
+
+    def _choose_replica(self):
+        if not self.replicas or g.get('_db_primary') or g.get('_db_wrote'):
+            return None
+        primary_until = session.get(_PRIMARY_UNTIL_KEY)
+        if primary_until is not None:
+            if primary_until > time.time():
+                return None
+            session.pop(_PRIMARY_UNTIL_KEY, None)
+        return random.choice(self.replicas)
+
+    def replica_reads(self, view):
+        """뷰 데코레이터 - 뷰(템플릿 렌더링 포함) 안의 조회를 복제본으로"""
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            g._db_replica = self._choose_replica()
+            try:
+                return view(*args, **kwargs)
+            finally:
+                g._db_replica = None
+        return wrapper
@@ -0,0 +1,428 @@
+import json
+import math
+import random
+import time
+from array import array
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, event, func, select, text
+from werkzeug.security import generate_password_hash
+
+# 시드 대상 테이블 (FK 순서)
+SEED_TABLES = (
+    'users', 'categories', 'products', 'product_reviews',
+    'orders', 'order_items', 'user_activity_logs',
+)
+
+ROOT_CATEGORY_NAMES = ['전자제품', '패션', '가구/인테리어', '식품', '도서', '스포츠', '뷰티', '완구']
+PRODUCT_BRANDS = ['삼성', 'LG', '애플', '소니', '나이키', '아디다스', '이케아', '한샘', '농심', '오뚜기']
+PRODUCT_WORDS = ['스마트폰', '노트북', '태블릿', '헤드폰', '모니터', '청바지', '스웨터', '셔츠', '운동화',
+                 '식탁', '소파', '조명', '쿠션', '라면', '과자', '커피', '소설', '요가매트', '립스틱', '블록']
+PRODUCT_ADJECTIVES = ['프리미엄', '슬림', '가벼운', '따뜻한', '무선', '원목', '대용량', '미니', '클래식', '신상']
+FIRST_NAMES = ['민준', '서연', '도윤', '지우', '하준', '서윤', '시우', '하은', '주원', '지민']
+LAST_NAMES = ['김', '이', '박', '최', '정', '강', '조', '윤', '장', '임']
+REVIEW_COMMENTS = {
+    1: ['별로예요', '다시는 안 살래요'],
+    2: ['기대보다 아쉬워요', '배송이 느렸어요'],
+    3: ['보통이에요', '가격만큼 해요'],
+    4: ['만족합니다', '잘 쓰고 있어요'],
+    5: ['최고예요!', '강력 추천합니다', '재구매 의사 있어요'],
+}
+USER_AGENTS = [
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 14_3) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.3 Safari/605.1.15',
+    'Mozilla/5.0 (iPhone; CPU iPhone OS 17_3 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Mobile/15E148',
+    'Mozilla/5.0 (Linux; Android 14; SM-S918N) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0 Mobile Safari/537.36',
+]
+
+# schema.sql 의 ENUM 값과 가중치
+ORDER_STATUSES = ['pending', 'paid', 'shipped', 'delivered', 'cancelled']
+ORDER_STATUS_WEIGHTS = [5, 10, 15, 60, 10]
+ACTIVITY_TYPES = ['view', 'search', 'cart_add', 'cart_remove', 'purchase', 'login', 'logout', 'register']
+ACTIVITY_TYPE_WEIGHTS = [50, 20, 10, 3, 4, 6, 5, 2]
+
+def _random_ip(rng):
+    bits = rng.getrandbits(32)
+    return f'{bits >> 24 & 0x7f | 1}.{bits >> 16 & 0xff}.{bits >> 8 & 0xff}.{bits & 0xfd | 1}'
+
+def create_seed_engine(database_url):
+    """
+    대량 적재용 엔진
+    - SQLite: 동기화/저널을 끄고 FK 검사 비활성화 (로컬 대체 DB 이므로 내구성보다 속도 우선)
+    - MySQL: 세션 단위로 FK/UNIQUE 검사 비활성화 (pymysql 은 executemany 를 multi-row INSERT 로 변환)
+    """
+    engine = create_engine(database_url)
+
+    @event.listens_for(engine, 'connect')
+    def _configure(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        if engine.dialect.name == 'sqlite':
+            cursor.execute('PRAGMA synchronous=OFF')
+            cursor.execute('PRAGMA journal_mode=MEMORY')
+            cursor.execute('PRAGMA foreign_keys=OFF')
+        elif engine.dialect.name == 'mysql':
+            cursor.execute('SET SESSION foreign_key_checks=0, unique_checks=0')
+        cursor.close()
+
+    return engine
+
+class ZipfSampler:
+    """
+    0..n-1 인덱스를 Zipf(skew) 분포로 추출 (연속 근사 역변환 - 메모리 O(1))
+    순위는 n 과 서로소인 보폭으로 섞어서, 인기 항목이 앞쪽 ID(같은 카테고리)에 몰리지 않도록 함
+    skew=0 이면 균등 분포
+    """
+
+    def __init__(self, n, skew):
+        if n <= 0:
+            raise ValueError('추출할 항목이 없습니다')
+        self.n = n
+        self.skew = skew
+        self.stride = self._coprime_stride(n)
+
+    @staticmethod
+    def _coprime_stride(n):
+        stride = max(1, int(n * 0.6180339887))
+        while math.gcd(stride, n) != 1:
+            stride += 1
+        return stride
+
+    def sample(self, rng):
+        u = rng.random()
+        if self.skew <= 0:
+            rank = int(u * self.n)
+        elif abs(self.skew - 1.0) < 1e-9:
+            rank = int((self.n + 1) ** u) - 1
+        else:
+            a = 1.0 - self.skew
+            rank = int((1.0 + u * ((self.n + 1) ** a - 1.0)) ** (1.0 / a)) - 1
+        rank = min(max(rank, 0), self.n - 1)
+        return (rank * self.stride) % self.n
+
+class DatabaseSeeder:
+    """
+    schema.sql 구조의 테이블에 성능 테스트용 대량 데이터를 적재
+    - 행은 생성하면서 batch_size 단위로 multi-row INSERT 하고 배치마다 커밋 (메모리 사용량은 행 수와 무관)
+    - 기존 데이터 뒤에 이어서 추가 (ID 는 테이블의 현재 최대값 다음부터 직접 지정하여 FK 를 바로 참조)
+    - 분포: 상품/사용자 인기도는 Zipf, 가격은 로그 정규, 주문당 상품 수는 기하 분포
+    - 같은 seed 와 인자로 실행하면 항상 같은 데이터 생성
+
+    사용 예:
+        seeder = DatabaseSeeder(create_seed_engine(url), metadata, seed=42)
+        seeder.seed_users(100000)
+        seeder.seed_categories(depth=4, fanout=5)
+        ...
+    """
+
+    def __init__(self, engine, metadata, seed=None, batch_size=5000, start_date=None, days=365,
+                 product_skew=1.1, user_skew=0.8, price_median=30000, price_sigma=1.0,
+                 items_per_order=2.5, anonymous_ratio=0.3, password='password123', progress=None):
+        self.engine = engine
+        self.tables = metadata.tables
+        self.seed = seed
+        self.batch_size = batch_size
+        self.start = datetime.combine(start_date, datetime.min.time()) if start_date else \
+            datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=days)
+        self.span_seconds = days * 86400
+        self.product_skew = product_skew
+        self.user_skew = user_skew
+        self.price_median = price_median
+        self.price_sigma = price_sigma
+        self.items_per_order = items_per_order
+        self.anonymous_ratio = anonymous_ratio
+        self.password = password
+        self.progress = progress
+        self.counts = {}
+
+        # 참조용 ID/가격 (필요할 때 DB 에서 읽음)
+        self._user_ids = None
+        self._product_ids = None
+        self._product_prices = None
+        self._category_ids = None
+
+    def _rng(self, table):
+        """테이블별 난수 생성기 - 일부 테이블만 다시 적재해도 나머지 데이터가 바뀌지 않음"""
+        return random.Random(f"{self.seed}:{table}") if self.seed is not None else random.Random()
+
+    def _timestamp(self, rng):
+        return self.start + timedelta(seconds=int(rng.random() * self.span_seconds))
+
+    def _next_id(self, table_name):
+        table = self.tables[table_name]
+        with self.engine.connect() as conn:
+            return (conn.execute(select(func.max(table.c.id))).scalar() or 0) + 1
+
+    def _insert(self, table_name, rows, extra=None):
+        """
+        행 이터레이터를 batch_size 단위로 적재
+        :param extra: 배치마다 같은 트랜잭션에서 함께 적재할 자식 행 {'테이블': [행, ...]} (부모 배치 뒤에 INSERT)
+        :return: 적재한 행 수
+        """
+        table = self.tables[table_name]
+        total = 0
+        started = time.perf_counter()
+        batch = []
+
+        def flush():
+            with self.engine.begin() as conn:
+                conn.execute(table.insert(), batch)
+                for child_name, child_rows in (extra or {}).items():
+                    if child_rows:
+                        conn.execute(self.tables[child_name].insert(), child_rows)
+                        self.counts[child_name] = self.counts.get(child_name, 0) + len(child_rows)
+                        child_rows.clear()
+            batch.clear()
+
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                total += len(batch)
+                flush()
+                if self.progress:
+                    self.progress(table_name, total, time.perf_counter() - started)
+        if batch:
+            total += len(batch)
+            flush()
+        self.counts[table_name] = self.counts.get(table_name, 0) + total
+        if self.progress:
+            self.progress(table_name, total, time.perf_counter() - started)
+        return total
+
+    def _load_ids(self, table_name, *columns):
+        table = self.tables[table_name]
+        with self.engine.connect() as conn:
+            return conn.execute(select(table.c.id, *columns).order_by(table.c.id)).all()
+
+    def user_ids(self):
+        if self._user_ids is None:
+            self._user_ids = array('q', (row[0] for row in self._load_ids('users')))
+        return self._user_ids
+
+    def product_ids(self):
+        if self._product_ids is None:
+            self._product_ids = array('q')
+            self._product_prices = array('d')
+            for product_id, price in self._load_ids('products', self.tables['products'].c.price):
+                self._product_ids.append(product_id)
+                self._product_prices.append(float(price))
+        return self._product_ids
+
+    def category_ids(self):
+        """(말단 카테고리 ID 목록, 상위 카테고리 ID 목록)"""
+        if self._category_ids is None:
+            categories = self.tables['categories']
+            rows = self._load_ids('categories', categories.c.parent_id)
+            parents = {parent_id for _, parent_id in rows if parent_id is not None}
+            leaves = [category_id for category_id, _ in rows if category_id not in parents]
+            inner = [category_id for category_id, _ in rows if category_id in parents]
+            self._category_ids = (leaves, inner)
+        return self._category_ids
+
+    def seed_users(self, count):
+        """사용자 (비밀번호 해시는 비용이 크므로 모든 사용자가 같은 해시를 공유)"""
+        rng = self._rng('users')
+        first_id = self._next_id('users')
+        password_hash = generate_password_hash(self.password)
+
+        def rows():
+            for user_id in range(first_id, first_id + count):
+                created_at = self._timestamp(rng)
+                yield {
+                    'id': user_id,
+                    'username': f'user{user_id}',
+                    'email': f'user{user_id}@example.com',
+                    'password_hash': password_hash,
+                    'first_name': rng.choice(FIRST_NAMES),
+                    'last_name': rng.choice(LAST_NAMES),
+                    'created_at': created_at,
+                    'updated_at': created_at,
+                }
+
+        self._user_ids = None
+        return self._insert('users', rows())
+
+    def seed_categories(self, depth, fanout):
+        """
+        depth 단계, 단계마다 fanout 개 하위 카테고리를 가진 트리 (루트는 ROOT_CATEGORY_NAMES 순환)
+        카테고리 수 = fanout + fanout^2 + ... + fanout^depth
+        """
+        rng = self._rng('categories')
+        first_id = self._next_id('categories')
+
+        def rows():
+            next_id = first_id
+            level = [(None, '')]
+            for current_depth in range(1, depth + 1):
+                next_level = []
+                for parent_id, parent_name in level:
+                    for index in range(fanout):
+                        if parent_id is None:
+                            name = ROOT_CATEGORY_NAMES[index % len(ROOT_CATEGORY_NAMES)]
+                            if index >= len(ROOT_CATEGORY_NAMES):
+                                name = f'{name} {index // len(ROOT_CATEGORY_NAMES) + 1}'
+                        else:
+                            name = f'{parent_name}-{index + 1}' if current_depth > 2 else f'{parent_name} {index + 1}'
+                        created_at = self._timestamp(rng)
+                        yield {
+                            'id': next_id,
+                            'name': name[:50],
+                            'description': f'{name} 카테고리 (단계 {current_depth})',
+                            'parent_id': parent_id,
+                            'created_at': created_at,
+                            'updated_at': created_at,
+                        }
+                        next_level.append((next_id, name))
+                        next_id += 1
+                level = next_level
+
+        self._category_ids = None
+        return self._insert('categories', rows())
+
+    def seed_products(self, count, inner_category_ratio=0.1):
+        """상품 - 대부분 말단 카테고리, inner_category_ratio 만큼은 상위 카테고리에 직접 배치"""
+        rng = self._rng('products')
+        first_id = self._next_id('products')
+        leaves, inner = self.category_ids()
+        if not leaves:
+            raise ValueError('카테고리가 없습니다 (먼저 카테고리를 적재하세요)')
+        mu = math.log(self.price_median)
+
+        def rows():
+            for product_id in range(first_id, first_id + count):
+                if inner and rng.random() < inner_category_ratio:
+                    category_id = rng.choice(inner)
+                else:
+                    category_id = rng.choice(leaves)
+                brand = rng.choice(PRODUCT_BRANDS)
+                word = rng.choice(PRODUCT_WORDS)
+                adjective = rng.choice(PRODUCT_ADJECTIVES)
+                created_at = self._timestamp(rng)
+                yield {
+                    'id': product_id,
+                    'name': f'{brand} {adjective} {word} {product_id}',
+                    'description': f'{brand}의 {adjective} {word}입니다. 모델 번호 {rng.randrange(10 ** 6):06d}',
+                    'price': round(min(rng.lognormvariate(mu, self.price_sigma), 99999999.0), -1) or 10,
+                    'stock': rng.randrange(0, 500),
+                    'category_id': category_id,
+                    'image_url': f'/static/images/product_{product_id % 100}.jpg',
+                    'created_at': created_at,
+                    'updated_at': created_at,
+                }
+
+        self._product_ids = None
+        return self._insert('products', rows())
+
+    def _samplers(self):
+        users = self.user_ids()
+        products = self.product_ids()
+        if not users or not products:
+            raise ValueError('사용자와 상품이 필요합니다 (먼저 적재하세요)')
+        return users, ZipfSampler(len(users), self.user_skew), products, ZipfSampler(len(products), self.product_skew)
+
+    def seed_reviews(self, count):
+        """리뷰 - 인기 상품일수록 리뷰가 많음, 평점은 높은 쪽으로 치우침"""
+        rng = self._rng('product_reviews')
+        first_id = self._next_id('product_reviews')
+        users, user_sampler, products, product_sampler = self._samplers()
+
+        def rows():
+            for review_id in range(first_id, first_id + count):
+                rating = rng.choices((1, 2, 3, 4, 5), weights=(5, 7, 15, 33, 40))[0]
+                created_at = self._timestamp(rng)
+                yield {
+                    'id': review_id,
+                    'product_id': products[product_sampler.sample(rng)],
+                    'user_id': users[int(rng.random() * len(users))],
+                    'rating': rating,
+                    'comment': rng.choice(REVIEW_COMMENTS[rating]),
+                    'created_at': created_at,
+                    'updated_at': created_at,
+                }
+
+        return self._insert('product_reviews', rows())
+
+    def seed_orders(self, count):
+        """주문과 주문 상세 - 구매가 많은 사용자/상품은 Zipf 분포, 주문당 상품 수는 평균 items_per_order 의 기하 분포"""
+        rng = self._rng('orders')
+        first_id = self._next_id('orders')
+        first_item_id = self._next_id('order_items')
+        users, user_sampler, products, product_sampler = self._samplers()
+        prices = self._product_prices
+        continue_probability = 1.0 - 1.0 / max(self.items_per_order, 1.0)
+        items = []
+
+        def rows():
+            item_id = first_item_id
+            for order_id in range(first_id, first_id + count):
+                created_at = self._timestamp(rng)
+                total = 0.0
+                item_count = 1
+                while rng.random() < continue_probability:
+                    item_count += 1
+                for _ in range(item_count):
+                    index = product_sampler.sample(rng)
+                    quantity = rng.choices((1, 2, 3, 4), weights=(70, 20, 7, 3))[0]
+                    price = prices[index]
+                    total += price * quantity
+                    items.append({
+                        'id': item_id,
+                        'order_id': order_id,
+                        'product_id': products[index],
+                        'quantity': quantity,
+                        'price': price,
+                        'created_at': created_at,
+                    })
+                    item_id += 1
+                yield {
+                    'id': order_id,
+                    'user_id': users[user_sampler.sample(rng)],
+                    'total_amount': round(total, 2),
+                    'status': rng.choices(ORDER_STATUSES, weights=ORDER_STATUS_WEIGHTS)[0],
+                    'shipping_address': f'서울시 강남구 테헤란로 {rng.randrange(1, 1000)}',
+                    'created_at': created_at,
+                    'updated_at': created_at,
+                }
+
+        return self._insert('orders', rows(), extra={'order_items': items})
+
+    def seed_activity_logs(self, count):
+        """DB 활동 로그 (user_activity_logs) - 비로그인 비율은 anonymous_ratio"""
+        rng = self._rng('user_activity_logs')
+        first_id = self._next_id('user_activity_logs')
+        users, user_sampler, products, product_sampler = self._samplers()
+
+        def rows():
+            for log_id in range(first_id, first_id + count):
+                activity_type = rng.choices(ACTIVITY_TYPES, weights=ACTIVITY_TYPE_WEIGHTS)[0]
+                user_id = None if rng.random() < self.anonymous_ratio else users[user_sampler.sample(rng)]
+                entity_type = entity_id = None
+                details = {}
+                if activity_type in ('view', 'cart_add', 'cart_remove', 'purchase'):
+                    entity_type = 'product'
+                    entity_id = products[product_sampler.sample(rng)]
+                    if activity_type != 'view':
+                        details['quantity'] = rng.randint(1, 3)
+                elif activity_type == 'search':
+                    details['query'] = rng.choice(PRODUCT_WORDS)
+                yield {
+                    'id': log_id,
+                    'user_id': user_id,
+                    'session_id': '%032x' % rng.getrandbits(128),
+                    'activity_type': activity_type,
+                    'entity_type': entity_type,
+                    'entity_id': entity_id,
+                    'details': json.dumps(details, ensure_ascii=False),
+                    'ip_address': _random_ip(rng),
+                    'user_agent': rng.choice(USER_AGENTS),
+                    'created_at': self._timestamp(rng),
+                }
+
+        return self._insert('user_activity_logs', rows())
+
+    def analyze(self):
+        """적재 후 통계 갱신 (실제 규모의 실행 계획을 보기 위함)"""
+        with self.engine.begin() as conn:
+            if self.engine.dialect.name == 'sqlite':
+                conn.execute(text('ANALYZE'))
+            elif self.engine.dialect.name == 'mysql':
+                conn.execute(text('ANALYZE TABLE ' + ', '.join(SEED_TABLES)))
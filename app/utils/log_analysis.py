@@ -0,0 +1,217 @@
+import re
+import json
+import math
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from app.utils.log_reader import list_log_files, split_byte_ranges, iter_range_lines
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # orjson 이 없으면 표준 json 사용
+    _loads = json.loads
+
+# 분석 대상 로그 (날짜별 파일 기본 이름)
+SOURCES = ('user_activity', 'app')
+
+# 이전 텍스트 형식/생성기 로그의 "요청 종료: GET /path - 200" 메시지에서 상태 코드 추출
+_STATUS_MESSAGE = re.compile(r'^요청 종료: .* - (\d{3})$')
+
+# 지연 시간 히스토그램 버킷 (로그 스케일, 약 1% 상대 오차)
+_BUCKET_BASE = 1.01
+_LOG_BASE = math.log(_BUCKET_BASE)
+_MIN_MS = 0.001
+
+class LatencyHistogram:
+    """
+    병합 가능한 로그 스케일 히스토그램 - 값 개수와 관계없이 메모리가 일정하고 백분위수를 약 1% 오차로 계산
+    """
+
+    def __init__(self, buckets=None):
+        self.buckets = buckets if buckets is not None else Counter()
+
+    def add(self, ms):
+        self.buckets[math.ceil(math.log(max(ms, _MIN_MS)) / _LOG_BASE)] += 1
+
+    def merge(self, other):
+        self.buckets.update(other.buckets)
+
+    @property
+    def count(self):
+        return sum(self.buckets.values())
+
+    def percentiles(self, points=(50, 90, 95, 99)):
+        """:return: {백분위: 버킷 상한값(ms)}"""
+        total = self.count
+        if not total:
+            return {}
+        result = {}
+        targets = sorted(points)
+        cumulative = 0
+        index = 0
+        for bucket in sorted(self.buckets):
+            cumulative += self.buckets[bucket]
+            while index < len(targets) and cumulative >= total * targets[index] / 100:
+                result[targets[index]] = round(_BUCKET_BASE ** bucket, 3)
+                index += 1
+        return result
+
+def _new_result():
+    return {
+        'lines': Counter(),
+        'bad_lines': 0,
+        'events': Counter(),          # (event_type, hour) -> 건수
+        'products': Counter(),        # 상품 entity_id -> 건수
+        'search_queries': Counter(),  # 검색어 -> 건수
+        'status': {source: Counter() for source in SOURCES},
+        'latency': {source: LatencyHistogram() for source in SOURCES},
+    }
+
+def _analyze_activity(record, result):
+    event_type = record.get('event_type') or 'unknown'
+    timestamp = record.get('timestamp') or ''
+    hour = timestamp[11:13] if len(timestamp) >= 13 else '??'
+    result['events'][(event_type, hour)] += 1
+
+    if record.get('entity_type') == 'product' and record.get('entity_id') is not None:
+        result['products'][record['entity_id']] += 1
+
+    search_query = record.get('search_query')
+    if search_query:
+        result['search_queries'][search_query] += 1
+
+    status = record.get('response_status')
+    if status is not None:
+        result['status']['user_activity'][status] += 1
+
+    process_time = record.get('process_time')
+    if process_time is not None:
+        result['latency']['user_activity'].add(process_time * 1000)
+
+def _analyze_app(record, result):
+    response = record.get('response')
+    status = response.get('status_code') if isinstance(response, dict) else None
+    if status is None:
+        match = _STATUS_MESSAGE.match(record.get('message') or '')
+        if match:
+            status = int(match.group(1))
+    if status is not None:
+        result['status']['app'][status] += 1
+
+    performance = record.get('performance')
+    if isinstance(performance, dict) and performance.get('processing_time_ms') is not None:
+        result['latency']['app'].add(performance['processing_time_ms'])
+
+_ANALYZERS = {
+    'user_activity': _analyze_activity,
+    'app': _analyze_app,
+}
+
+def analyze_chunk(task):
+    """
+    파일의 바이트 범위 하나를 집계 (프로세스 풀 작업 단위)
+    :param task: (source, path, start, end)
+    """
+    source, path, start, end = task
+    analyze = _ANALYZERS[source]
+    result = _new_result()
+    lines = 0
+
+    for line in iter_range_lines(path, start, end):
+        lines += 1
+        try:
+            record = _loads(line)
+        except ValueError:
+            result['bad_lines'] += 1
+            continue
+        if isinstance(record, dict):
+            analyze(record, result)
+
+    result['lines'][source] = lines
+    return result
+
+def _prune(counter, max_keys):
+    """고유 키가 max_keys 를 넘으면 빈도 상위 키만 유지 (상위 항목 집계는 근사값이 됨)"""
+    if len(counter) > max_keys:
+        kept = counter.most_common(max_keys)
+        counter.clear()
+        counter.update(dict(kept))
+
+def merge_results(total, part, max_keys=100000):
+    total['lines'].update(part['lines'])
+    total['bad_lines'] += part['bad_lines']
+    total['events'].update(part['events'])
+    total['products'].update(part['products'])
+    total['search_queries'].update(part['search_queries'])
+    _prune(total['products'], max_keys)
+    _prune(total['search_queries'], max_keys)
+    for source in SOURCES:
+        total['status'][source].update(part['status'][source])
+        total['latency'][source].merge(part['latency'][source])
+    return total
+
+def build_tasks(log_dir, start_date=None, end_date=None, chunk_size=64 * 1024 * 1024, sources=SOURCES):
+    """분석할 파일을 (source, path, start, end) 작업 목록으로 분할 (큰 작업부터)"""
+    tasks = []
+    for source in sources:
+        for path in list_log_files(log_dir, source, start_date, end_date):
+            for start, end in split_byte_ranges(path, chunk_size):
+                size = (end - start) if end is not None else os.path.getsize(path)
+                tasks.append((size, (source, path, start, end)))
+    # gzip 파일처럼 나눌 수 없는 큰 작업을 먼저 시작해야 마지막에 한 프로세스만 남는 시간이 줄어듦
+    tasks.sort(key=lambda item: item[0], reverse=True)
+    return [task for _, task in tasks]
+
+def analyze_logs(log_dir, start_date=None, end_date=None, workers=None,
+                 chunk_size=64 * 1024 * 1024, max_keys=100000, sources=SOURCES):
+    """
+    날짜별 로그 파일을 프로세스 풀로 나누어 스트리밍 집계
+    각 작업은 결과 요약(카운터/히스토그램)만 반환하므로 메모리는 파일 크기와 무관
+    """
+    tasks = build_tasks(log_dir, start_date, end_date, chunk_size, sources)
+    total = _new_result()
+    if not tasks:
+        return total
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) == 1:
+        for task in tasks:
+            merge_results(total, analyze_chunk(task), max_keys)
+        return total
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+        for part in executor.map(analyze_chunk, tasks):
+            merge_results(total, part, max_keys)
+    return total
+
+def _top(counter, n):
+    """빈도 상위 n개 (동률은 키 순서로 정렬하여 작업 분할 방식과 관계없이 같은 결과)"""
+    return sorted(counter.items(), key=lambda item: (-item[1], str(item[0])))[:n]
+
+def summarize(result, top=10):
+    """집계 결과를 출력/JSON 저장용 딕셔너리로 변환"""
+    events_by_type = Counter()
+    events_by_hour = {}
+    for (event_type, hour), count in result['events'].items():
+        events_by_type[event_type] += count
+        events_by_hour.setdefault(event_type, {})[hour] = count
+
+    return {
+        'lines': dict(result['lines']),
+        'bad_lines': result['bad_lines'],
+        'events_by_type': dict(events_by_type.most_common()),
+        'events_by_hour': {
+            event_type: dict(sorted(hours.items())) for event_type, hours in sorted(events_by_hour.items())
+        },
+        'top_products': _top(result['products'], top),
+        'top_search_queries': _top(result['search_queries'], top),
+        'status_codes': {
+            source: dict(sorted(counter.items())) for source, counter in result['status'].items()
+        },
+        'processing_time_ms': {
+            source: dict(histogram.percentiles(), count=histogram.count)
+            for source, histogram in result['latency'].items()
+        },
+    }
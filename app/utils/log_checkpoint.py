@@ -0,0 +1,159 @@
+import os
+import gzip
+import json
+import struct
+import hashlib
+
+from app.utils.log_reader import list_log_files, parse_log_filename, log_file_period
+
+CHECKPOINT_VERSION = 1
+
+def _line_digest(line):
+    return hashlib.sha1(line).hexdigest()
+
+def _gzip_uncompressed_size(path):
+    """gzip 트레일러의 ISIZE (원본 크기 mod 2^32) - 압축을 풀지 않고 새 데이터 유무 확인용"""
+    with open(path, 'rb') as f:
+        f.seek(-4, os.SEEK_END)
+        return struct.unpack('<I', f.read(4))[0]
+
+class CheckpointedLogReader:
+    """
+    날짜별 로그 파일을 지난번 읽은 위치부터 이어서 읽는 증분 리더
+    파일(날짜 또는 시간)별로 inode, 바이트 오프셋, 마지막 완성 줄(길이/해시)을 체크포인트 파일에 저장
+
+    - 새로 추가된 완성 줄만 반환 (아직 줄바꿈이 없는 마지막 줄은 다음 실행에서 읽음)
+    - 날짜가 바뀌면 이전 날짜 파일의 나머지를 읽은 뒤 새 파일을 처음부터 읽음
+    - 이어 읽기 전에 오프셋 직전의 마지막 줄을 대조하여, 압축(log -> log.gz) 등으로 파일이 바뀌어도
+      같은 내용이면 이어서 읽고 다르면(교체/잘림) 처음부터 다시 읽음
+    - 압축된 파일을 끝까지 읽으면 완료로 표시하여 이후 실행에서는 열지 않음
+    - 보관 기간 정리로 삭제된 파일의 체크포인트는 commit() 시 제거
+
+    사용 예:
+        reader = CheckpointedLogReader('logs', 'user_activity', 'logs/.user_activity.checkpoint')
+        for line in reader.iter_new_lines():
+            process(line)
+        reader.commit()  # 처리가 끝난 뒤 저장 (중간에 실패하면 다음 실행에서 다시 읽음)
+    """
+
+    def __init__(self, log_dir, base_name, checkpoint_path, start_date=None):
+        self.log_dir = log_dir
+        self.base_name = base_name
+        self.checkpoint_path = checkpoint_path
+        self.start_date = start_date
+        self.files = self._load()
+        self.counters = {'lines': 0, 'bytes': 0, 'restarted': 0}
+
+    def _load(self):
+        try:
+            with open(self.checkpoint_path, encoding='utf-8') as f:
+                checkpoint = json.load(f)
+        except FileNotFoundError:
+            return {}
+        if checkpoint.get('version') != CHECKPOINT_VERSION or checkpoint.get('base_name') != self.base_name:
+            raise ValueError(f"체크포인트 형식이 맞지 않습니다: {self.checkpoint_path}")
+        return checkpoint['files']
+
+    def commit(self):
+        """현재까지 읽은 위치를 체크포인트 파일에 저장 (임시 파일에 쓴 뒤 rename)"""
+        existing = set()
+        for filename in os.listdir(self.log_dir):
+            parsed = parse_log_filename(filename)
+            if parsed is not None and parsed[0] == self.base_name:
+                existing.add(log_file_period(filename))
+        # 삭제된 파일의 체크포인트 제거
+        self.files = {period: state for period, state in self.files.items() if period in existing}
+
+        tmp_path = self.checkpoint_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': CHECKPOINT_VERSION, 'base_name': self.base_name, 'files': self.files}, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _paths(self):
+        start_date = self.start_date
+        if self.files:
+            # 완료되지 않은 가장 이른 날짜부터 확인
+            pending = [period for period, state in self.files.items() if not state.get('completed')]
+            start_date = (min(pending) if pending else max(self.files))[:10]
+        return list_log_files(self.log_dir, self.base_name, start_date)
+
+    def iter_new_lines(self):
+        """마지막 체크포인트 이후 추가된 완성 줄을 날짜순으로 스트리밍 (str)"""
+        for path in self._paths():
+            yield from self._iter_file(path)
+
+    def iter_new_records(self):
+        """새 줄을 JSON 으로 해석하여 스트리밍 (JSON 이 아닌 줄은 건너뜀)"""
+        for line in self.iter_new_lines():
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+    def _iter_file(self, path):
+        _, _, compressed = parse_log_filename(path)
+        key = log_file_period(path)
+        state = self.files.get(key)
+        if state is not None and state.get('completed'):
+            return
+
+        stat = os.stat(path)
+        if state is not None and state['offset'] > 0:
+            if compressed and _gzip_uncompressed_size(path) == state['offset'] % 2 ** 32:
+                # 이미 끝까지 읽은 내용이 압축된 것 - 열지 않고 완료 처리
+                state.update(inode=stat.st_ino, compressed=True, completed=True)
+                return
+
+        f = gzip.open(path, 'rb') if compressed else open(path, 'rb')
+        with f:
+            offset = self._resume_offset(f, stat, compressed, state)
+            if offset == 0 and state is not None and state['offset'] > 0:
+                self.counters['restarted'] += 1
+            state = self.files[key] = {
+                'inode': stat.st_ino,
+                'offset': offset,
+                'compressed': compressed,
+                'completed': False,
+                'last_line_length': state['last_line_length'] if offset else 0,
+                'last_line_sha1': state['last_line_sha1'] if offset else None,
+            }
+
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    # 아직 기록 중인 줄 - 다음 실행에서 읽음
+                    break
+                state['offset'] += len(line)
+                state['last_line_length'] = len(line)
+                state['last_line_sha1'] = _line_digest(line)
+                self.counters['bytes'] += len(line)
+                text = line.rstrip(b'\n')
+                if text:
+                    self.counters['lines'] += 1
+                    yield text.decode('utf-8', errors='replace')
+            else:
+                if compressed:
+                    state['completed'] = True
+
+    def _resume_offset(self, f, stat, compressed, state):
+        """
+        이어서 읽을 오프셋 - 같은 파일이거나 내용이 이어지는 교체 파일이면 저장된 오프셋, 아니면 0
+        """
+        if state is None or state['offset'] == 0:
+            return 0
+
+        offset = state['offset']
+        if not compressed and stat.st_size < offset:
+            # 파일이 잘리거나 더 짧은 파일로 교체됨
+            return 0
+        # 오프셋 직전의 마지막 줄이 같은지 확인
+        # (inode 는 삭제 후 새 파일에 재사용될 수 있으므로 같은 inode 여도 대조)
+        length = state['last_line_length']
+        try:
+            f.seek(offset - length)
+            line = f.read(length)
+        except (OSError, EOFError):
+            return 0
+        if len(line) == length and _line_digest(line) == state['last_line_sha1']:
+            return offset
+        return 0
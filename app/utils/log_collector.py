@@ -0,0 +1,273 @@
+import os
+import time
+import signal
+import socket
+import struct
+import logging
+import selectors
+
+from app.utils.daily_logger import DailyFileHandler, BufferedDailyFileHandler
+
+# 프로젝트 루트의 logs 디렉토리 (setup_logger 와 같은 위치)
+DEFAULT_LOG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'logs')
+
+# 프레임 형식: 4바이트 길이(big endian) + "로거이름\0레벨\0생성시각\0메시지" (UTF-8)
+_FRAME_HEADER = struct.Struct('>I')
+_MAX_FRAME_SIZE = 16 * 1024 * 1024
+
+# 로거 이름 -> 날짜별 파일 기본 이름
+LOG_FILE_NAMES = {
+    'app': 'app',
+    'user_activity': 'user_activity',
+}
+
+def default_socket_path(log_dir=DEFAULT_LOG_DIR):
+    """수집기 Unix 소켓 기본 경로"""
+    return os.path.join(log_dir, 'log_collector.sock')
+
+def encode_frame(logger_name, levelno, created, text):
+    """로그 한 건을 소켓 전송용 프레임으로 변환"""
+    payload = f"{logger_name}\0{levelno}\0{created!r}\0{text}".encode('utf-8')
+    return _FRAME_HEADER.pack(len(payload)) + payload
+
+def decode_frames(buffer):
+    """
+    버퍼에서 완성된 프레임을 모두 꺼냄
+    :return: ([(logger_name, levelno, created, text), ...], 남은 버퍼)
+    """
+    frames = []
+    offset = 0
+    while len(buffer) - offset >= _FRAME_HEADER.size:
+        (size,) = _FRAME_HEADER.unpack_from(buffer, offset)
+        if size > _MAX_FRAME_SIZE:
+            raise ValueError(f"로그 프레임 크기 초과: {size}")
+        end = offset + _FRAME_HEADER.size + size
+        if len(buffer) < end:
+            break
+        payload = bytes(buffer[offset + _FRAME_HEADER.size:end]).decode('utf-8', errors='replace')
+        logger_name, levelno, created, text = payload.split('\0', 3)
+        frames.append((logger_name, int(levelno), float(created), text))
+        offset = end
+    return frames, buffer[offset:]
+
+class CollectorLogHandler(logging.Handler):
+    """
+    포맷된 로그를 Unix 소켓으로 수집기 프로세스에 전송하는 핸들러 (gunicorn 워커용)
+    수집기에 연결할 수 없으면 retry_interval 동안 직접 날짜별 파일에 기록
+    """
+
+    def __init__(self, socket_path, logger_name, fallback_base_name=None, retry_interval=5.0):
+        logging.Handler.__init__(self)
+        self.socket_path = socket_path
+        self.logger_name = logger_name
+        self.fallback_base_name = fallback_base_name
+        self.retry_interval = retry_interval
+        self.sock = None
+        self._pid = None
+        self._retry_at = 0
+        self._fallback = None
+
+    def emit(self, record):
+        try:
+            frame = encode_frame(self.logger_name, record.levelno, record.created, self.format(record))
+            if not self._send(frame):
+                self._emit_fallback(record)
+        except Exception:
+            self.handleError(record)
+
+    def _send(self, frame):
+        """프레임 전송 - 실패 시 False (handle() 이 lock 을 잡고 있어 프레임이 섞이지 않음)"""
+        # fork 된 프로세스는 부모의 연결을 쓰지 않고 새로 연결
+        if self.sock is not None and self._pid != os.getpid():
+            self._close_socket()
+
+        if self.sock is None:
+            if time.monotonic() < self._retry_at:
+                return False
+            try:
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                sock.connect(self.socket_path)
+            except OSError:
+                sock.close()
+                self._retry_at = time.monotonic() + self.retry_interval
+                return False
+            self.sock = sock
+            self._pid = os.getpid()
+
+        try:
+            self.sock.sendall(frame)
+            return True
+        except OSError:
+            self._close_socket()
+            self._retry_at = time.monotonic() + self.retry_interval
+            return False
+
+    def _emit_fallback(self, record):
+        """수집기를 사용할 수 없을 때 직접 파일에 기록"""
+        if self.fallback_base_name is None:
+            return
+        if self._fallback is None:
+            self._fallback = DailyFileHandler(self.fallback_base_name)
+            self._fallback.setFormatter(self.formatter)
+        self._fallback.handle(record)
+
+    def _close_socket(self):
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+        self.sock = None
+
+    def close(self):
+        with self.lock:
+            if self.sock is not None:
+                self._close_socket()
+            if self._fallback is not None:
+                self._fallback.close()
+                self._fallback = None
+        logging.Handler.close(self)
+
+class LogCollector:
+    """
+    여러 워커가 보낸 로그를 받아 날짜별 파일에 기록하는 수집기
+    - 단일 스레드 selector 루프에서 프레임 단위로 처리하므로 줄이 섞이거나 잘리지 않고,
+      워커별 기록 순서가 유지됨
+    - 파일은 큰 버퍼의 BufferedDailyFileHandler 가 소유하여 큰 단위로 기록하고 rollover 도 한 번만 수행
+    """
+
+    def __init__(self, socket_path, log_dir=DEFAULT_LOG_DIR, buffer_size=1024 * 1024, flush_interval=1.0):
+        self.socket_path = socket_path
+        self.log_dir = log_dir
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.handlers = {}
+        self.selector = selectors.DefaultSelector()
+        self.server = None
+        self._stopping = False
+        self.counters = {'connections': 0, 'records': 0, 'bad_frames': 0}
+
+    def _get_handler(self, logger_name):
+        """로거 이름에 해당하는 날짜별 파일 핸들러 (처음 사용 시 생성)"""
+        handler = self.handlers.get(logger_name)
+        if handler is None:
+            base_name = LOG_FILE_NAMES.get(logger_name)
+            if base_name is None:
+                return None
+            handler = BufferedDailyFileHandler(
+                os.path.join(self.log_dir, base_name),
+                encoding='utf-8',
+                buffer_size=self.buffer_size,
+                flush_interval=self.flush_interval
+            )
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            self.handlers[logger_name] = handler
+        return handler
+
+    def _write(self, frames):
+        for logger_name, levelno, created, text in frames:
+            handler = self._get_handler(logger_name)
+            if handler is None:
+                self.counters['bad_frames'] += 1
+                continue
+            record = logging.makeLogRecord({
+                'name': logger_name,
+                'msg': text,
+                'levelno': levelno,
+                'levelname': logging.getLevelName(levelno),
+                'created': created,
+            })
+            handler.handle(record)
+            self.counters['records'] += 1
+
+    def start(self):
+        """Unix 소켓 바인드"""
+        os.makedirs(os.path.dirname(self.socket_path) or '.', exist_ok=True)
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(self.socket_path)
+        self.server.listen(128)
+        self.server.setblocking(False)
+        self.selector.register(self.server, selectors.EVENT_READ, None)
+
+    def stop(self, *args):
+        """종료 요청 - 이미 연결된 워커의 남은 데이터는 모두 읽은 뒤 종료"""
+        self._stopping = True
+
+    def serve_forever(self, drain_timeout=5.0):
+        if self.server is None:
+            self.start()
+
+        drain_deadline = None
+        while True:
+            if self._stopping:
+                if drain_deadline is None:
+                    # 새 연결은 더 받지 않음
+                    self.selector.unregister(self.server)
+                    self.server.close()
+                    drain_deadline = time.monotonic() + drain_timeout
+                if not self.selector.get_map() or time.monotonic() >= drain_deadline:
+                    break
+
+            for key, _ in self.selector.select(timeout=self.flush_interval):
+                if key.data is None:
+                    self._accept()
+                else:
+                    self._read(key)
+
+        self.close()
+
+    def _accept(self):
+        try:
+            conn, _ = self.server.accept()
+        except OSError:
+            return
+        conn.setblocking(False)
+        self.selector.register(conn, selectors.EVENT_READ, bytearray())
+        self.counters['connections'] += 1
+
+    def _read(self, key):
+        conn = key.fileobj
+        try:
+            chunk = conn.recv(256 * 1024)
+        except BlockingIOError:
+            return
+        except OSError:
+            chunk = b''
+
+        if not chunk:
+            # 워커 연결 종료
+            self.selector.unregister(conn)
+            conn.close()
+            return
+
+        key.data.extend(chunk)
+        try:
+            frames, rest = decode_frames(key.data)
+        except ValueError:
+            # 프레임 형식이 깨진 연결은 끊음
+            self.counters['bad_frames'] += 1
+            self.selector.unregister(conn)
+            conn.close()
+            return
+
+        del key.data[:len(key.data) - len(rest)]
+        self._write(frames)
+
+    def close(self):
+        for handler in self.handlers.values():
+            handler.close()
+        self.handlers = {}
+        self.selector.close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+def run_collector(socket_path=None, log_dir=DEFAULT_LOG_DIR, buffer_size=1024 * 1024, flush_interval=1.0):
+    """수집기 프로세스 진입점 - SIGTERM/SIGINT 를 받으면 남은 로그를 기록하고 종료"""
+    collector = LogCollector(socket_path or default_socket_path(log_dir), log_dir, buffer_size, flush_interval)
+    signal.signal(signal.SIGTERM, collector.stop)
+    signal.signal(signal.SIGINT, collector.stop)
+    collector.start()
+    print(f"로그 수집기 시작: {collector.socket_path} -> {log_dir}")
+    collector.serve_forever()
+    print(f"로그 수집기 종료: {collector.counters}")
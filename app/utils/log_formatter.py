@@ -0,0 +1,111 @@
+import json
+import logging
+from datetime import datetime
+from flask import g, request, has_request_context
+
+try:
+    import orjson
+except ImportError:  # orjson 이 없으면 표준 json 사용
+    orjson = None
+
+def dumps(obj):
+    """로그 레코드를 JSON 문자열로 직렬화 (따옴표/제어 문자 등은 올바르게 escape)"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, default=str, separators=(',', ':'))
+
+def _static_request_context():
+    """
+    요청 동안 변하지 않는 로그 필드 (request_id, http)
+    요청마다 한 번만 만들어 g 에 캐시 - request_id 가 생성된 이후에만 캐시
+    """
+    context = g.get('_log_context')
+    if context is not None:
+        return context
+
+    context = {
+        "http": {
+            "method": request.method,
+            "url": request.url,
+            "path": request.path,
+            "endpoint": request.endpoint,
+            "ip": request.remote_addr,
+            "user_agent": request.user_agent.string if request.user_agent else None,
+            "referrer": request.referrer
+        }
+    }
+    request_id = g.get('request_id')
+    if request_id:
+        context["request_id"] = request_id
+        g._log_context = context
+    return context
+
+def build_log_context(record):
+    """
+    레코드에 붙일 요청 컨텍스트 구성
+    - 고정 필드는 요청당 한 번 만든 캐시를 재사용
+    - 사용자 정보는 이미 로드된 g.user / Flask-Login 사용자만 참조 (로깅 때문에 DB 조회하지 않음)
+    """
+    context = {}
+
+    if has_request_context():
+        context.update(_static_request_context())
+
+        user = g.get('user')
+        if user is not None:
+            context["user_id"] = user.id
+
+        login_user = g.get('_login_user')
+        if login_user is not None and getattr(login_user, 'is_authenticated', False):
+            context["auth_user_id"] = login_user.id
+
+        start_time = g.get('request_start_time')
+        if start_time is not None:
+            context["performance"] = {
+                "processing_time_ms": (datetime.now() - start_time).total_seconds() * 1000
+            }
+
+    if record.exc_info:
+        context["exception"] = {
+            "type": record.exc_info[0].__name__,
+            "message": str(record.exc_info[1]),
+            "traceback": logging.Formatter().formatException(record.exc_info)
+        }
+
+    return context
+
+def capture_log_context(record):
+    """
+    요청 스레드에서 컨텍스트를 미리 레코드에 저장
+    (큐/리스너 스레드에서 포맷할 때는 요청 컨텍스트가 없으므로 enqueue 전에 호출)
+    """
+    if not hasattr(record, 'log_context'):
+        record.log_context = build_log_context(record)
+    return record
+
+class StructuredJsonFormatter(logging.Formatter):
+    """
+    애플리케이션 로그용 구조화 JSON 포맷터
+    형식: {"timestamp", "level", "message", "module", "request_id", "user_id", "http", "performance", ...}
+    extra={"data": {...}} 로 전달한 값은 최상위 필드로 병합
+    """
+
+    def format(self, record):
+        log_record = {
+            "timestamp": datetime.fromtimestamp(record.created).isoformat(timespec='microseconds'),
+            "level": record.levelname,
+            "message": record.getMessage(),
+            "module": record.module
+        }
+
+        context = getattr(record, 'log_context', None)
+        if context is None:
+            context = build_log_context(record)
+        if context:
+            log_record.update(context)
+
+        data = getattr(record, 'data', None)
+        if data:
+            log_record.update(data)
+
+        return dumps(log_record)
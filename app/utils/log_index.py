@@ -0,0 +1,193 @@
+import os
+import re
+import mmap
+import json
+import hashlib
+from bisect import bisect_left
+from datetime import datetime
+
+from app.utils.log_reader import list_log_files, iter_log_lines, line_timestamp
+
+# 날짜별 로그 파일 옆에 두는 색인 파일 (user_activity-YYYY-MM-DD.log.idx)
+INDEX_SUFFIX = '.idx'
+INDEX_VERSION = 1
+
+_TIMESTAMP_FIELD = re.compile(rb'"timestamp":\s*"([^"]*)"')
+
+# 타임스탬프가 없는 블록의 최소값 (어떤 범위에도 걸리지 않도록)
+_NO_TIMESTAMP = '\uffff'
+
+def index_path_for(log_path):
+    return log_path + INDEX_SUFFIX
+
+def normalize_time(value):
+    """조회 시각을 로그 timestamp 와 문자열 비교 가능한 ISO 형식으로 변환 ('2025-03-10 14:05' 등 허용)"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return datetime.fromisoformat(value).isoformat()
+
+class LogTimeIndex:
+    """
+    날짜별 평문 로그 파일의 희소 시간 색인
+    - block_lines 줄마다 (시작 오프셋, 끝 오프셋, 최소 timestamp, 최대 timestamp) 를 색인 파일에 추가
+    - 이미 색인한 부분은 다시 읽지 않고 새로 추가된 완성 줄만 색인 (update)
+    - 여러 워커/큐 때문에 줄 순서가 조금 뒤섞여도 블록별 최소/최대값으로 후보 블록을 찾으므로 결과가 정확함
+      (시간순 파일이면 후보 블록이 요청 범위와 거의 일치)
+    """
+
+    def __init__(self, log_path, block_lines=1000):
+        self.log_path = log_path
+        self.index_path = index_path_for(log_path)
+        self.block_lines = block_lines
+        self.blocks = []
+        self._prefix_max = []
+        self._suffix_min = []
+
+    @staticmethod
+    def _first_line_digest(f):
+        f.seek(0)
+        return hashlib.sha1(f.readline()).hexdigest()
+
+    def _load(self, f, size):
+        """색인 파일을 읽음 - 로그 파일이 교체/잘렸거나 설정이 다르면 빈 색인으로 다시 시작"""
+        self.blocks = []
+        header = {
+            'version': INDEX_VERSION,
+            'block_lines': self.block_lines,
+            'first_line_sha1': self._first_line_digest(f),
+        }
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as index_file:
+                if json.loads(index_file.readline()) != header:
+                    raise ValueError
+                for line in index_file:
+                    start, end, min_ts, max_ts = line.rstrip('\n').split('\t')
+                    self.blocks.append((int(start), int(end), min_ts, max_ts))
+            if self.blocks and self.blocks[-1][1] > size:
+                raise ValueError
+            return
+        except (FileNotFoundError, ValueError):
+            self.blocks = []
+
+        tmp_path = self.index_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as index_file:
+            index_file.write(json.dumps(header) + '\n')
+        os.replace(tmp_path, self.index_path)
+
+    def update(self):
+        """
+        색인 파일을 로그 파일의 현재 내용에 맞게 갱신
+        :return: 새로 추가한 블록 수
+        """
+        new_blocks = []
+        with open(self.log_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            self._load(f, size)
+
+            start = self.blocks[-1][1] if self.blocks else 0
+            f.seek(start)
+            position = start
+            lines = 0
+            min_ts = max_ts = None
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                position += len(line)
+                match = _TIMESTAMP_FIELD.search(line)
+                if match:
+                    timestamp = match.group(1).decode('utf-8', errors='replace')
+                    if min_ts is None or timestamp < min_ts:
+                        min_ts = timestamp
+                    if max_ts is None or timestamp > max_ts:
+                        max_ts = timestamp
+                lines += 1
+                if lines >= self.block_lines:
+                    new_blocks.append((start, position, min_ts or _NO_TIMESTAMP, max_ts or ''))
+                    start = position
+                    lines = 0
+                    min_ts = max_ts = None
+
+        if new_blocks:
+            with open(self.index_path, 'a', encoding='utf-8') as index_file:
+                index_file.writelines('\t'.join(map(str, block)) + '\n' for block in new_blocks)
+            self.blocks.extend(new_blocks)
+
+        self._build_search_arrays()
+        return len(new_blocks)
+
+    def _build_search_arrays(self):
+        """이분 탐색용 배열 - 블록 최대값의 누적 최대(증가), 블록 최소값의 뒤에서부터 누적 최소(증가)"""
+        self._prefix_max = []
+        current = ''
+        for _, _, _, max_ts in self.blocks:
+            current = max(current, max_ts)
+            self._prefix_max.append(current)
+
+        self._suffix_min = [None] * len(self.blocks)
+        current = _NO_TIMESTAMP
+        for i in range(len(self.blocks) - 1, -1, -1):
+            current = min(current, self.blocks[i][2])
+            self._suffix_min[i] = current
+
+    def candidate_range(self, start, end):
+        """
+        [start, end) 범위의 줄이 있을 수 있는 바이트 범위 (색인된 부분만)
+        :return: (시작 오프셋, 끝 오프셋) 또는 후보가 없으면 None
+        """
+        first = bisect_left(self._prefix_max, start)
+        last = bisect_left(self._suffix_min, end) - 1
+        if first > last:
+            return None
+        return self.blocks[first][0], self.blocks[last][1]
+
+    def iter_range(self, start, end):
+        """
+        timestamp 가 [start, end) 인 줄을 파일 순서대로 스트리밍
+        파일은 mmap 으로 열어 후보 블록과 아직 색인되지 않은 끝부분만 읽음
+        """
+        start = normalize_time(start)
+        end = normalize_time(end)
+        self.update()
+
+        with open(self.log_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return
+            indexed_end = self.blocks[-1][1] if self.blocks else 0
+            ranges = []
+            candidate = self.candidate_range(start, end)
+            if candidate:
+                ranges.append(candidate)
+            if indexed_end < size:
+                ranges.append((indexed_end, size))
+
+            start_bytes = start.encode('utf-8')
+            end_bytes = end.encode('utf-8')
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for range_start, range_end in ranges:
+                    position = range_start
+                    while position < range_end:
+                        newline = mm.find(b'\n', position, range_end)
+                        if newline == -1:
+                            break
+                        line = mm[position:newline]
+                        position = newline + 1
+                        match = _TIMESTAMP_FIELD.search(line)
+                        if match and start_bytes <= match.group(1) < end_bytes:
+                            yield line.decode('utf-8', errors='replace')
+
+def iter_time_range(log_dir, base_name, start, end, block_lines=1000):
+    """
+    여러 날짜에 걸친 [start, end) 범위의 로그 줄을 스트리밍
+    평문 파일은 색인을 사용하고, 압축 파일(gzip 은 임의 위치 접근 불가)은 순차 탐색
+    """
+    start = normalize_time(start)
+    end = normalize_time(end)
+    for path in list_log_files(log_dir, base_name, start[:10], end[:10]):
+        if path.endswith('.gz'):
+            for line in iter_log_lines(path):
+                timestamp = line_timestamp(line)
+                if timestamp is not None and start <= timestamp < end:
+                    yield line
+        else:
+            yield from LogTimeIndex(path, block_lines).iter_range(start, end)
@@ -0,0 +1,131 @@
+import os
+import time
+import gzip
+import shutil
+import logging
+import threading
+from datetime import date, timedelta
+
+from app.utils.log_reader import parse_log_filename
+from app.utils.log_index import index_path_for
+
+try:
+    import fcntl
+except ImportError:  # Windows 등 fcntl 이 없는 환경에서는 프로세스 간 잠금 생략
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+def _remove_index(path):
+    """평문 로그의 시간 색인 파일 삭제 (압축/삭제된 파일의 색인은 더 이상 쓸 수 없음)"""
+    try:
+        os.remove(index_path_for(path))
+    except FileNotFoundError:
+        pass
+
+def compress_closed_logs(log_dir, today=None, grace_seconds=600):
+    """
+    오늘 이전 날짜의 평문 로그 파일을 gzip 으로 압축하고 원본 삭제
+    - 자정 직후 아직 버퍼를 비우는 핸들러가 있을 수 있으므로 마지막 수정 후 grace_seconds 가 지난 파일만 처리
+    - 임시 파일에 쓴 뒤 rename 하므로 읽는 쪽은 항상 온전한 파일만 봄
+    :return: 압축한 파일 경로 목록
+    """
+    today = today or date.today()
+    compressed = []
+
+    for filename in sorted(os.listdir(log_dir)):
+        parsed = parse_log_filename(filename)
+        if parsed is None:
+            continue
+        _, log_date, is_compressed = parsed
+        if is_compressed or log_date >= today:
+            continue
+
+        path = os.path.join(log_dir, filename)
+        if time.time() - os.path.getmtime(path) < grace_seconds:
+            continue
+
+        gz_path = path + '.gz'
+        tmp_path = gz_path + '.tmp'
+        with open(path, 'rb') as src, gzip.open(tmp_path, 'wb') as dst:
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+        os.replace(tmp_path, gz_path)
+        os.remove(path)
+        _remove_index(path)
+        compressed.append(gz_path)
+
+    return compressed
+
+def enforce_retention(log_dir, retention_days, today=None):
+    """
+    보관 기간(retention_days)이 지난 날짜별 로그 파일(평문/압축) 삭제
+    :return: 삭제한 파일 경로 목록
+    """
+    today = today or date.today()
+    cutoff = today - timedelta(days=retention_days)
+    removed = []
+
+    for filename in sorted(os.listdir(log_dir)):
+        parsed = parse_log_filename(filename)
+        if parsed is None or parsed[1] >= cutoff:
+            continue
+        path = os.path.join(log_dir, filename)
+        os.remove(path)
+        _remove_index(path)
+        removed.append(path)
+
+    return removed
+
+def run_maintenance(log_dir, retention_days=30, grace_seconds=600):
+    """
+    압축과 보관 기간 정리를 한 번 실행
+    여러 워커가 동시에 실행하지 않도록 logs/.maintenance.lock 파일 잠금 사용
+    :return: {'compressed': [...], 'removed': [...]} 또는 다른 프로세스가 실행 중이면 None
+    """
+    lock_file = open(os.path.join(log_dir, '.maintenance.lock'), 'a')
+    try:
+        if fcntl is not None:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                return None
+
+        # 보관 기간이 지난 파일은 압축하지 않고 바로 삭제
+        removed = enforce_retention(log_dir, retention_days)
+        compressed = compress_closed_logs(log_dir, grace_seconds=grace_seconds)
+        return {'compressed': compressed, 'removed': removed}
+    finally:
+        lock_file.close()
+
+class LogMaintenance:
+    """요청 경로 밖에서 주기적으로 로그 압축/보관 기간 정리를 수행하는 백그라운드 작업"""
+
+    def __init__(self, log_dir, retention_days=30, interval=3600, grace_seconds=600):
+        self.log_dir = log_dir
+        self.retention_days = retention_days
+        self.interval = interval
+        self.grace_seconds = grace_seconds
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        self._stop_event.clear()
+        self._pid = os.getpid()
+        self._thread = threading.Thread(target=self._run, name='log-maintenance', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                result = run_maintenance(self.log_dir, self.retention_days, self.grace_seconds)
+                if result and (result['compressed'] or result['removed']):
+                    logger.info(f"로그 정리 완료: 압축 {len(result['compressed'])}개, 삭제 {len(result['removed'])}개")
+            except Exception as e:
+                logger.error(f"로그 정리 오류: {str(e)}")
+            self._stop_event.wait(self.interval)
@@ -0,0 +1,198 @@
+import os
+import re
+import gzip
+import json
+import heapq
+import tempfile
+from datetime import datetime, date
+
+# 로그 줄의 timestamp 필드 (JSON 전체를 해석하지 않고 정렬 키만 추출)
+_TIMESTAMP_FIELD = re.compile(r'"timestamp":\s*"([^"]*)"')
+
+# 날짜별 로그 파일 이름: base-YYYY-MM-DD.log 또는 압축된 base-YYYY-MM-DD.log.gz
+# 시간별로 나눈 파일은 base-YYYY-MM-DD_HH.log (generate_log.py --split hourly)
+LOG_FILE_PATTERN = re.compile(r'^(?P<base>.+)-(?P<date>\d{4}-\d{2}-\d{2})(?:_(?P<hour>\d{2}))?\.log(?P<gz>\.gz)?$')
+
+def parse_log_filename(filename):
+    """
+    날짜별 로그 파일 이름 해석
+    :return: (base_name, date, compressed) 또는 형식이 맞지 않으면 None
+    """
+    match = LOG_FILE_PATTERN.match(os.path.basename(filename))
+    if not match:
+        return None
+    try:
+        log_date = datetime.strptime(match.group('date'), '%Y-%m-%d').date()
+    except ValueError:
+        return None
+    return match.group('base'), log_date, bool(match.group('gz'))
+
+def log_file_period(filename):
+    """
+    로그 파일이 담는 기간 키 - 날짜별 파일은 'YYYY-MM-DD', 시간별 파일은 'YYYY-MM-DD_HH'
+    (문자열 순서가 시간순, 형식이 맞지 않으면 None)
+    """
+    match = LOG_FILE_PATTERN.match(os.path.basename(filename))
+    if not match:
+        return None
+    hour = match.group('hour')
+    return f"{match.group('date')}_{hour}" if hour else match.group('date')
+
+def _to_date(value):
+    if value is None or isinstance(value, date):
+        return value
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+def list_log_files(log_dir, base_name, start_date=None, end_date=None):
+    """
+    base_name 의 날짜별(또는 시간별) 로그 파일 목록 (시간순)
+    같은 기간에 평문/압축 파일이 모두 있으면(압축 진행 중) 평문 파일 사용
+    :param start_date, end_date: date 또는 'YYYY-MM-DD' (포함 범위)
+    """
+    start_date = _to_date(start_date)
+    end_date = _to_date(end_date)
+
+    by_period = {}
+    for filename in os.listdir(log_dir):
+        parsed = parse_log_filename(filename)
+        if parsed is None or parsed[0] != base_name:
+            continue
+        _, log_date, compressed = parsed
+        if start_date and log_date < start_date:
+            continue
+        if end_date and log_date > end_date:
+            continue
+        period = log_file_period(filename)
+        if period in by_period and compressed:
+            continue
+        by_period[period] = os.path.join(log_dir, filename)
+
+    return [by_period[period] for period in sorted(by_period)]
+
+def open_log(path, encoding='utf-8'):
+    """평문/gzip 로그 파일을 같은 방식으로 여는 텍스트 스트림"""
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding=encoding, errors='replace')
+    return open(path, 'r', encoding=encoding, errors='replace')
+
+def iter_log_lines(paths):
+    """
+    여러 로그 파일의 줄을 순서대로 스트리밍 (빈 줄 제외, 파일 전체를 메모리에 올리지 않음)
+    :param paths: 파일 경로 하나 또는 경로 목록
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    for path in paths:
+        with open_log(path) as f:
+            for line in f:
+                line = line.rstrip('\n')
+                if line:
+                    yield line
+
+def iter_log_records(paths):
+    """로그 줄을 JSON 으로 해석하여 스트리밍 (JSON 이 아닌 줄은 건너뜀)"""
+    for line in iter_log_lines(paths):
+        try:
+            yield json.loads(line)
+        except ValueError:
+            continue
+
+def split_byte_ranges(path, chunk_size):
+    """
+    평문 로그 파일을 chunk_size 바이트 단위의 (start, end) 범위로 분할 (병렬 처리용)
+    gzip 파일은 임의 위치에서 읽을 수 없으므로 파일 전체를 하나의 범위로 반환
+    """
+    size = os.path.getsize(path)
+    if path.endswith('.gz') or size <= chunk_size:
+        return [(0, None)]
+    return [(start, min(start + chunk_size, size)) for start in range(0, size, chunk_size)]
+
+def iter_range_lines(path, start=0, end=None, encoding='utf-8'):
+    """
+    바이트 범위 [start, end) 안에서 시작하는 줄만 스트리밍
+    - start 가 줄 중간이면 그 줄은 이전 범위에 속하므로 건너뜀
+    - end 를 넘어 끝나는 줄은 이 범위에서 끝까지 읽음
+    범위를 이어 붙이면 모든 줄이 정확히 한 번씩 나옴
+    """
+    if end is None:
+        yield from iter_log_lines(path)
+        return
+
+    with open(path, 'rb') as f:
+        if start > 0:
+            f.seek(start - 1)
+            # 직전 바이트가 줄바꿈이 아니면 start 는 줄 중간이므로 다음 줄부터 시작
+            if f.read(1) != b'\n':
+                f.readline()
+        while f.tell() < end:
+            line = f.readline()
+            if not line:
+                break
+            line = line.rstrip(b'\n')
+            if line:
+                yield line.decode(encoding, errors='replace')
+
+def line_timestamp(line):
+    """로그 줄의 timestamp 문자열 (ISO 형식이므로 문자열 비교로 시간순 정렬 가능), 없으면 None"""
+    match = _TIMESTAMP_FIELD.search(line)
+    return match.group(1) if match else None
+
+def _iter_timed_lines(path):
+    for line in iter_log_lines(path):
+        timestamp = line_timestamp(line)
+        if timestamp is not None:
+            yield timestamp, line
+
+def _is_time_sorted(path):
+    last = ''
+    for timestamp, _ in _iter_timed_lines(path):
+        if timestamp < last:
+            return False
+        last = timestamp
+    return True
+
+def _iter_run_file(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.rstrip('\n')
+            yield line_timestamp(line), line
+
+def _sorted_runs(path, run_size, tmp_dir):
+    """
+    정렬되지 않은 파일을 run_size 줄 단위로 정렬하여 임시 파일(run)로 저장 (외부 정렬)
+    마지막 run 은 메모리에 둔 채 반환
+    """
+    runs = []
+    buffer = []
+    for item in _iter_timed_lines(path):
+        buffer.append(item)
+        if len(buffer) >= run_size:
+            buffer.sort(key=lambda item: item[0])
+            run_path = os.path.join(tmp_dir, f'run-{len(os.listdir(tmp_dir))}.log')
+            with open(run_path, 'w', encoding='utf-8') as f:
+                f.writelines(line + '\n' for _, line in buffer)
+            runs.append(_iter_run_file(run_path))
+            buffer = []
+    buffer.sort(key=lambda item: item[0])
+    runs.append(iter(buffer))
+    return runs
+
+def iter_lines_by_time(paths, run_size=200000):
+    """
+    여러 로그 파일의 줄을 timestamp 순서로 병합하여 스트리밍 (timestamp 가 없는 줄은 제외)
+    - 이미 시간순인 파일(서버가 기록한 로그)은 그대로 스트리밍
+    - 정렬되지 않은 파일(생성기 출력 등)은 run_size 줄 단위 외부 정렬 후 병합하므로 메모리 사용량이 제한됨
+    :return: (timestamp, line) 이터레이터
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+
+    with tempfile.TemporaryDirectory(prefix='log-sort-') as tmp_dir:
+        runs = []
+        for path in paths:
+            if _is_time_sorted(path):
+                runs.append(_iter_timed_lines(path))
+            else:
+                runs.extend(_sorted_runs(path, run_size, tmp_dir))
+        # 같은 timestamp 는 파일 순서를 유지 (heapq.merge 는 안정 병합)
+        yield from heapq.merge(*runs, key=lambda item: item[0])
@@ -0,0 +1,25 @@
+import threading
+from collections import OrderedDict
+
+class PageCursorStore:
+    """
+    세션별 마지막 페이지 (경로, 시각) 저장소 - 서버 측 체류 시간 계산용
+    세션에 두면 요청마다 세션이 바뀌어 세션 저장소에 매번 기록되므로 프로세스 메모리에 따로 보관
+    - 세션 ID 기준 LRU, 최대 max_sessions 개
+    - gunicorn 워커마다 따로 가지므로 같은 세션의 요청이 다른 워커로 가면 그 워커에서 본 마지막 페이지 기준
+      (체류 시간은 클라이언트 로깅의 백업이며, 30분이 넘는 값은 기록하지 않음)
+    """
+
+    def __init__(self, max_sessions=100000):
+        self.max_sessions = max_sessions
+        self._cursors = OrderedDict()
+        self._lock = threading.Lock()
+
+    def swap(self, session_id, path, timestamp):
+        """현재 페이지를 기록하고 이전 (경로, 시각) 반환 (없으면 None)"""
+        with self._lock:
+            previous = self._cursors.pop(session_id, None)
+            self._cursors[session_id] = (path, timestamp)
+            if len(self._cursors) > self.max_sessions:
+                self._cursors.popitem(last=False)
+            return previous
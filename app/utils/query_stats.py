@@ -0,0 +1,160 @@
+import re
+import time
+import heapq
+
+from flask import g, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# 같은 "모양"의 쿼리를 묶기 위한 정규화 (리터럴/IN 목록/공백)
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER_LIST = re.compile(r'\(\s*(?:\?|%s|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%s|%\(\w+\)s|:\w+))+\s*\)')
+_POSTCOMPILE = re.compile(r'\(?__\[POSTCOMPILE_\w+\]\)?')
+_WHITESPACE = re.compile(r'\s+')
+
+# ORM 쿼리는 같은 문자열이 반복되므로 정규화 결과를 캐시 (리터럴이 박힌 원시 SQL 대비 크기 제한)
+_SHAPE_CACHE_SIZE = 4096
+_shape_cache = {}
+
+def statement_shape(statement):
+    """파라미터/리터럴 값과 IN 목록 길이를 지운 쿼리 모양"""
+    shape = _shape_cache.get(statement)
+    if shape is None:
+        if len(_shape_cache) >= _SHAPE_CACHE_SIZE:
+            _shape_cache.clear()
+        shape = _shape_cache[statement] = _normalize(statement)
+    return shape
+
+def _normalize(statement):
+    shape = _STRING_LITERAL.sub('?', statement)
+    shape = _NUMBER_LITERAL.sub('?', shape)
+    shape = _POSTCOMPILE.sub('(?)', shape)
+    shape = _PLACEHOLDER_LIST.sub('(?)', shape)
+    return _WHITESPACE.sub(' ', shape).strip()
+
+_SELECT_HEAD = re.compile(r'^\s*SELECT\s+(?:DISTINCT\s+)?', re.IGNORECASE)
+
+def collapse_select_list(statement):
+    """
+    SELECT 컬럼 목록을 … 로 줄임 (ORM 쿼리는 컬럼 목록만으로도 잘려 FROM/WHERE 가 보이지 않음)
+    괄호 밖의 첫 FROM 까지만 바꾸므로 서브쿼리의 컬럼 목록은 유지
+    """
+    head = _SELECT_HEAD.match(statement)
+    if head is None:
+        return statement
+    depth = 0
+    upper = statement.upper()
+    for i in range(head.end(), len(statement)):
+        char = statement[i]
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif depth == 0 and upper.startswith('FROM', i) and statement[i - 1].isspace() \
+                and (i + 4 == len(statement) or statement[i + 4].isspace()):
+            return statement[:head.end()] + '… ' + statement[i:]
+    return statement
+
+class QueryInstrumentation:
+    """
+    SQLAlchemy 엔진 이벤트로 요청별 쿼리 수, DB 시간, 가장 느린 쿼리를 수집
+    - 요청 밖(백그라운드 writer 등)에서 실행한 쿼리는 집계하지 않음
+    - 같은 모양의 쿼리가 한 요청에서 SQL_N_PLUS_ONE_THRESHOLD 번 이상 실행되면 N+1 의심으로 표시
+    - 결과는 after_request 의 "요청 종료" 로그에 db 필드로 추가
+    """
+
+    def __init__(self, app=None):
+        self.enabled = True
+        self.slow_query_count = 3
+        self.n_plus_one_threshold = 5
+        self.statement_max_length = 300
+        self._listening = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.enabled = app.config.get('SQL_INSTRUMENTATION_ENABLED', True)
+        self.slow_query_count = app.config.get('SQL_SLOW_QUERY_COUNT', self.slow_query_count)
+        self.n_plus_one_threshold = app.config.get('SQL_N_PLUS_ONE_THRESHOLD', self.n_plus_one_threshold)
+        app.extensions['query_instrumentation'] = self
+        if self.enabled and not self._listening:
+            # 바인드가 여러 개여도(읽기 전용 복제본 등) 모든 엔진에 적용되도록 Engine 클래스에 등록
+            event.listen(Engine, 'before_cursor_execute', self._before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', self._after_cursor_execute)
+            event.listen(Engine, 'handle_error', self._handle_error)
+            self._listening = True
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if self.enabled and has_request_context():
+            conn.info.setdefault('_query_start', []).append(time.perf_counter())
+
+    def _handle_error(self, exception_context):
+        # 실패한 쿼리는 after_cursor_execute 가 호출되지 않으므로 시작 시각을 여기서 제거
+        # (풀에 반환된 연결의 info 에 계속 쌓이지 않도록)
+        conn = exception_context.connection
+        if conn is not None:
+            starts = conn.info.get('_query_start')
+            if starts:
+                starts.pop()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get('_query_start')
+        if not starts or not has_request_context():
+            return
+        elapsed_ms = (time.perf_counter() - starts.pop()) * 1000
+
+        stats = g.get('_query_stats')
+        if stats is None:
+            stats = g._query_stats = {'count': 0, 'time_ms': 0.0, 'shapes': {}, 'slowest': []}
+        stats['count'] += 1
+        stats['time_ms'] += elapsed_ms
+
+        shape = statement_shape(statement)
+        entry = stats['shapes'].get(shape)
+        if entry is None:
+            stats['shapes'][shape] = [1, elapsed_ms]
+        else:
+            entry[0] += 1
+            entry[1] += elapsed_ms
+
+        # 가장 느린 쿼리 N 개 (최소 힙)
+        slowest = stats['slowest']
+        item = (elapsed_ms, stats['count'], statement)
+        if len(slowest) < self.slow_query_count:
+            heapq.heappush(slowest, item)
+        elif elapsed_ms > slowest[0][0]:
+            heapq.heapreplace(slowest, item)
+
+    def _truncate(self, statement):
+        statement = collapse_select_list(_WHITESPACE.sub(' ', statement).strip())
+        if len(statement) > self.statement_max_length:
+            return statement[:self.statement_max_length] + '...'
+        return statement
+
+    def summary(self):
+        """현재 요청의 쿼리 통계 (로그용 dict)"""
+        stats = g.get('_query_stats') if has_request_context() else None
+        if stats is None:
+            return {'query_count': 0, 'db_time_ms': 0.0}
+
+        summary = {
+            'query_count': stats['count'],
+            'db_time_ms': round(stats['time_ms'], 3),
+            'distinct_statements': len(stats['shapes']),
+            'slowest': [
+                {'time_ms': round(ms, 3), 'order': order, 'statement': self._truncate(statement)}
+                for ms, order, statement in sorted(stats['slowest'], reverse=True)
+            ],
+        }
+        repeated = sorted(
+            ((count, time_ms, shape) for shape, (count, time_ms) in stats['shapes'].items()
+             if count >= self.n_plus_one_threshold),
+            reverse=True,
+        )
+        if repeated:
+            summary['n_plus_one'] = [
+                {'count': count, 'time_ms': round(time_ms, 3), 'statement': self._truncate(shape)}
+                for count, time_ms, shape in repeated
+            ]
+        return summary
@@ -0,0 +1,342 @@
+import os
+import json
+import glob
+import time
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from flask import Response, g, request, before_render_template, template_rendered
+
+# 요청 단계 (total 은 첫 before_request 부터 마지막 after_request 까지)
+PHASES = ('before_request', 'view', 'template', 'activity_log', 'after_request', 'total')
+
+# 히스토그램 버킷 상한 (ms) - Prometheus 에는 초 단위로 노출
+DEFAULT_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+SNAPSHOT_PATTERN = 'metrics-*.json'
+
+class LatencyMetrics:
+    """
+    (endpoint, 상태 코드 분류, 단계) 별 고정 버킷 지연 시간 히스토그램
+    관측 한 번은 버킷 이분 탐색 + 카운터 증가 (락 안에서 O(log 버킷 수))
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+        self.version = 0
+
+    def observe_many(self, endpoint, status, observations):
+        """:param observations: [(단계, ms), ...]"""
+        with self._lock:
+            for phase, ms in observations:
+                key = (endpoint, status, phase)
+                series = self._series.get(key)
+                if series is None:
+                    series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+                series[0][bisect_left(self.buckets, ms)] += 1
+                series[1] += ms
+                series[2] += 1
+            self.version += 1
+
+    def snapshot(self):
+        """JSON 으로 저장 가능한 사본"""
+        with self._lock:
+            return {
+                'buckets': list(self.buckets),
+                'series': [[*key, list(counts), total, count]
+                           for key, (counts, total, count) in self._series.items()],
+            }
+
+def merge_snapshots(snapshots):
+    """여러 워커의 스냅샷 합산 (버킷 구성이 다른 스냅샷은 건너뜀)"""
+    merged = {}
+    buckets = None
+    for snapshot in snapshots:
+        if buckets is None:
+            buckets = snapshot['buckets']
+        elif snapshot['buckets'] != buckets:
+            continue
+        for endpoint, status, phase, counts, total, count in snapshot['series']:
+            key = (endpoint, status, phase)
+            series = merged.get(key)
+            if series is None:
+                merged[key] = [list(counts), total, count]
+            else:
+                series[0] = [a + b for a, b in zip(series[0], counts)]
+                series[1] += total
+                series[2] += count
+    return buckets or list(DEFAULT_BUCKETS_MS), merged
+
+def merge_samples(snapshots):
+    """
+    워커별 추가 지표 샘플 합산 - 이름이 _max 로 끝나면 최댓값, 나머지(게이지/카운터)는 합계
+    :return: {(이름, 타입, 레이블 쌍 튜플): 값}
+    """
+    merged = {}
+    for snapshot in snapshots:
+        for name, kind, labels, value in snapshot.get('samples', ()):
+            key = (name, kind, tuple(tuple(pair) for pair in labels))
+            if key not in merged:
+                merged[key] = value
+            elif name.endswith('_max'):
+                merged[key] = max(merged[key], value)
+            else:
+                merged[key] += value
+    return merged
+
+def format_samples(merged):
+    """합산한 추가 지표를 Prometheus 텍스트 형식으로"""
+    lines = []
+    current = None
+    for (name, kind, labels), value in sorted(merged.items()):
+        if name != current:
+            lines.append(f'# TYPE {name} {kind}')
+            current = name
+        label_text = ','.join(f'{key}="{_label_value(label)}"' for key, label in labels)
+        lines.append(f'{name}{{{label_text}}} {value:g}')
+    return lines
+
+def _label_value(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def format_prometheus(buckets, merged):
+    """Prometheus 텍스트 형식의 histogram"""
+    lines = [
+        '# HELP http_request_phase_seconds Request latency by endpoint, status class and phase.',
+        '# TYPE http_request_phase_seconds histogram',
+    ]
+    bounds = [f'{bound / 1000:g}' for bound in buckets] + ['+Inf']
+    for (endpoint, status, phase), (counts, total, count) in sorted(merged.items()):
+        labels = f'endpoint="{_label_value(endpoint)}",status="{status}",phase="{phase}"'
+        cumulative = 0
+        for bound, bucket_count in zip(bounds, counts):
+            cumulative += bucket_count
+            lines.append(f'http_request_phase_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'http_request_phase_seconds_sum{{{labels}}} {total / 1000:.6f}')
+        lines.append(f'http_request_phase_seconds_count{{{labels}}} {count}')
+    return lines
+
+class RequestMetrics:
+    """
+    요청 단계별 지연 시간 수집기와 /metrics 엔드포인트
+    - before_request / view(템플릿 제외) / template / activity_log / after_request / total 단계 측정
+    - gunicorn 워커는 METRICS_DIR 에 주기적으로(METRICS_FLUSH_INTERVAL) 스냅샷 파일을 쓰고,
+      /metrics 는 모든 워커의 파일을 합산하여 응답 (METRICS_DIR 이 없으면 현재 프로세스만)
+    - register_samples() 로 다른 지표(연결 풀 등)를 스냅샷에 포함해 워커 간 합산
+    - register_collector() 로 현재 프로세스 기준 지표(텍스트 줄 목록을 반환하는 함수)를 /metrics 에 추가
+
+    create_app 에서 다른 before_request/after_request 보다 먼저 init_app 해야 함
+    (첫 before_request 에서 시작, 마지막 after_request 에서 종료 시각을 기록)
+    """
+
+    def __init__(self, app=None):
+        self.enabled = True
+        self.metrics_dir = None
+        self.flush_interval = 5.0
+        self.latency = LatencyMetrics()
+        self._collectors = []
+        self._sample_sources = []
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.enabled = app.config.get('METRICS_ENABLED', True)
+        self.metrics_dir = app.config.get('METRICS_DIR')
+        self.flush_interval = app.config.get('METRICS_FLUSH_INTERVAL', self.flush_interval)
+        app.extensions['request_metrics'] = self
+        if not self.enabled:
+            return
+        if self.metrics_dir:
+            os.makedirs(self.metrics_dir, exist_ok=True)
+
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+
+        # before_request 와 뷰 사이의 경계를 기록하도록 dispatch_request 감싸기
+        dispatch_request = app.dispatch_request
+
+        def timed_dispatch_request():
+            state = g.get('_metrics')
+            if state is None:
+                return dispatch_request()
+            state['view_start'] = time.perf_counter()
+            try:
+                return dispatch_request()
+            finally:
+                state['view_end'] = time.perf_counter()
+
+        app.dispatch_request = timed_dispatch_request
+
+        before_render_template.connect(self._template_started, app, weak=False)
+        template_rendered.connect(self._template_finished, app, weak=False)
+
+        app.add_url_rule('/metrics', 'metrics', self.metrics_view)
+
+    def register_samples(self, source):
+        """
+        스냅샷에 포함할 지표 함수 등록 - [(이름, 타입, ((레이블, 값), ...), 값), ...] 반환
+        (플러시 스레드에서도 호출되므로 요청 컨텍스트에 의존하지 않아야 함)
+        """
+        self._sample_sources.append(source)
+
+    def register_collector(self, collector):
+        """/metrics 에 추가할 지표 함수 등록 (Prometheus 텍스트 줄 목록 반환)"""
+        self._collectors.append(collector)
+
+    @contextmanager
+    def phase(self, name):
+        """요청 안의 특정 구간을 단계 시간으로 기록"""
+        state = g.get('_metrics')
+        if state is None:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            state['phases'][name] = state['phases'].get(name, 0.0) + time.perf_counter() - started
+
+    def _start_request(self):
+        g._metrics = {'start': time.perf_counter(), 'phases': {}}
+
+    def _template_started(self, sender, template, context, **extra):
+        state = g.get('_metrics')
+        if state is not None:
+            state['template_start'] = time.perf_counter()
+
+    def _template_finished(self, sender, template, context, **extra):
+        state = g.get('_metrics')
+        if state is not None and 'template_start' in state:
+            state['phases']['template'] = state['phases'].get('template', 0.0) + \
+                time.perf_counter() - state.pop('template_start')
+
+    def _finish_request(self, response):
+        state = g.pop('_metrics', None)
+        if state is None or request.endpoint in ('static', 'metrics'):
+            return response
+
+        end = time.perf_counter()
+        phases = state['phases']
+        observations = [('total', end - state['start'])]
+        view_start = state.get('view_start')
+        view_end = state.get('view_end')
+        if view_start is not None and view_end is not None:
+            template = phases.get('template', 0.0)
+            activity_log = phases.get('activity_log', 0.0)
+            observations += [
+                ('before_request', view_start - state['start']),
+                ('view', max(view_end - view_start - template, 0.0)),
+                ('after_request', max(end - view_end - activity_log, 0.0)),
+            ]
+        observations += list(phases.items())
+
+        self._ensure_flusher()
+        self.latency.observe_many(
+            request.endpoint or 'unmatched',
+            f'{response.status_code // 100}xx',
+            [(phase, seconds * 1000) for phase, seconds in observations],
+        )
+        return response
+
+    def _snapshot_path(self):
+        return os.path.join(self.metrics_dir, f'metrics-{os.getpid()}.json')
+
+    def snapshot(self):
+        """현재 프로세스의 히스토그램과 추가 지표 샘플"""
+        snapshot = self.latency.snapshot()
+        samples = snapshot['samples'] = []
+        for source in self._sample_sources:
+            try:
+                samples.extend(source())
+            except Exception:
+                continue
+        return snapshot
+
+    def flush(self):
+        """현재 프로세스의 스냅샷을 METRICS_DIR 에 기록 (임시 파일에 쓴 뒤 rename)"""
+        if not self.metrics_dir:
+            return
+        path = self._snapshot_path()
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp_path, path)
+
+    def _ensure_flusher(self):
+        """워커 프로세스마다 주기적으로 스냅샷을 쓰는 데몬 스레드 (fork 이후 다시 시작)"""
+        if not self.metrics_dir or (self._thread is not None and self._pid == os.getpid()):
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            if self._pid != os.getpid():
+                # 부모 프로세스에서 관측한 값은 부모의 스냅샷에 있으므로 새 워커는 비어서 시작
+                self.latency = LatencyMetrics(self.latency.buckets)
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._flush_loop, name='metrics-flusher', daemon=True)
+            self._thread.start()
+
+    def _flush_loop(self):
+        written = -1
+        while True:
+            time.sleep(self.flush_interval)
+            # 추가 지표(연결 풀 상태 등)는 요청이 없어도 바뀌므로 매번 기록
+            if self.latency.version != written or self._sample_sources:
+                written = self.latency.version
+                try:
+                    self.flush()
+                except OSError:
+                    pass
+
+    def collect(self):
+        """모든 워커의 스냅샷 (METRICS_DIR 이 없으면 현재 프로세스만)"""
+        if not self.metrics_dir:
+            return [self.snapshot()]
+        self.flush()
+        snapshots = []
+        for path in glob.glob(os.path.join(self.metrics_dir, SNAPSHOT_PATTERN)):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return snapshots
+
+    def metrics_view(self):
+        snapshots = self.collect()
+        lines = format_prometheus(*merge_snapshots(snapshots))
+        lines.extend(format_samples(merge_samples(snapshots)))
+        for collector in self._collectors:
+            lines.extend(collector())
+        return Response('\n'.join(lines) + '\n', mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+def mark_process_dead(metrics_dir, pid):
+    """
+    종료된 워커의 스냅샷에서 게이지 샘플 제거 (gunicorn child_exit)
+    히스토그램과 카운터(*_total)는 합계가 줄지 않도록 남김
+    """
+    path = os.path.join(metrics_dir, f'metrics-{pid}.json')
+    try:
+        with open(path, encoding='utf-8') as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return
+    snapshot['samples'] = [sample for sample in snapshot.get('samples', ()) if sample[1] != 'gauge']
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f)
+    os.replace(tmp_path, path)
+
+def clear_snapshots(metrics_dir):
+    """이전 실행의 워커 스냅샷 삭제 (gunicorn 마스터 시작 시)"""
+    for path in glob.glob(os.path.join(metrics_dir, SNAPSHOT_PATTERN)):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,49 @@
+class CountingIterable:
+    """
+    스트리밍 응답 본문을 그대로 전달하면서 보낸 바이트 수를 셈
+    WSGI 서버가 응답을 닫을 때(전송 완료/중단) on_close(보낸 바이트 수, 완료 여부) 를 한 번 호출
+    """
+
+    def __init__(self, iterable, on_close):
+        self.iterable = iterable
+        self.on_close = on_close
+        self.bytes_sent = 0
+        self.completed = False
+        self._closed = False
+
+    def __iter__(self):
+        for chunk in self.iterable:
+            self.bytes_sent += len(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+            yield chunk
+        self.completed = True
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            close = getattr(self.iterable, 'close', None)
+            if close is not None:
+                close()
+        finally:
+            self.on_close(self.bytes_sent, self.completed)
+
+def measure_response_size(response, on_streamed=None):
+    """
+    본문을 읽거나 복사하지 않고 응답 크기 확인
+    - Content-Length 헤더가 있으면 그 값
+    - 메모리에 있는 본문(리스트 등)이면 조각 길이의 합
+    - 스트리밍 응답이면 본문을 CountingIterable 로 감싸고 None 반환 (전송이 끝나면 on_streamed 호출)
+    - 파일 전송(direct_passthrough)처럼 길이를 알 수 없고 감쌀 수도 없는 응답은 None
+    :return: 바이트 수 또는 None
+    """
+    if response.content_length is not None:
+        return response.content_length
+
+    if response.is_sequence:
+        return sum(len(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+                   for chunk in response.response)
+
+    if on_streamed is not None and not response.direct_passthrough:
+        response.response = CountingIterable(response.response, on_streamed)
+    return None
@@ -0,0 +1,238 @@
+import os
+import re
+import time
+import sqlite3
+import secrets
+import threading
+
+from flask import session as current_session
+from flask.json.tag import TaggedJSONSerializer
+from flask_login import user_logged_in, user_logged_out
+from flask.sessions import SecureCookieSession, SessionInterface
+
+try:
+    import redis
+except ImportError:  # redis 패키지가 없으면 redis 백엔드 사용 불가
+    redis = None
+
+SESSION_BACKENDS = ('cookie', 'memory', 'sqlite', 'redis')
+
+# 쿠키에 저장하는 세션 ID (URL-safe 43자 = 256비트 난수)
+_SID_PATTERN = re.compile(r'[A-Za-z0-9_-]{43}')
+
+class MemorySessionStore:
+    """프로세스 메모리 저장소 (단일 프로세스 개발/테스트용)"""
+
+    def __init__(self, sweep_interval=60):
+        self._data = {}
+        self._lock = threading.Lock()
+        self._sweep_interval = sweep_interval
+        self._last_sweep = time.monotonic()
+
+    def get(self, sid):
+        """:return: (payload, 만료 시각 epoch) 또는 None"""
+        with self._lock:
+            entry = self._data.get(sid)
+            if entry is None or entry[1] <= time.time():
+                return None
+            return entry
+
+    def set(self, sid, payload, expires):
+        with self._lock:
+            self._data[sid] = (payload, expires)
+            if time.monotonic() - self._last_sweep >= self._sweep_interval:
+                self._last_sweep = time.monotonic()
+                now = time.time()
+                for expired in [key for key, (_, at) in self._data.items() if at <= now]:
+                    del self._data[expired]
+
+    def delete(self, sid):
+        with self._lock:
+            self._data.pop(sid, None)
+
+class SQLiteSessionStore:
+    """
+    SQLite 파일 저장소 (같은 서버의 여러 gunicorn 워커가 공유)
+    스레드별 연결, WAL 모드, 만료된 세션은 sweep_interval 마다 삭제
+    """
+
+    def __init__(self, path, sweep_interval=300):
+        self.path = path
+        self._local = threading.local()
+        self._sweep_interval = sweep_interval
+        self._last_sweep = 0.0
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        conn.execute('CREATE TABLE IF NOT EXISTS sessions '
+                     '(sid TEXT PRIMARY KEY, payload TEXT NOT NULL, expires REAL NOT NULL)')
+        conn.execute('CREATE INDEX IF NOT EXISTS ix_sessions_expires ON sessions (expires)')
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        # fork 이후에는 부모 프로세스의 연결을 쓰지 않음
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, sid):
+        row = self._connection().execute(
+            'SELECT payload, expires FROM sessions WHERE sid = ? AND expires > ?', (sid, time.time())
+        ).fetchone()
+        return tuple(row) if row else None
+
+    def set(self, sid, payload, expires):
+        conn = self._connection()
+        conn.execute('INSERT OR REPLACE INTO sessions (sid, payload, expires) VALUES (?, ?, ?)',
+                     (sid, payload, expires))
+        now = time.monotonic()
+        if now - self._last_sweep >= self._sweep_interval:
+            self._last_sweep = now
+            conn.execute('DELETE FROM sessions WHERE expires <= ?', (time.time(),))
+
+    def delete(self, sid):
+        self._connection().execute('DELETE FROM sessions WHERE sid = ?', (sid,))
+
+class RedisSessionStore:
+    """Redis 호환 서버 저장소 (여러 서버가 공유, 만료는 Redis TTL 사용)"""
+
+    def __init__(self, url, prefix='session:'):
+        if redis is None:
+            raise RuntimeError('redis 패키지가 설치되어 있지 않습니다')
+        self.client = redis.Redis.from_url(url)
+        self.client.ping()
+        self.prefix = prefix
+
+    def get(self, sid):
+        pipe = self.client.pipeline()
+        pipe.get(self.prefix + sid)
+        pipe.ttl(self.prefix + sid)
+        payload, ttl = pipe.execute()
+        if payload is None:
+            return None
+        return payload.decode('utf-8'), time.time() + max(ttl, 0)
+
+    def set(self, sid, payload, expires):
+        self.client.set(self.prefix + sid, payload, ex=max(1, int(expires - time.time())))
+
+    def delete(self, sid):
+        self.client.delete(self.prefix + sid)
+
+class ServerSideSession(SecureCookieSession):
+    """서버 저장소 세션 - 쿠키에는 sid 만 저장"""
+
+    def __init__(self, initial=None, sid=None, expires=None, new=False):
+        super().__init__(initial)
+        self.sid = sid
+        self.expires = expires
+        self.new = new
+        # 로그인/로그아웃으로 교체되기 전의 sid (저장 시 저장소에서 삭제)
+        self.previous_sid = None
+
+class ServerSideSessionInterface(SessionInterface):
+    """
+    세션 데이터를 서버 저장소에 두고 쿠키에는 짧은 세션 ID 만 보내는 세션 인터페이스
+    - 쿠키 서명/직렬화 없음 (sid 는 추측할 수 없는 256비트 난수)
+    - 지연 쓰기: 세션이 바뀐 요청이나 만료가 절반 이상 지난 요청에서만 저장소에 기록
+    - Set-Cookie 는 새 세션이거나 영구 세션의 만료를 연장할 때만 전송
+    - 세션 고정 방지: 저장소에 없는 sid 로 요청하면 새 sid 를 발급하고, 로그인/로그아웃 시 sid 교체
+    - 저장소 만료와 쿠키 만료 모두 PERMANENT_SESSION_LIFETIME 사용
+    """
+
+    serializer = TaggedJSONSerializer()
+
+    def __init__(self, store):
+        self.store = store
+
+    def regenerate(self, session):
+        """데이터는 유지하고 sid 만 새로 발급 (이전 sid 는 응답 저장 시 삭제)"""
+        if not session.new and session.previous_sid is None:
+            session.previous_sid = session.sid
+        session.sid = secrets.token_urlsafe(32)
+        session.new = True
+        session.modified = True
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid and _SID_PATTERN.fullmatch(sid):
+            stored = self.store.get(sid)
+            if stored is not None:
+                payload, expires = stored
+                try:
+                    data = self.serializer.loads(payload)
+                except ValueError:
+                    data = {}
+                return ServerSideSession(data, sid=sid, expires=expires)
+        return ServerSideSession(sid=secrets.token_urlsafe(32), new=True)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        secure = self.get_cookie_secure(app)
+        samesite = self.get_cookie_samesite(app)
+        httponly = self.get_cookie_httponly(app)
+
+        if session.accessed:
+            response.vary.add('Cookie')
+
+        if session.previous_sid is not None:
+            self.store.delete(session.previous_sid)
+
+        if not session:
+            # 비어 있는 세션 - 기존 세션을 비웠으면 저장소와 쿠키에서 삭제
+            if session.modified and not session.new:
+                self.store.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path, secure=secure,
+                                       samesite=samesite, httponly=httponly)
+            return
+
+        ttl = app.permanent_session_lifetime.total_seconds()
+        now = time.time()
+        refresh = session.expires is None or session.expires - now < ttl / 2
+        if session.modified or refresh:
+            self.store.set(session.sid, self.serializer.dumps(dict(session)), now + ttl)
+
+        if session.new or (refresh and session.permanent):
+            response.set_cookie(name, session.sid, expires=self.get_expiration_time(app, session),
+                                httponly=httponly, domain=domain, path=path, secure=secure,
+                                samesite=samesite)
+
+def create_session_store(app):
+    """SESSION_BACKEND 설정으로 저장소 생성 (redis 를 쓸 수 없으면 sqlite 로 대체)"""
+    backend = app.config.get('SESSION_BACKEND', 'cookie')
+    if backend not in SESSION_BACKENDS:
+        raise ValueError(f"알 수 없는 SESSION_BACKEND: {backend}")
+
+    if backend == 'redis':
+        try:
+            return RedisSessionStore(app.config['SESSION_REDIS_URL'])
+        except Exception as e:
+            app.logger.warning(f"Redis 세션 저장소를 사용할 수 없어 SQLite 로 대체합니다: {e}")
+            backend = 'sqlite'
+    if backend == 'sqlite':
+        return SQLiteSessionStore(app.config['SESSION_SQLITE_PATH'])
+    if backend == 'memory':
+        return MemorySessionStore()
+    return None
+
+def init_session_store(app):
+    """cookie 가 아닌 백엔드면 서버 저장소 세션 인터페이스 설치"""
+    store = create_session_store(app)
+    app.extensions['session_store'] = store
+    if store is None:
+        return
+    interface = app.session_interface = ServerSideSessionInterface(store)
+
+    def _rotate_sid(sender, user=None, **extra):
+        # 로그인 전에 심어 둔 sid 가 인증된 세션이 되지 않도록 로그인/로그아웃 시 sid 교체
+        session = current_session._get_current_object()
+        if isinstance(session, ServerSideSession):
+            interface.regenerate(session)
+
+    user_logged_in.connect(_rotate_sid, app, weak=False)
+    user_logged_out.connect(_rotate_sid, app, weak=False)
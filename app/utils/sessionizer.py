@@ -0,0 +1,164 @@
+import json
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from app.utils.log_reader import iter_lines_by_time
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # orjson 이 없으면 표준 json 사용
+    _loads = json.loads
+
+# 세션 ID 가 없는 요청의 session_id 값 (log_activity 기본값)
+NO_SESSION = 'no_session'
+
+# 전환으로 보는 이벤트/경로 기본값
+CONVERSION_EVENTS = ('cart_add',)
+CONVERSION_PATHS = ('/checkout',)
+
+def _is_page(record):
+    """페이지 이동으로 볼 이벤트 (GET 요청, API/정적 파일 제외)"""
+    path = record.get('path')
+    return (
+        bool(path)
+        and record.get('method') == 'GET'
+        and not path.startswith(('/api/', '/static/'))
+    )
+
+def session_key(record):
+    """세션 식별 키 - session_id 가 없으면 IP + User-Agent 로 대체"""
+    session_id = record.get('session_id')
+    if session_id and session_id != NO_SESSION:
+        return session_id
+    return f"anonymous:{record.get('ip_address')}:{record.get('user_agent')}"
+
+class _OpenSession:
+    __slots__ = ('key', 'user_id', 'start', 'last', 'pages', 'events', 'converted', 'truncated')
+
+    def __init__(self, key, timestamp):
+        self.key = key
+        self.user_id = None
+        self.start = timestamp
+        self.last = timestamp
+        self.pages = []
+        self.events = 0
+        self.converted = False
+        self.truncated = False
+
+class Sessionizer:
+    """
+    시간순으로 들어오는 활동 이벤트를 세션으로 묶는 스트리밍 세션화기
+    - 마지막 이벤트 후 timeout 동안 활동이 없으면 세션 종료
+    - 열린 세션은 마지막 활동 순서로 관리하므로 만료 처리는 앞쪽부터 확인하면 됨
+    - 열린 세션 수(max_open_sessions)와 세션당 페이지 수(max_pages)를 제한하여 메모리 사용량 고정
+    """
+
+    def __init__(self, timeout=timedelta(minutes=30), max_open_sessions=100000, max_pages=500,
+                 conversion_events=CONVERSION_EVENTS, conversion_paths=CONVERSION_PATHS):
+        self.timeout = timeout
+        self.max_open_sessions = max_open_sessions
+        self.max_pages = max_pages
+        self.conversion_events = set(conversion_events)
+        self.conversion_paths = tuple(conversion_paths)
+        self.open_sessions = OrderedDict()
+        self.counters = {'events': 0, 'sessions': 0, 'evicted': 0}
+
+    def feed(self, record, timestamp):
+        """
+        이벤트 하나 처리
+        :param timestamp: 이벤트 시각 (datetime, 이전 이벤트보다 같거나 늦어야 함)
+        :return: 이 이벤트로 종료된 세션 레코드 목록
+        """
+        closed = self._expire(timestamp)
+        self.counters['events'] += 1
+
+        key = session_key(record)
+        session = self.open_sessions.get(key)
+        if session is None:
+            if len(self.open_sessions) >= self.max_open_sessions:
+                # 가장 오래 활동이 없던 세션을 강제로 종료
+                _, oldest = self.open_sessions.popitem(last=False)
+                self.counters['evicted'] += 1
+                closed.append(self._finish(oldest))
+            session = self.open_sessions[key] = _OpenSession(key, timestamp)
+        else:
+            self.open_sessions.move_to_end(key)
+
+        session.last = timestamp
+        session.events += 1
+        if record.get('user_id') is not None:
+            session.user_id = record['user_id']
+
+        if record.get('event_type') in self.conversion_events:
+            session.converted = True
+
+        if _is_page(record):
+            path = record['path']
+            if path.startswith(self.conversion_paths):
+                session.converted = True
+            if len(session.pages) < self.max_pages:
+                session.pages.append((path, timestamp))
+            else:
+                session.truncated = True
+
+        return closed
+
+    def _expire(self, now):
+        closed = []
+        while self.open_sessions:
+            key, session = next(iter(self.open_sessions.items()))
+            if now - session.last <= self.timeout:
+                break
+            del self.open_sessions[key]
+            closed.append(self._finish(session))
+        return closed
+
+    def flush(self):
+        """남은 세션을 모두 종료 (입력 끝)"""
+        closed = [self._finish(session) for session in self.open_sessions.values()]
+        self.open_sessions.clear()
+        return closed
+
+    def _finish(self, session):
+        self.counters['sessions'] += 1
+        pages = []
+        for index, (path, timestamp) in enumerate(session.pages):
+            # 체류 시간은 다음 페이지까지의 시간 (마지막 페이지는 알 수 없음)
+            if index + 1 < len(session.pages):
+                dwell = (session.pages[index + 1][1] - timestamp).total_seconds()
+            else:
+                dwell = None
+            pages.append({'path': path, 'timestamp': timestamp.isoformat(), 'dwell_seconds': dwell})
+
+        return {
+            'session_id': session.key,
+            'user_id': session.user_id,
+            'start': session.start.isoformat(),
+            'end': session.last.isoformat(),
+            'duration_seconds': (session.last - session.start).total_seconds(),
+            'event_count': session.events,
+            'page_count': len(pages),
+            'entry_page': pages[0]['path'] if pages else None,
+            'exit_page': pages[-1]['path'] if pages else None,
+            'converted': session.converted,
+            'truncated': session.truncated,
+            'pages': pages,
+        }
+
+def sessionize_files(paths, sessionizer=None, run_size=200000):
+    """
+    활동 로그 파일들을 시간순으로 병합하여 세션 레코드를 스트리밍
+    :return: 세션 레코드 이터레이터 (sessionizer.counters 에 처리 통계)
+    """
+    sessionizer = sessionizer or Sessionizer()
+    for timestamp, line in iter_lines_by_time(paths, run_size):
+        try:
+            record = _loads(line)
+            event_time = datetime.fromisoformat(timestamp)
+        except ValueError:
+            continue
+        if not isinstance(record, dict) or 'event_type' not in record:
+            continue
+        yield from sessionizer.feed(record, event_time)
+    yield from sessionizer.flush()
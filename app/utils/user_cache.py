@@ -0,0 +1,118 @@
+import time
+import threading
+from collections import OrderedDict
+
+from flask import g, has_request_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+class UserCache:
+    """
+    요청 범위 사용자 조회 계층 - before_request 의 g.user 와 Flask-Login 의 load_user 가 공유
+    - 한 요청 안에서는 같은 사용자를 한 번만 조회 (g 에 보관)
+    - USER_CACHE_TTL(초) > 0 이면 사용자 행(컬럼 값)을 요청 간에도 캐시하여 DB 조회 없이
+      현재 세션에 붙임 (merge(load=False)) - 관계(cart_items 등)는 평소처럼 지연 로딩
+    - 이 프로세스에서 User 를 수정/삭제하고 커밋하면(프로필 편집 등) 해당 사용자 캐시 즉시 제거,
+      다른 워커의 변경은 TTL 이 지나면 반영
+    """
+
+    def __init__(self, app=None):
+        self.ttl = 0
+        self.max_size = 10000
+        self._rows = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0}
+        self._listening = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.ttl = app.config.get('USER_CACHE_TTL', self.ttl)
+        self.max_size = app.config.get('USER_CACHE_SIZE', self.max_size)
+        app.extensions['user_cache'] = self
+
+        # Session 클래스 리스너는 전역이므로 init_app 이 여러 번 호출돼도 한 번만 등록
+        if not self._listening:
+            event.listen(Session, 'after_flush', self._track_user_changes)
+            event.listen(Session, 'after_commit', self._invalidate_on_commit)
+            event.listen(Session, 'after_rollback', self._clear_on_rollback)
+            self._listening = True
+
+    def _track_user_changes(self, session, flush_context):
+        from app.models import User
+        changed = {obj.id for obj in (*session.dirty, *session.deleted) if isinstance(obj, User)}
+        if changed:
+            session.info.setdefault('changed_user_ids', set()).update(changed)
+
+    def _invalidate_on_commit(self, session):
+        for user_id in session.info.pop('changed_user_ids', ()):
+            self.invalidate(user_id)
+
+    def _clear_on_rollback(self, session):
+        session.info.pop('changed_user_ids', None)
+
+    def invalidate(self, user_id=None):
+        """사용자 캐시 제거 (user_id 가 없으면 전체)"""
+        with self._lock:
+            if user_id is None:
+                self._rows.clear()
+            else:
+                self._rows.pop(int(user_id), None)
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counters, size=len(self._rows))
+
+    def get(self, user_id):
+        """
+        ID 로 사용자 조회 (없으면 None)
+        :param user_id: int 또는 세션에 저장된 문자열 ID
+        """
+        try:
+            user_id = int(user_id)
+        except (TypeError, ValueError):
+            return None
+
+        resolved = None
+        if has_request_context():
+            resolved = g.setdefault('_resolved_users', {})
+            if user_id in resolved:
+                return resolved[user_id]
+
+        user = self._load(user_id)
+        if resolved is not None:
+            resolved[user_id] = user
+        return user
+
+    def _load(self, user_id):
+        from app import db
+        from app.models import User
+
+        if self.ttl > 0:
+            with self._lock:
+                entry = self._rows.get(user_id)
+                if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                    self._rows.move_to_end(user_id)
+                    self._counters['hits'] += 1
+                    return self._attach(db.session, User, entry[1])
+                self._counters['misses'] += 1
+
+        user = db.session.get(User, user_id)
+        if self.ttl > 0 and user is not None:
+            row = {column.key: getattr(user, column.key) for column in User.__table__.columns}
+            with self._lock:
+                self._rows[user_id] = (time.monotonic(), row)
+                self._rows.move_to_end(user_id)
+                while len(self._rows) > self.max_size:
+                    self._rows.popitem(last=False)
+        return user
+
+    @staticmethod
+    def _attach(session, model, row):
+        """캐시한 컬럼 값으로 만든 객체를 조회 없이 세션에 붙임 (이미 세션에 있으면 그 객체 사용)"""
+        existing = session.identity_map.get(session.identity_key(model, row['id']))
+        if existing is not None:
+            return existing
+        instance = model(**row)
+        make_transient_to_detached(instance)
+        return session.merge(instance, load=False)
@@ -0,0 +1,52 @@
+# gunicorn 설정 - LOG_COLLECTOR_ENABLED=true 이면 로그 수집기 프로세스를 함께 실행
+# 사용 예: LOG_COLLECTOR_ENABLED=true gunicorn -w 4 app:app
+import os
+import time
+from multiprocessing import Process
+from dotenv import load_dotenv
+
+load_dotenv()
+
+_collector_process = None
+
+def on_starting(server):
+    """마스터 시작 시 워커보다 먼저 수집기 실행"""
+    global _collector_process
+
+    # 이전 실행에서 남은 워커별 지표 스냅샷 삭제
+    if os.getenv('METRICS_DIR'):
+        from app.utils.request_metrics import clear_snapshots
+        clear_snapshots(os.getenv('METRICS_DIR'))
+
+    if os.getenv('LOG_COLLECTOR_ENABLED', 'false').lower() != 'true':
+        return
+
+    from app.utils.log_collector import run_collector, default_socket_path
+    socket_path = os.getenv('LOG_COLLECTOR_SOCKET') or default_socket_path()
+
+    _collector_process = Process(target=run_collector, args=(socket_path,), name='log-collector')
+    _collector_process.start()
+
+    # 소켓이 준비될 때까지 대기 (워커의 첫 로그가 fallback 으로 가지 않도록)
+    deadline = time.monotonic() + 5
+    while not os.path.exists(socket_path) and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+def post_worker_init(worker):
+    """워커가 앱을 불러온 뒤 연결 풀과 캐시를 미리 준비 (DB_WARMUP=false 이면 생략)"""
+    app = worker.wsgi
+    db_pool = getattr(app, 'extensions', {}).get('db_pool')
+    if db_pool is not None:
+        db_pool.warmup(app)
+
+def child_exit(server, worker):
+    """종료된 워커의 게이지(연결 풀 상태 등)가 /metrics 합계에 계속 남지 않도록 제거"""
+    if os.getenv('METRICS_DIR'):
+        from app.utils.request_metrics import mark_process_dead
+        mark_process_dead(os.getenv('METRICS_DIR'), worker.pid)
+
+def on_exit(server):
+    """모든 워커 종료 후 수집기에 남은 로그를 기록하게 하고 종료"""
+    if _collector_process is not None and _collector_process.is_alive():
+        _collector_process.terminate()
+        _collector_process.join(10)
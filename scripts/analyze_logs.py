@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+날짜별 로그 파일(user_activity-*.log, app-*.log) 병렬 스트리밍 분석
+큰 파일은 바이트 범위로 나누어 여러 프로세스에서 집계 (gzip 파일은 파일 단위)
+- 이벤트 유형별/시간대별 건수, 상품(entity_id) 상위, 검색어 상위, 상태 코드 분포, 처리 시간 백분위수
+
+사용 예: python analyze_logs.py --log-dir ../logs --start-date 2025-03-10 --end-date 2025-03-17 --workers 8
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.utils.log_analysis import SOURCES, analyze_logs, summarize
+
+def print_summary(summary, elapsed):
+    total_lines = sum(summary['lines'].values())
+    print(f"분석 완료: {total_lines:,}줄 ({elapsed:.2f}초, {total_lines / max(elapsed, 1e-9):,.0f}줄/초)")
+    for source, lines in summary['lines'].items():
+        print(f"  - {source}: {lines:,}줄")
+    if summary['bad_lines']:
+        print(f"  - JSON 이 아닌 줄: {summary['bad_lines']:,}")
+
+    print("\n[이벤트 유형별 건수]")
+    for event_type, count in summary['events_by_type'].items():
+        print(f"  {event_type:<20} {count:>10,}")
+
+    print("\n[시간대별 이벤트 수]")
+    event_types = list(summary['events_by_type'])
+    if event_types:
+        print("  시간 " + "".join(f"{event_type[:12]:>14}" for event_type in event_types))
+        hours = sorted({hour for hours in summary['events_by_hour'].values() for hour in hours})
+        for hour in hours:
+            counts = (summary['events_by_hour'].get(event_type, {}).get(hour, 0) for event_type in event_types)
+            print(f"  {hour:>4} " + "".join(f"{count:>14,}" for count in counts))
+
+    print("\n[상품 상위 (entity_id)]")
+    for entity_id, count in summary['top_products']:
+        print(f"  {entity_id!s:<20} {count:>10,}")
+
+    print("\n[검색어 상위]")
+    for query, count in summary['top_search_queries']:
+        print(f"  {query:<20} {count:>10,}")
+
+    print("\n[상태 코드 분포]")
+    for source, statuses in summary['status_codes'].items():
+        total = sum(statuses.values())
+        if not total:
+            continue
+        print(f"  {source}:")
+        for status, count in statuses.items():
+            print(f"    {status}: {count:>10,} ({count / total * 100:5.1f}%)")
+
+    print("\n[처리 시간 백분위수 (ms)]")
+    for source, percentiles in summary['processing_time_ms'].items():
+        if not percentiles.get('count'):
+            continue
+        values = ", ".join(f"p{point}={value}" for point, value in percentiles.items() if point != 'count')
+        print(f"  {source} ({percentiles['count']:,}건): {values}")
+
+def main():
+    # 명령행 인자 파싱
+    parser = argparse.ArgumentParser(description='로그 파일 병렬 분석')
+    parser.add_argument('--log-dir', type=str, default='../logs', help='로그 파일 경로')
+    parser.add_argument('--start-date', type=str, default=None, help='시작 날짜 (YYYY-MM-DD)')
+    parser.add_argument('--end-date', type=str, default=None, help='종료 날짜 (YYYY-MM-DD)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='분석 프로세스 수 (기본값: CPU 수)')
+    parser.add_argument('--chunk-size', type=int, default=64, help='파일 분할 크기 (MB, 기본값: 64)')
+    parser.add_argument('--source', choices=SOURCES, action='append', help='분석할 로그 (기본값: 전체)')
+    parser.add_argument('--top', type=int, default=10, help='상위 항목 수 (기본값: 10)')
+    parser.add_argument('--max-keys', type=int, default=100000,
+                        help='상품/검색어별로 유지할 최대 고유 키 수 (초과 시 상위 항목은 근사값)')
+    parser.add_argument('--json', type=str, default=None, help='결과를 JSON 파일로 저장')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    result = analyze_logs(
+        args.log_dir,
+        start_date=args.start_date,
+        end_date=args.end_date,
+        workers=args.workers,
+        chunk_size=args.chunk_size * 1024 * 1024,
+        max_keys=args.max_keys,
+        sources=tuple(args.source or SOURCES)
+    )
+    summary = summarize(result, args.top)
+    elapsed = time.perf_counter() - started
+
+    print_summary(summary, elapsed)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        print(f"\n결과 저장: {args.json}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+애플리케이션 로그 포맷 비용 마이크로벤치마크
+레코드 한 건을 포맷하는 데 걸리는 시간(µs)을 포맷터별로 비교
+
+- legacy_template: 이전 app 로그 포맷터(마이크로초 formatTime) + % 템플릿 (escape 없음, 요청 정보 없음)
+- structured_uncached: StructuredJsonFormatter, 레코드마다 요청 컨텍스트를 새로 구성
+- structured_cached: StructuredJsonFormatter, 요청당 한 번 구성한 컨텍스트 재사용 (실제 동작)
+
+사용 예: python bench_log_formatter.py --records 100000
+"""
+import os
+import sys
+import uuid
+import time
+import logging
+import argparse
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from flask import Flask, g
+from app.utils.log_formatter import StructuredJsonFormatter, orjson
+
+# 명령행 인자 파싱
+parser = argparse.ArgumentParser(description='로그 포맷터 벤치마크')
+parser.add_argument('--records', type=int, default=50000, help='포맷터별 포맷할 레코드 수 (기본값: 50000)')
+args = parser.parse_args()
+
+class LegacyMicrosecondsFormatter(logging.Formatter):
+    """비교 기준 - 구조화 포맷터 이전에 app 로그에 쓰던 마이크로초 Formatter"""
+    
+    def formatTime(self, record, datefmt=None):
+        created = datetime.fromtimestamp(record.created)
+        if datefmt:
+            datefmt = datefmt.replace('%f', f'{created.microsecond:06d}')
+            return created.strftime(datefmt)
+        return created.strftime('%Y-%m-%d %H:%M:%S,%f')
+
+def make_record(with_data):
+    """after_request 가 남기는 것과 같은 형태의 레코드"""
+    record = logging.LogRecord('app', logging.INFO, __file__, 1, '요청 종료: GET /products/11 - 200 "quoted"', None, None)
+    if with_data:
+        record.data = {
+            "response": {"status_code": 200, "content_type": "text/html; charset=utf-8", "content_length": 10240},
+            "performance": {"processing_time_ms": 12.5}
+        }
+    return record
+
+def bench(formatter, clear_cache=False):
+    records = [make_record(with_data=True) for _ in range(args.records)]
+    start = time.perf_counter()
+    for record in records:
+        if clear_cache:
+            g.pop('_log_context', None)
+        formatter.format(record)
+    return (time.perf_counter() - start) / args.records * 1e6
+
+app = Flask('bench')
+legacy = LegacyMicrosecondsFormatter(
+    '{"timestamp":"%(asctime)s", "level":"%(levelname)s", "message":"%(message)s", "module":"%(module)s"}',
+    '%Y-%m-%dT%H:%M:%S.%f'
+)
+structured = StructuredJsonFormatter()
+
+print(f"레코드 {args.records}개, JSON 인코더: {'orjson' if orjson else 'json'}")
+
+with app.test_request_context('/products/11?sort=newest', headers={'User-Agent': 'bench', 'Referer': 'http://localhost/'}):
+    g.request_id = str(uuid.uuid4())
+    g.request_start_time = datetime.now()
+    
+    results = {
+        'legacy_template': bench(legacy),
+        'structured_uncached': bench(structured, clear_cache=True),
+        'structured_cached': bench(structured),
+    }
+
+for name, micros in results.items():
+    print(f"  - {name:20s}: {micros:6.2f} µs/record")
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+날짜별 로그 핸들러 마이크로벤치마크
+DailyFileHandler(기본 모드)와 BufferedDailyFileHandler(buffered 모드)의 초당 처리 레코드 수 비교
+
+사용 예: python bench_log_handler.py --records 200000 --threads 4
+"""
+import os
+import sys
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.utils.daily_logger import DailyFileHandler, BufferedDailyFileHandler
+
+# 명령행 인자 파싱
+parser = argparse.ArgumentParser(description='날짜별 로그 핸들러 벤치마크')
+parser.add_argument('--records', type=int, default=100000, help='핸들러별 기록할 레코드 수 (기본값: 100000)')
+parser.add_argument('--threads', type=int, default=4, help='동시에 로깅하는 스레드 수 (기본값: 4)')
+parser.add_argument('--buffer-size', type=int, default=64 * 1024, help='buffered 모드 버퍼 크기 (바이트)')
+parser.add_argument('--repeat', type=int, default=3, help='반복 측정 횟수 (가장 좋은 결과 사용)')
+args = parser.parse_args()
+
+# 실제 사용자 활동 로그와 비슷한 길이의 메시지
+SAMPLE_MESSAGE = (
+    '{"timestamp": "2025-03-10T12:00:00.000000", "session_id": "4512dddf78e5682f4e94ca7700e0aefa", '
+    '"event_type": "view", "user_id": 6, "entity_type": "product", "entity_id": 11, '
+    '"endpoint": "products.detail", "method": "GET", "path": "/products/11", "response_status": 200}'
+)
+
+def make_handler(kind, log_dir):
+    base_name = os.path.join(log_dir, 'bench')
+    if kind == 'buffered':
+        return BufferedDailyFileHandler(base_name, buffer_size=args.buffer_size)
+    return DailyFileHandler(base_name)
+
+def run_once(kind):
+    """핸들러 하나로 records 개의 레코드를 threads 개 스레드에서 기록하고 초당 레코드 수 반환"""
+    log_dir = tempfile.mkdtemp(prefix='bench_log_')
+    handler = make_handler(kind, log_dir)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    
+    logger = logging.getLogger(f'bench.{kind}')
+    logger.handlers = [handler]
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    
+    per_thread = args.records // args.threads
+    
+    def worker():
+        for _ in range(per_thread):
+            logger.info(SAMPLE_MESSAGE)
+    
+    threads = [threading.Thread(target=worker) for _ in range(args.threads)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    handler.close()
+    elapsed = time.perf_counter() - start
+    
+    # 모든 레코드가 온전한 줄로 기록되었는지 확인
+    written = 0
+    for name in os.listdir(log_dir):
+        with open(os.path.join(log_dir, name), encoding='utf-8') as f:
+            for line in f:
+                if line.rstrip('\n') != SAMPLE_MESSAGE:
+                    raise RuntimeError(f'{kind}: 손상된 로그 줄 발견')
+                written += 1
+    shutil.rmtree(log_dir)
+    
+    if written != per_thread * args.threads:
+        raise RuntimeError(f'{kind}: 기록된 줄 수 불일치 ({written} != {per_thread * args.threads})')
+    
+    return written / elapsed
+
+print(f"레코드 {args.records}개, 스레드 {args.threads}개, 반복 {args.repeat}회")
+
+results = {}
+for kind in ('default', 'buffered'):
+    results[kind] = max(run_once(kind) for _ in range(args.repeat))
+    print(f"  - {kind:8s}: {results[kind]:,.0f} records/s")
+
+print(f"\nbuffered / default = {results['buffered'] / results['default']:.2f}x")
@@ -1,71 +1,35 @@
 #!/usr/bin/env python3
+"""
+가상 로그 생성기
+날짜(또는 하루를 나눈 조각) 단위로 작업을 나누어 여러 프로세스(--workers)에서 생성하고,
+--seed 를 지정하면 작업마다 같은 시드를 사용하므로 실행할 때마다(프로세스 수와 관계없이) 같은 로그가 생성됨
+로그는 생성하는 즉시 버퍼 출력 스트림으로 기록하므로 메모리 사용량은 로그 수와 무관 (--compress, --split hourly 지원)
+
+사용 예: python generate_log.py --count 10000000 --workers 8 --seed 42
+"""
+import io
 import json
+import gzip
 import random
-import string
 import os
-import uuid
+import shutil
 from datetime import datetime, timedelta
 import argparse
 import ipaddress
+from concurrent.futures import ProcessPoolExecutor
 
-# 명령행 인자 파싱
-parser = argparse.ArgumentParser(description='가상 로그 생성기')
-parser.add_argument('--count', type=int, default=100000, help='생성할 로그 수 (기본값: 100000)')
-parser.add_argument('--output-dir', type=str, default='../logs', help='로그 파일 저장 경로')
-parser.add_argument('--start-date', type=str, default='2025-03-10', help='시작 날짜 (YYYY-MM-DD)')
-parser.add_argument('--end-date', type=str, default='2025-03-17', help='종료 날짜 (YYYY-MM-DD)')
-args = parser.parse_args()
-
-# 기본 설정
-log_count = args.count
-output_dir = args.output_dir
-start_date = datetime.strptime(args.start_date, '%Y-%m-%d')
-end_date = datetime.strptime(args.end_date, '%Y-%m-%d')
-
-# 경로 생성
-if not os.path.exists(output_dir):
-    os.makedirs(output_dir)
-
-# 제품 데이터 샘플
-products = []
-for i in range(1, 101):
-    category = random.choice([1, 2, 3, 4, 5])
-    products.append({
-        'id': i,
-        'name': f'Product {i}',
-        'category': category,
-        'price': round(random.uniform(10.0, 1000.0), 2)
-    })
-
-# 사용자 데이터 샘플
-users = []
-for i in range(1, 101):
-    users.append({
-        'id': i,
-        'email': f'user{i}@example.com',
-        'name': f'User {i}'
-    })
-
-# IP 주소 생성 함수
-def generate_ip():
-    # 국내 IP 대역 중 일부 사용
-    networks = [
-        '211.234.0.0/16',  # SKT
-        '1.224.0.0/16',    # KT
-        '39.7.0.0/16',     # LG U+
-        '121.190.0.0/16',  # Local ISPs
-        '125.188.0.0/16'   # Home networks
-    ]
-    
-    network = random.choice(networks)
-    net = ipaddress.IPv4Network(network)
-    # 네트워크 내 랜덤 IP 생성
-    random_ip = net.network_address + random.randint(0, min(65535, net.num_addresses - 1))
-    return str(random_ip)
-
-# 세션 ID 생성 함수
-def generate_session_id():
-    return uuid.uuid4().hex[:32]
+# IP 주소 대역 - 국내 IP 대역 중 일부 사용 (시작 주소, 선택 범위)를 미리 계산
+IP_NETWORKS = [
+    '211.234.0.0/16',  # SKT
+    '1.224.0.0/16',    # KT
+    '39.7.0.0/16',     # LG U+
+    '121.190.0.0/16',  # Local ISPs
+    '125.188.0.0/16'   # Home networks
+]
+IP_RANGES = [
+    (int(net.network_address), min(65535, net.num_addresses - 1))
+    for net in map(ipaddress.IPv4Network, IP_NETWORKS)
+]
 
 # 사용자 에이전트 샘플
 user_agents = [
@@ -98,13 +62,9 @@ paths = [
     "/orders"
 ]
 
-# 특정 제품 경로
-def product_path(product_id):
-    return f"/products/{product_id}"
-
 # 검색어 샘플
 search_queries = [
-    "스마트폰", "노트북", "헤드폰", "카메라", "TV", "태블릿", "게임기", "스피커", 
+    "스마트폰", "노트북", "헤드폰", "카메라", "TV", "태블릿", "게임기", "스피커",
     "키보드", "마우스", "모니터", "프린터", "이어폰", "충전기", "케이블", "스마트워치",
     "블루투스", "무선", "삼성", "애플", "LG", "소니", "게이밍", "방수", "초고속", "초경량"
 ]
@@ -122,59 +82,409 @@ endpoint_mapping = {
     "/search": "main.search"
 }
 
-# 카테고리별 제품 그룹화
-products_by_category = {}
-for product in products:
-    cat_id = product['category']
-    if cat_id not in products_by_category:
-        products_by_category[cat_id] = []
-    products_by_category[cat_id].append(product)
-
-# 날짜별 로그 생성
-active_sessions = {}  # 현재 활성 세션 추적
-system_logs = []
-user_activity_logs = []
-
-# 날짜 범위 계산
-date_range = (end_date - start_date).days + 1
-logs_per_day = log_count // date_range
-
-print(f"생성 시작: {log_count}개 로그를 {date_range}일에 걸쳐 생성 ({logs_per_day}개/일)")
-
-for day_offset in range(date_range):
-    current_date = start_date + timedelta(days=day_offset)
-    date_str = current_date.strftime('%Y-%m-%d')
-    
-    print(f"날짜 {date_str} 로그 생성 중...")
-    
-    # 이 날짜의 시스템 로그
-    system_log_file = f"{output_dir}/app-{date_str}.log"
-    user_log_file = f"{output_dir}/user_activity-{date_str}.log"
-    
-    # 세션 관리 - 이전 날짜의 세션 일부는 유지, 일부는 제거, 새 세션 추가
-    old_sessions = list(active_sessions.keys())
-    
-    # 75%의 이전 세션 제거
-    for old_session in random.sample(old_sessions, int(len(old_sessions) * 0.75)):
-        del active_sessions[old_session]
-    
-    # 새 세션 100개 추가
-    for _ in range(100):
-        session_id = generate_session_id()
-        user = random.choice([None] + [u['id'] for u in users])  # 로그인 유무
-        ip = generate_ip()
-        ua = random.choice(user_agents)
-        active_sessions[session_id] = {
-            'user_id': user,
-            'ip': ip,
-            'user_agent': ua,
-            'last_path': None
-        }
-    
-    daily_logs_count = 0
-    daily_system_logs = []
-    daily_user_logs = []
-    
+# 이벤트 유형 선택 가중치 (누적 가중치를 미리 계산)
+event_weights = {
+    "page_view": 0.3,
+    "view": 0.25,
+    "search": 0.15,
+    "login_attempt": 0.05,
+    "login_success": 0.05,
+    "login_failed": 0.02,
+    "cart_add": 0.08,
+    "server_dwell_time": 0.1
+}
+EVENT_TYPES = list(event_weights)
+EVENT_CUM_WEIGHTS = []
+for weight in event_weights.values():
+    EVENT_CUM_WEIGHTS.append((EVENT_CUM_WEIGHTS[-1] if EVENT_CUM_WEIGHTS else 0) + weight)
+
+# 로그 한 줄 직렬화 (json.dumps(..., ensure_ascii=False) 와 같은 결과, 호출마다 인코더를 만들지 않음)
+encode_json = json.JSONEncoder(ensure_ascii=False).encode
+
+LOG_LEVELS = ["INFO", "WARNING", "ERROR", "DEBUG"]
+LOG_LEVEL_CUM_WEIGHTS = [0.7, 0.85, 0.95, 1.0]
+
+# IP 주소 생성 함수
+def generate_ip(rng):
+    base, span = rng.choice(IP_RANGES)
+    # 네트워크 내 랜덤 IP 생성
+    ip = base + rng.randint(0, span)
+    return f"{ip >> 24 & 255}.{ip >> 16 & 255}.{ip >> 8 & 255}.{ip & 255}"
+
+# 세션 ID 생성 함수 (시드를 따르도록 uuid4 대신 rng 사용)
+def generate_session_id(rng):
+    return '%032x' % rng.getrandbits(128)
+
+# 특정 제품 경로
+def product_path(product_id):
+    return f"/products/{product_id}"
+
+def build_catalog(rng):
+    """제품/사용자 데이터 샘플"""
+    products = []
+    for i in range(1, 101):
+        category = rng.choice([1, 2, 3, 4, 5])
+        products.append({
+            'id': i,
+            'name': f'Product {i}',
+            'category': category,
+            'price': round(rng.uniform(10.0, 1000.0), 2)
+        })
+
+    users = []
+    for i in range(1, 101):
+        users.append({
+            'id': i,
+            'email': f'user{i}@example.com',
+            'name': f'User {i}'
+        })
+    return products, users
+
+def build_daily_sessions(rng, days, users):
+    """
+    날짜별 활성 세션 목록 - 이전 날짜의 세션 일부는 유지, 일부는 제거, 새 세션 추가
+    작업을 병렬로 생성할 수 있도록 부모 프로세스에서 미리 계산
+    :return: [[(session_id, user_id, ip, user_agent), ...], ...] (날짜순)
+    """
+    user_choices = [None] + [u['id'] for u in users]  # 로그인 유무
+    active_sessions = []
+    daily_sessions = []
+    for _ in range(days):
+        # 75%의 이전 세션 제거
+        removed = set(rng.sample(range(len(active_sessions)), int(len(active_sessions) * 0.75)))
+        active_sessions = [session for i, session in enumerate(active_sessions) if i not in removed]
+
+        # 새 세션 100개 추가
+        for _ in range(100):
+            active_sessions.append((
+                generate_session_id(rng),
+                rng.choice(user_choices),
+                generate_ip(rng),
+                rng.choice(user_agents)
+            ))
+        daily_sessions.append(list(active_sessions))
+    return daily_sessions
+
+def generate_system_log(rng, timestamp):
+    log_level = rng.choices(LOG_LEVELS, cum_weights=LOG_LEVEL_CUM_WEIGHTS, k=1)[0]
+
+    # 로그 레벨별 메시지 선택
+    if log_level == "INFO":
+        messages = [
+            "요청 처리 완료",
+            f"요청 종료: GET {rng.choice(paths)} - {rng.choice([200, 302, 304])}",
+            "데이터베이스 연결 성공",
+            "캐시 새로고침 완료",
+            f"사용자 {rng.randint(1, 100)} 세션 생성",
+            "정적 자산 로드 완료"
+        ]
+        module = rng.choice(["__init__", "routes", "models", "views", "utils"])
+    elif log_level == "WARNING":
+        messages = [
+            "데이터베이스 응답 지연",
+            "캐시 적중률 감소",
+            "세션 수 임계값 접근",
+            "API 응답 시간 지연",
+            "디스크 공간 부족 경고",
+            "메모리 사용량 증가"
+        ]
+        module = rng.choice(["database", "cache", "session", "api", "system"])
+    elif log_level == "ERROR":
+        messages = [
+            "데이터베이스 연결 실패",
+            f"예상치 못한 예외 발생: {rng.choice(['TypeError', 'ValueError', 'KeyError', 'IndexError'])}",
+            f"API 요청 실패: 상태 코드 {rng.choice([400, 403, 404, 500, 503])}",
+            "파일 업로드 처리 중 오류",
+            "결제 프로세스 실패",
+            "템플릿 렌더링 오류"
+        ]
+        module = rng.choice(["database", "api", "uploads", "payment", "templates"])
+    else:  # DEBUG
+        messages = [
+            "SQL 쿼리 실행: SELECT * FROM products LIMIT 10",
+            "캐시 키 생성: product_1234",
+            "세션 데이터 업데이트",
+            "폼 검증 시작",
+            "미들웨어 처리 중",
+            "환경 변수 로드 완료"
+        ]
+        module = rng.choice(["database", "cache", "session", "forms", "middleware", "config"])
+
+    return {
+        "timestamp": timestamp,
+        "level": log_level,
+        "message": rng.choice(messages),
+        "module": module
+    }
+
+def generate_user_log(rng, timestamp, session_ids, active_sessions, products):
+    # 세션 선택 (또는 세션이 없는 요청)
+    if rng.random() < 0.05:  # 5%는 세션 없는 요청
+        session_id = "no_session"
+        user_id = None
+        ip = generate_ip(rng)
+        user_agent = rng.choice(user_agents)
+    else:
+        session_id = rng.choice(session_ids)
+        session_info = active_sessions[session_id]
+        user_id = session_info['user_id']
+        ip = session_info['ip']
+        user_agent = session_info['user_agent']
+
+    # 이벤트 유형 선택
+    event_type = rng.choices(EVENT_TYPES, cum_weights=EVENT_CUM_WEIGHTS, k=1)[0]
+
+    # 기본 로그 필드
+    log_data = {
+        "timestamp": timestamp,
+        "session_id": session_id,
+        "event_type": event_type,
+        "user_id": user_id,
+        "ip_address": ip,
+        "user_agent": user_agent
+    }
+
+    # 이벤트별 특수 필드 추가
+    if event_type == "page_view":
+        path = rng.choice(paths)
+        log_data.update({
+            "entity_type": None,
+            "entity_id": None,
+            "endpoint": endpoint_mapping.get(path.split('?')[0], None),
+            "method": "GET",
+            "path": path,
+            "args": {},
+            "form": {},
+            "referrer": None,
+            "response_status": rng.choice([200, 302, 304]),
+            "process_time": round(rng.uniform(0.001, 0.5), 6)
+        })
+
+        # 카테고리 페이지인 경우
+        if "category=" in path:
+            cat_id = int(path.split("category=")[1])
+            log_data["entity_type"] = "category"
+            log_data["entity_id"] = cat_id
+
+        # 쿼리 파라미터 파싱
+        if "?" in path:
+            query_part = path.split("?")[1]
+            args = {}
+            for param in query_part.split("&"):
+                if "=" in param:
+                    key, value = param.split("=")
+                    args[key] = value
+            log_data["args"] = args
+
+        # 세션 업데이트
+        if session_id in active_sessions:
+            active_sessions[session_id]['last_path'] = path
+
+    elif event_type == "view":
+        product = rng.choice(products)
+        path = product_path(product['id'])
+        log_data.update({
+            "entity_type": "product",
+            "entity_id": product['id'],
+            "endpoint": "products.detail",
+            "method": "GET",
+            "path": path,
+            "args": {},
+            "form": {},
+            "referrer": active_sessions.get(session_id, {}).get('last_path'),
+            "response_status": 200,
+            "process_time": round(rng.uniform(0.01, 0.2), 6)
+        })
+
+        # 세션 업데이트
+        if session_id in active_sessions:
+            active_sessions[session_id]['last_path'] = path
+
+    elif event_type == "search":
+        query = rng.choice(search_queries)
+        path = f"/search?q={query}"
+        results_count = rng.randint(0, 20)
+
+        log_data.update({
+            "entity_type": None,
+            "entity_id": None,
+            "endpoint": "main.search",
+            "method": "GET",
+            "path": path,
+            "args": {"q": query},
+            "form": {},
+            "referrer": active_sessions.get(session_id, {}).get('last_path'),
+            "search_query": query,
+            "results_count": results_count,
+            "response_status": 200,
+            "process_time": round(rng.uniform(0.05, 0.5), 6)
+        })
+
+        # 세션 업데이트
+        if session_id in active_sessions:
+            active_sessions[session_id]['last_path'] = path
+
+    elif event_type == "login_attempt":
+        username = rng.choice([f"user{rng.randint(1, 100)}@example.com", "admin@example.com"])
+        log_data.update({
+            "user_id": None,
+            "endpoint": "auth.login",
+            "method": "POST",
+            "path": "/auth/login",
+            "form": {"email": username, "password": "******"},
+            "username_attempt": username,
+            "response_status": 200
+        })
+
+    elif event_type == "login_failed":
+        username = rng.choice([f"user{rng.randint(1, 100)}@example.com", "admin@example.com"])
+        reason = rng.choice(["invalid_credentials", "account_locked", "inactive_account"])
+        log_data.update({
+            "username_attempt": username,
+            "reason": reason
+        })
+
+    elif event_type == "login_success":
+        # 로그인 성공 시 사용자 ID 설정
+        user_id = rng.randint(1, 100)
+        log_data.update({
+            "user_id": user_id,
+            "endpoint": "auth.login",
+            "method": "POST",
+            "path": "/auth/login",
+            "response_status": 200
+        })
+
+        # 세션 업데이트
+        if session_id in active_sessions:
+            active_sessions[session_id]['user_id'] = user_id
+            active_sessions[session_id]['last_path'] = "/auth/login"
+
+    elif event_type == "cart_add":
+        product = rng.choice(products)
+        quantity = rng.randint(1, 5)
+
+        log_data.update({
+            "entity_type": "product",
+            "entity_id": product['id'],
+            "endpoint": "cart.add",
+            "method": "POST",
+            "path": "/cart/add",
+            "form": {"product_id": str(product['id']), "quantity": str(quantity)},
+            "referrer": product_path(product['id']),
+            "response_status": 302,
+            "process_time": round(rng.uniform(0.01, 0.1), 6)
+        })
+
+    elif event_type == "server_dwell_time":
+        current_path = rng.choice(paths)
+        previous_path = active_sessions.get(session_id, {}).get('last_path', "/")
+        dwell_time = round(rng.uniform(1, 600), 6)  # 1초~10분
+
+        product_id = None
+        if "/products/" in current_path and len(current_path.split("/")) > 2:
+            try:
+                product_id = int(current_path.split("/")[2])
+            except:
+                pass
+
+        log_data.update({
+            "product_id": product_id,
+            "previous_path": previous_path,
+            "current_path": current_path,
+            "dwell_time_seconds": dwell_time,
+            "max_scroll_percentage": rng.randint(0, 100)
+        })
+
+    return log_data
+
+def output_name(base_name, date_str, hour=None, compress=False):
+    """출력 파일 이름 - 일별: app-YYYY-MM-DD.log, 시간별: app-YYYY-MM-DD_HH.log (압축 시 .gz)"""
+    suffix = f"_{hour}" if hour is not None else ''
+    return f"{base_name}-{date_str}{suffix}.log" + ('.gz' if compress else '')
+
+def part_path(output_dir, file_name, chunk_index):
+    return os.path.join(output_dir, f"{file_name}.part{chunk_index:04d}")
+
+def open_output(path, compress, buffer_size=1024 * 1024):
+    """
+    큰 버퍼를 둔 텍스트 출력 스트림 - 줄 단위 write 가 곧바로 디스크/압축기로 가지 않음
+    gzip 조각 파일은 각각 완전한 gzip member 이므로 바이트 단위로 이어 붙여도 올바른 gzip 파일이 됨
+    """
+    if compress:
+        # 기본 압축 레벨(9)은 생성 속도보다 느리므로 6 사용
+        raw = gzip.GzipFile(path, 'wb', compresslevel=6)
+        return io.TextIOWrapper(io.BufferedWriter(raw, buffer_size), encoding='utf-8')
+    return open(path, 'w', encoding='utf-8', buffering=buffer_size)
+
+def generate_chunk(task):
+    """
+    하루치 로그의 한 조각을 생성하여 조각 파일(.partNNNN)에 스트리밍으로 저장 (프로세스 풀 작업 단위)
+    생성한 줄은 바로 버퍼 출력 스트림에 쓰고 요약 통계도 생성 시점에 갱신하므로 메모리 사용량이 로그 수와 무관
+    :param task: (date_str, chunk_index, event_count, sessions, products, seed, output_dir, split, compress)
+    :return: (date_str, chunk_index, 조각 통계, 생성한 파일 이름 목록)
+    """
+    date_str, chunk_index, event_count, sessions, products, seed, output_dir, split, compress = task
+    # 작업마다 독립된 시드 - 같은 시드/날짜/조각이면 항상 같은 결과
+    rng = random.Random(f"{seed}:{date_str}:{chunk_index}")
+
+    # 세션 선택용 ID 목록은 미리 만들어 두고, 세션 상태는 조각 안에서만 갱신
+    session_ids = [session[0] for session in sessions]
+    active_sessions = {
+        session_id: {'user_id': user_id, 'ip': ip, 'user_agent': ua, 'last_path': None}
+        for session_id, user_id, ip, ua in sessions
+    }
+
+    stats = {'system': 0, 'user': 0, 'page_view': 0, 'search': 0, 'login': 0}
+    summary_keys = {'page_view': 'page_view', 'search': 'search', 'login_success': 'login'}
+
+    # (로그 이름, 시간) -> 출력 스트림 (시간별 분할이 아니면 시간은 None)
+    writers = {}
+
+    def write(base_name, hour, line):
+        key = (base_name, hour if split == 'hourly' else None)
+        writer = writers.get(key)
+        if writer is None:
+            file_name = output_name(base_name, date_str, key[1], compress)
+            writer = writers[key] = open_output(part_path(output_dir, file_name, chunk_index), compress)
+        writer.write(line)
+        writer.write('\n')
+
+    try:
+        for _ in range(event_count):
+            # 로그 시간 - 0시부터 23시 59분까지 (strftime 대신 직접 포맷, 밀리초까지)
+            seconds = rng.randint(0, 86399)
+            milliseconds = rng.randint(0, 999999) // 1000
+            hour = f"{seconds // 3600:02d}"
+            timestamp = f"{date_str}T{hour}:{seconds // 60 % 60:02d}:{seconds % 60:02d}.{milliseconds:03d}"
+
+            # 30% 시스템 로그, 70% 사용자 활동 로그
+            if rng.random() < 0.3:
+                system_log = generate_system_log(rng, timestamp)
+                write('app', hour, encode_json(system_log))
+                stats['system'] += 1
+            else:
+                log_data = generate_user_log(rng, timestamp, session_ids, active_sessions, products)
+                write('user_activity', hour, encode_json(log_data))
+                stats['user'] += 1
+                summary_key = summary_keys.get(log_data['event_type'])
+                if summary_key:
+                    stats[summary_key] += 1
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    file_names = [output_name(base_name, date_str, hour, compress) for base_name, hour in writers]
+    return date_str, chunk_index, stats, file_names
+
+def _encode_line(line, compress):
+    data = (line + '\n').encode('utf-8')
+    return gzip.compress(data, compresslevel=6) if compress else data
+
+def assemble_day(output_dir, date_str, chunk_count, stats, file_names, split, compress):
+    """조각 파일을 순서대로 이어 붙여 날짜별(또는 시간별) 파일 생성 (시스템 시작/종료 로그 포함)"""
+    current_date = datetime.strptime(date_str, '%Y-%m-%d')
+
     # 시스템 시작 로그
     start_time = current_date.replace(hour=0, minute=0, second=0, microsecond=0)
     system_start_log = {
@@ -183,297 +493,116 @@ for day_offset in range(date_range):
         "message": "웹 서비스 시작 - 날짜별 로깅 설정 완료",
         "module": "daily_logger"
     }
-    daily_system_logs.append(json.dumps(system_start_log, ensure_ascii=False))
-    
-    # 이 날짜의 로그 생성
-    while daily_logs_count < logs_per_day:
-        # 로그 시간 - 0시부터 23시 59분까지
-        log_time = current_date + timedelta(
-            seconds=random.randint(0, 86399),
-            microseconds=random.randint(0, 999999)
-        )
-        timestamp = log_time.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
-        
-        # 50% 확률로 시스템 로그 또는 사용자 활동 로그 생성
-        if random.random() < 0.3:  # 30% 시스템 로그
-            log_level = random.choices(
-                ["INFO", "WARNING", "ERROR", "DEBUG"],
-                weights=[0.7, 0.15, 0.1, 0.05],
-                k=1
-            )[0]
-            
-            # 로그 레벨별 메시지 선택
-            if log_level == "INFO":
-                messages = [
-                    "요청 처리 완료",
-                    f"요청 종료: GET {random.choice(paths)} - {random.choice([200, 302, 304])}",
-                    "데이터베이스 연결 성공",
-                    "캐시 새로고침 완료",
-                    f"사용자 {random.randint(1, 100)} 세션 생성",
-                    "정적 자산 로드 완료"
-                ]
-                module = random.choice(["__init__", "routes", "models", "views", "utils"])
-            elif log_level == "WARNING":
-                messages = [
-                    "데이터베이스 응답 지연",
-                    "캐시 적중률 감소",
-                    "세션 수 임계값 접근",
-                    "API 응답 시간 지연",
-                    "디스크 공간 부족 경고",
-                    "메모리 사용량 증가"
-                ]
-                module = random.choice(["database", "cache", "session", "api", "system"])
-            elif log_level == "ERROR":
-                messages = [
-                    "데이터베이스 연결 실패",
-                    f"예상치 못한 예외 발생: {random.choice(['TypeError', 'ValueError', 'KeyError', 'IndexError'])}",
-                    f"API 요청 실패: 상태 코드 {random.choice([400, 403, 404, 500, 503])}",
-                    "파일 업로드 처리 중 오류",
-                    "결제 프로세스 실패",
-                    "템플릿 렌더링 오류"
-                ]
-                module = random.choice(["database", "api", "uploads", "payment", "templates"])
-            else:  # DEBUG
-                messages = [
-                    "SQL 쿼리 실행: SELECT * FROM products LIMIT 10",
-                    "캐시 키 생성: product_1234",
-                    "세션 데이터 업데이트",
-                    "폼 검증 시작",
-                    "미들웨어 처리 중",
-                    "환경 변수 로드 완료"
-                ]
-                module = random.choice(["database", "cache", "session", "forms", "middleware", "config"])
-            
-            system_log = {
-                "timestamp": timestamp,
-                "level": log_level,
-                "message": random.choice(messages),
-                "module": module
-            }
-            daily_system_logs.append(json.dumps(system_log, ensure_ascii=False))
-        
-        else:  # 70% 사용자 활동 로그
-            # 세션 선택 (또는 세션이 없는 요청)
-            if random.random() < 0.05:  # 5%는 세션 없는 요청
-                session_id = "no_session"
-                user_id = None
-                ip = generate_ip()
-                user_agent = random.choice(user_agents)
-            else:
-                session_id = random.choice(list(active_sessions.keys()))
-                session_info = active_sessions[session_id]
-                user_id = session_info['user_id']
-                ip = session_info['ip']
-                user_agent = session_info['user_agent']
-                last_path = session_info['last_path']
-            
-            # 이벤트 유형 선택
-            event_weights = {
-                "page_view": 0.3,
-                "view": 0.25,
-                "search": 0.15,
-                "login_attempt": 0.05,
-                "login_success": 0.05,
-                "login_failed": 0.02,
-                "cart_add": 0.08,
-                "server_dwell_time": 0.1
-            }
-            
-            event_type = random.choices(
-                list(event_weights.keys()),
-                weights=list(event_weights.values()),
-                k=1
-            )[0]
-            
-            # 기본 로그 필드
-            log_data = {
-                "timestamp": timestamp,
-                "session_id": session_id,
-                "event_type": event_type,
-                "user_id": user_id,
-                "ip_address": ip,
-                "user_agent": user_agent
-            }
-            
-            # 이벤트별 특수 필드 추가
-            if event_type == "page_view":
-                path = random.choice(paths)
-                log_data.update({
-                    "entity_type": None,
-                    "entity_id": None,
-                    "endpoint": endpoint_mapping.get(path.split('?')[0], None),
-                    "method": "GET",
-                    "path": path,
-                    "args": {},
-                    "form": {},
-                    "referrer": None,
-                    "response_status": random.choice([200, 302, 304]),
-                    "process_time": round(random.uniform(0.001, 0.5), 6)
-                })
-                
-                # 카테고리 페이지인 경우
-                if "category=" in path:
-                    cat_id = int(path.split("category=")[1])
-                    log_data["entity_type"] = "category"
-                    log_data["entity_id"] = cat_id
-                    
-                # 쿼리 파라미터 파싱
-                if "?" in path:
-                    query_part = path.split("?")[1]
-                    args = {}
-                    for param in query_part.split("&"):
-                        if "=" in param:
-                            key, value = param.split("=")
-                            args[key] = value
-                    log_data["args"] = args
-                
-                # 세션 업데이트
-                if session_id in active_sessions:
-                    active_sessions[session_id]['last_path'] = path
-            
-            elif event_type == "view":
-                product = random.choice(products)
-                path = product_path(product['id'])
-                log_data.update({
-                    "entity_type": "product",
-                    "entity_id": product['id'],
-                    "endpoint": "products.detail",
-                    "method": "GET",
-                    "path": path,
-                    "args": {},
-                    "form": {},
-                    "referrer": active_sessions.get(session_id, {}).get('last_path'),
-                    "response_status": 200,
-                    "process_time": round(random.uniform(0.01, 0.2), 6)
-                })
-                
-                # 세션 업데이트
-                if session_id in active_sessions:
-                    active_sessions[session_id]['last_path'] = path
-            
-            elif event_type == "search":
-                query = random.choice(search_queries)
-                path = f"/search?q={query}"
-                results_count = random.randint(0, 20)
-                
-                log_data.update({
-                    "entity_type": None,
-                    "entity_id": None,
-                    "endpoint": "main.search",
-                    "method": "GET",
-                    "path": path,
-                    "args": {"q": query},
-                    "form": {},
-                    "referrer": active_sessions.get(session_id, {}).get('last_path'),
-                    "search_query": query,
-                    "results_count": results_count,
-                    "response_status": 200,
-                    "process_time": round(random.uniform(0.05, 0.5), 6)
-                })
-                
-                # 세션 업데이트
-                if session_id in active_sessions:
-                    active_sessions[session_id]['last_path'] = path
-            
-            elif event_type == "login_attempt":
-                username = random.choice([f"user{random.randint(1, 100)}@example.com", "admin@example.com"])
-                log_data.update({
-                    "user_id": None,
-                    "endpoint": "auth.login",
-                    "method": "POST",
-                    "path": "/auth/login",
-                    "form": {"email": username, "password": "******"},
-                    "username_attempt": username,
-                    "response_status": 200
-                })
-            
-            elif event_type == "login_failed":
-                username = random.choice([f"user{random.randint(1, 100)}@example.com", "admin@example.com"])
-                reason = random.choice(["invalid_credentials", "account_locked", "inactive_account"])
-                log_data.update({
-                    "username_attempt": username,
-                    "reason": reason
-                })
-            
-            elif event_type == "login_success":
-                # 로그인 성공 시 사용자 ID 설정
-                user_id = random.randint(1, 100)
-                log_data.update({
-                    "user_id": user_id,
-                    "endpoint": "auth.login",
-                    "method": "POST",
-                    "path": "/auth/login",
-                    "response_status": 200
-                })
-                
-                # 세션 업데이트
-                if session_id in active_sessions:
-                    active_sessions[session_id]['user_id'] = user_id
-                    active_sessions[session_id]['last_path'] = "/auth/login"
-            
-            elif event_type == "cart_add":
-                product = random.choice(products)
-                quantity = random.randint(1, 5)
-                
-                log_data.update({
-                    "entity_type": "product",
-                    "entity_id": product['id'],
-                    "endpoint": "cart.add",
-                    "method": "POST",
-                    "path": "/cart/add",
-                    "form": {"product_id": str(product['id']), "quantity": str(quantity)},
-                    "referrer": product_path(product['id']),
-                    "response_status": 302,
-                    "process_time": round(random.uniform(0.01, 0.1), 6)
-                })
-            
-            elif event_type == "server_dwell_time":
-                current_path = random.choice(paths)
-                previous_path = active_sessions.get(session_id, {}).get('last_path', "/")
-                dwell_time = round(random.uniform(1, 600), 6)  # 1초~10분
-                
-                product_id = None
-                if "/products/" in current_path and len(current_path.split("/")) > 2:
-                    try:
-                        product_id = int(current_path.split("/")[2])
-                    except:
-                        pass
-                
-                log_data.update({
-                    "product_id": product_id,
-                    "previous_path": previous_path,
-                    "current_path": current_path,
-                    "dwell_time_seconds": dwell_time,
-                    "max_scroll_percentage": random.randint(0, 100)
-                })
-            
-            daily_user_logs.append(json.dumps(log_data, ensure_ascii=False))
-        
-        daily_logs_count += 1
-    
+
     # 시스템 종료 로그
     end_time = current_date.replace(hour=23, minute=59, second=59, microsecond=999999)
-    page_view_count = sum(1 for l in daily_user_logs if '"event_type": "page_view"' in l)
-    search_count = sum(1 for l in daily_user_logs if '"event_type": "search"' in l)
-    login_count = sum(1 for l in daily_user_logs if '"event_type": "login_success"' in l)
-
     system_end_log = {
         "timestamp": end_time.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3],
         "level": "INFO",
-        "message": f"웹 서비스 일일 활동 요약: 페이지뷰 {page_view_count}, 검색 {search_count}, 로그인 {login_count}",
+        "message": f"웹 서비스 일일 활동 요약: 페이지뷰 {stats['page_view']}, 검색 {stats['search']}, 로그인 {stats['login']}",
         "module": "stats"
     }
-    daily_system_logs.append(json.dumps(system_end_log, ensure_ascii=False))
-    
-    # 파일에 저장
-    with open(system_log_file, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(daily_system_logs))
-    
-    with open(user_log_file, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(daily_user_logs))
-    
-    print(f"  - 시스템 로그: {len(daily_system_logs)}개")
-    print(f"  - 사용자 활동 로그: {len(daily_user_logs)}개")
-    print(f"  - 총 {len(daily_system_logs) + len(daily_user_logs)}개 로그 생성 완료")
-
-print(f"\n총 {log_count}개 로그 생성 완료. 출력 디렉토리: {output_dir}") 
+
+    # 시작 로그는 첫 app 파일, 종료 로그는 마지막 app 파일에 기록
+    hourly = split == 'hourly'
+    first_app = output_name('app', date_str, '00' if hourly else None, compress)
+    last_app = output_name('app', date_str, '23' if hourly else None, compress)
+    file_names = set(file_names) | {first_app, last_app}
+
+    for file_name in sorted(file_names):
+        with open(os.path.join(output_dir, file_name), 'wb') as f:
+            if file_name == first_app:
+                f.write(_encode_line(encode_json(system_start_log), compress))
+            for chunk_index in range(chunk_count):
+                part = part_path(output_dir, file_name, chunk_index)
+                if not os.path.exists(part):
+                    continue
+                with open(part, 'rb') as src:
+                    shutil.copyfileobj(src, f, 1024 * 1024)
+                os.remove(part)
+            if file_name == last_app:
+                f.write(_encode_line(encode_json(system_end_log), compress))
+
+def build_tasks(args, seed):
+    start_date = datetime.strptime(args.start_date, '%Y-%m-%d')
+    end_date = datetime.strptime(args.end_date, '%Y-%m-%d')
+
+    # 날짜 범위 계산
+    date_range = (end_date - start_date).days + 1
+    logs_per_day = args.count // date_range
+
+    # 제품 데이터와 날짜별 세션은 시드에서 한 번만 계산하여 모든 작업에 전달
+    setup_rng = random.Random(f"{seed}:setup")
+    products, users = build_catalog(setup_rng)
+    daily_sessions = build_daily_sessions(setup_rng, date_range, users)
+
+    tasks = []
+    chunks_per_day = {}
+    for day_offset in range(date_range):
+        date_str = (start_date + timedelta(days=day_offset)).strftime('%Y-%m-%d')
+        # 하루치 로그를 chunk_size 단위 조각으로 분할 (조각 구성은 --workers 와 무관)
+        chunk_count = max(1, -(-logs_per_day // args.chunk_size))
+        chunks_per_day[date_str] = chunk_count
+        for chunk_index in range(chunk_count):
+            event_count = min(args.chunk_size, logs_per_day - chunk_index * args.chunk_size)
+            tasks.append((date_str, chunk_index, event_count, daily_sessions[day_offset],
+                          products, seed, args.output_dir, args.split, args.compress))
+    return tasks, chunks_per_day, date_range, logs_per_day
+
+def main():
+    # 명령행 인자 파싱
+    parser = argparse.ArgumentParser(description='가상 로그 생성기')
+    parser.add_argument('--count', type=int, default=100000, help='생성할 로그 수 (기본값: 100000)')
+    parser.add_argument('--output-dir', type=str, default='../logs', help='로그 파일 저장 경로')
+    parser.add_argument('--start-date', type=str, default='2025-03-10', help='시작 날짜 (YYYY-MM-DD)')
+    parser.add_argument('--end-date', type=str, default='2025-03-17', help='종료 날짜 (YYYY-MM-DD)')
+    parser.add_argument('--workers', type=int, default=1, help='생성 프로세스 수 (기본값: 1)')
+    parser.add_argument('--chunk-size', type=int, default=200000, help='작업 하나가 생성할 최대 로그 수 (기본값: 200000)')
+    parser.add_argument('--seed', type=str, default=None, help='난수 시드 (지정하면 항상 같은 로그 생성)')
+    parser.add_argument('--split', choices=['daily', 'hourly'], default='daily',
+                        help='파일 분할 단위 (hourly: app-YYYY-MM-DD_HH.log)')
+    parser.add_argument('--compress', action='store_true', help='gzip 으로 압축하여 저장 (*.log.gz)')
+    args = parser.parse_args()
+
+    # 경로 생성
+    if not os.path.exists(args.output_dir):
+        os.makedirs(args.output_dir)
+
+    seed = args.seed if args.seed is not None else random.SystemRandom().getrandbits(64)
+    tasks, chunks_per_day, date_range, logs_per_day = build_tasks(args, seed)
+
+    print(f"생성 시작: {args.count}개 로그를 {date_range}일에 걸쳐 생성 ({logs_per_day}개/일, 작업 {len(tasks)}개)")
+
+    # 날짜별로 모든 조각이 끝나면 파일을 조립
+    remaining = dict(chunks_per_day)
+    day_stats = {}
+    day_files = {}
+
+    def on_chunk_done(date_str, stats, file_names):
+        totals = day_stats.setdefault(date_str, dict.fromkeys(stats, 0))
+        for key, value in stats.items():
+            totals[key] += value
+        day_files.setdefault(date_str, set()).update(file_names)
+        remaining[date_str] -= 1
+        if remaining[date_str] == 0:
+            assemble_day(args.output_dir, date_str, chunks_per_day[date_str], totals,
+                         day_files.pop(date_str), args.split, args.compress)
+            del day_stats[date_str]
+            print(f"날짜 {date_str} 로그 생성 완료")
+            print(f"  - 시스템 로그: {totals['system'] + 2}개")
+            print(f"  - 사용자 활동 로그: {totals['user']}개")
+            print(f"  - 총 {totals['system'] + 2 + totals['user']}개 로그 생성 완료")
+
+    if args.workers > 1:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            for date_str, _, stats, file_names in executor.map(generate_chunk, tasks):
+                on_chunk_done(date_str, stats, file_names)
+    else:
+        for task in tasks:
+            date_str, _, stats, file_names = generate_chunk(task)
+            on_chunk_done(date_str, stats, file_names)
+
+    print(f"\n총 {args.count}개 로그 생성 완료. 출력 디렉토리: {args.output_dir} (시드: {seed})")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+로그 수집기 단독 실행 스크립트
+gunicorn.conf.py 를 사용하지 않는 배포 환경에서 수집기를 별도 프로세스로 실행할 때 사용
+
+사용 예: python log_collector.py --socket ../logs/log_collector.sock
+"""
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.utils.log_collector import DEFAULT_LOG_DIR, default_socket_path, run_collector
+
+# 명령행 인자 파싱
+parser = argparse.ArgumentParser(description='멀티 프로세스 로그 수집기')
+parser.add_argument('--socket', type=str, default=None, help='Unix 소켓 경로 (기본값: logs/log_collector.sock)')
+parser.add_argument('--log-dir', type=str, default=DEFAULT_LOG_DIR, help='로그 파일 저장 경로')
+parser.add_argument('--buffer-size', type=int, default=1024 * 1024, help='파일별 쓰기 버퍼 크기 (바이트)')
+parser.add_argument('--flush-interval', type=float, default=1.0, help='버퍼 flush 간격 (초)')
+args = parser.parse_args()
+
+run_collector(args.socket or default_socket_path(args.log_dir), args.log_dir, args.buffer_size, args.flush_interval)
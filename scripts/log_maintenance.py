@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+로그 압축 및 보관 기간 정리를 한 번 실행하는 스크립트 (cron 등에서 사용)
+오늘 이전 날짜의 로그는 gzip 으로 압축하고, 보관 기간이 지난 로그는 삭제
+
+사용 예: python log_maintenance.py --log-dir ../logs --retention-days 30
+"""
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.utils.log_maintenance import run_maintenance
+
+# 명령행 인자 파싱
+parser = argparse.ArgumentParser(description='로그 압축 및 보관 기간 정리')
+parser.add_argument('--log-dir', type=str, default='../logs', help='로그 파일 경로')
+parser.add_argument('--retention-days', type=int, default=30, help='보관 기간 (일, 기본값: 30)')
+parser.add_argument('--grace-seconds', type=int, default=600, help='마지막 수정 후 이 시간이 지난 파일만 압축 (초)')
+args = parser.parse_args()
+
+result = run_maintenance(args.log_dir, args.retention_days, args.grace_seconds)
+if result is None:
+    print("다른 프로세스에서 로그 정리를 실행 중입니다.")
+    sys.exit(1)
+
+print(f"압축: {len(result['compressed'])}개")
+for path in result['compressed']:
+    print(f"  - {path}")
+print(f"삭제: {len(result['removed'])}개")
+for path in result['removed']:
+    print(f"  - {path}")
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+시간 범위로 로그 조회 (장애 조사용)
+날짜별 로그 파일 옆에 희소 시간 색인(*.log.idx)을 만들거나 갱신하고, 색인으로 찾은 블록만 mmap 으로 읽음
+
+사용 예: python query_logs.py --log-dir ../logs --source app --start "2025-03-10 14:05" --end "2025-03-10 14:10"
+        python query_logs.py --log-dir ../logs --source user_activity --build   (cron 등에서 색인만 갱신)
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.utils.log_reader import list_log_files
+from app.utils.log_index import LogTimeIndex, iter_time_range
+
+def main():
+    # 명령행 인자 파싱
+    parser = argparse.ArgumentParser(description='시간 범위 로그 조회')
+    parser.add_argument('--log-dir', type=str, default='../logs', help='로그 파일 경로')
+    parser.add_argument('--source', type=str, default='app', choices=['app', 'user_activity'], help='조회할 로그')
+    parser.add_argument('--start', type=str, help='시작 시각 (포함, 예: 2025-03-10T14:05)')
+    parser.add_argument('--end', type=str, help='종료 시각 (미포함, 예: 2025-03-10T14:10)')
+    parser.add_argument('--block-lines', type=int, default=1000, help='색인 항목 간격 (줄, 기본값: 1000)')
+    parser.add_argument('--build', action='store_true', help='조회하지 않고 평문 로그의 색인만 갱신')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+
+    if args.build:
+        for path in list_log_files(args.log_dir, args.source):
+            if path.endswith('.gz'):
+                continue
+            added = LogTimeIndex(path, args.block_lines).update()
+            print(f"{os.path.basename(path)}: 블록 {added}개 추가")
+        print(f"색인 갱신 완료 ({time.perf_counter() - started:.3f}초)", file=sys.stderr)
+        return
+
+    if not args.start or not args.end:
+        parser.error('--start 와 --end 가 필요합니다')
+
+    count = 0
+    for line in iter_time_range(args.log_dir, args.source, args.start, args.end, args.block_lines):
+        print(line)
+        count += 1
+    print(f"조회 완료: {count:,}줄 ({time.perf_counter() - started:.3f}초)", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
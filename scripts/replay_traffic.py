@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+생성된 사용자 활동 로그(generate_log.py 출력)를 실제 HTTP 요청으로 재생하는 부하 생성기
+- 세션별 쿠키를 유지하고 같은 세션의 요청은 순서대로 전송
+- 원래 타임라인을 --speedup 배속으로 재생하거나, --rate 로 초당 요청 수를 고정
+- 엔드포인트별 처리량, 상태 코드, 지연 시간 백분위수 보고
+
+사용 예: python replay_traffic.py --log-dir ../logs --base-url http://localhost:5001 --speedup 3600
+        python replay_traffic.py --log-dir ../logs --local --rate 200 --max-events 20000
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import threading
+from collections import Counter
+from datetime import datetime
+from urllib.parse import urlsplit, quote, urlencode
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.utils.log_reader import list_log_files, iter_lines_by_time
+from app.utils.log_analysis import LatencyHistogram
+
+# 생성기 경로 중 실제 라우트와 다른 경로
+PATH_ALIASES = {
+    '/products': '/products/',
+    '/login': '/auth/login',
+    '/register': '/auth/register',
+    '/profile': '/auth/profile',
+}
+
+class HttpClient:
+    """
+    asyncio 기반 최소 HTTP/1.1 클라이언트 (keep-alive 연결 재사용)
+    리다이렉트는 따라가지 않음 - 엔드포인트 자체의 응답 시간을 측정
+    """
+
+    def __init__(self, base_url, timeout=30.0):
+        parts = urlsplit(base_url)
+        if parts.scheme != 'http':
+            raise ValueError('http:// 주소만 지원합니다')
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.host_header = parts.netloc
+        self.timeout = timeout
+        self._idle = []
+
+    async def _connect(self):
+        while self._idle:
+            reader, writer = self._idle.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return reader, writer
+            writer.close()
+        return await asyncio.open_connection(self.host, self.port)
+
+    async def request(self, method, path, headers=None, body=b''):
+        """:return: (status, [(name, value), ...], body)"""
+        return await asyncio.wait_for(self._request(method, path, headers or {}, body), self.timeout)
+
+    async def _request(self, method, path, headers, body):
+        reader, writer = await self._connect()
+        try:
+            lines = [f"{method} {path} HTTP/1.1", f"Host: {self.host_header}", "Connection: keep-alive"]
+            lines += [f"{name}: {value}" for name, value in headers.items()]
+            if body or method == 'POST':
+                lines.append(f"Content-Length: {len(body)}")
+            writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+            await writer.drain()
+
+            status_line = await reader.readline()
+            if not status_line:
+                raise ConnectionError('서버가 연결을 닫았습니다')
+            version, status = status_line.decode('latin-1').split(' ', 2)[:2]
+
+            response_headers = []
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                response_headers.append((name.strip().lower(), value.strip()))
+            header_map = dict(response_headers)
+
+            if header_map.get('transfer-encoding', '').lower() == 'chunked':
+                chunks = []
+                while True:
+                    size = int((await reader.readline()).split(b';')[0], 16)
+                    if size == 0:
+                        await reader.readline()
+                        break
+                    chunks.append(await reader.readexactly(size))
+                    await reader.readline()
+                response_body = b''.join(chunks)
+                keep_alive = True
+            elif 'content-length' in header_map:
+                response_body = await reader.readexactly(int(header_map['content-length']))
+                keep_alive = True
+            else:
+                response_body = await reader.read()
+                keep_alive = False
+
+            connection = header_map.get('connection', '').lower()
+            if connection == 'close' or (version == 'HTTP/1.0' and connection != 'keep-alive'):
+                keep_alive = False
+        except BaseException:
+            writer.close()
+            raise
+
+        if keep_alive:
+            self._idle.append((reader, writer))
+        else:
+            writer.close()
+        return int(status), response_headers, response_body
+
+    def close(self):
+        for _, writer in self._idle:
+            writer.close()
+        self._idle = []
+
+class CookieJar:
+    """세션별 쿠키 저장 (이름=값만 유지, 만료된 쿠키는 삭제)"""
+
+    def __init__(self):
+        self.cookies = {}
+
+    def update(self, headers):
+        for name, value in headers:
+            if name != 'set-cookie':
+                continue
+            pair, _, attributes = value.partition(';')
+            cookie_name, _, cookie_value = pair.partition('=')
+            attributes = attributes.lower()
+            if not cookie_value or 'max-age=0' in attributes or '01 jan 1970' in attributes:
+                self.cookies.pop(cookie_name.strip(), None)
+            else:
+                self.cookies[cookie_name.strip()] = cookie_value.strip()
+
+    def header(self):
+        return '; '.join(f"{name}={value}" for name, value in self.cookies.items())
+
+def _quote_path(path):
+    return quote(path, safe="/?=&%")
+
+def build_request(record, args):
+    """
+    활동 로그 이벤트 하나를 HTTP 요청으로 변환
+    :return: (집계 라벨, method, path, headers, body) 또는 재생하지 않는 이벤트면 None
+    """
+    event_type = record.get('event_type')
+    form_headers = {'Content-Type': 'application/x-www-form-urlencoded'}
+
+    if event_type in ('page_view', 'view', 'search'):
+        path = record.get('path') or '/'
+        route, _, query = path.partition('?')
+        route = PATH_ALIASES.get(route, route)
+        path = route + ('?' + query if query else '')
+        # 라벨은 라우트 기준 (상품 상세는 ID 와 관계없이 하나로 집계)
+        label = 'GET /products/<id>' if event_type == 'view' else f"GET {route}"
+        return label, 'GET', _quote_path(path), {}, b''
+
+    if event_type == 'cart_add':
+        form = record.get('form') or {}
+        body = urlencode({'product_id': form.get('product_id', record.get('entity_id')),
+                          'quantity': form.get('quantity', 1)}).encode()
+        return 'POST /cart/add', 'POST', '/cart/add', form_headers, body
+
+    if event_type == 'login_success' and args.username:
+        body = urlencode({'username': args.username, 'password': args.password}).encode()
+        return 'POST /auth/login', 'POST', '/auth/login', form_headers, body
+
+    if event_type == 'login_attempt':
+        # 생성기의 로그인 시도는 실패하는 요청으로 재생
+        body = urlencode({'username': record.get('username_attempt') or 'unknown', 'password': 'invalid'}).encode()
+        return 'POST /auth/login', 'POST', '/auth/login', form_headers, body
+
+    if event_type == 'server_dwell_time':
+        event = {
+            'dwell_time_seconds': record.get('dwell_time_seconds', 0),
+            'max_scroll_percentage': record.get('max_scroll_percentage', 0),
+            'path': record.get('current_path'),
+            'referrer': record.get('previous_path'),
+            'product_id': record.get('product_id'),
+        }
+        json_headers = {'Content-Type': 'application/json'}
+        if args.client_log == 'batch':
+            # main.js 와 같이 페이지를 벗어날 때 버퍼의 이벤트를 /api/log/batch 로 전송
+            body = json.dumps({'events': [dict(event, type='dwell_time')]}).encode()
+            return 'POST /api/log/batch', 'POST', '/api/log/batch', json_headers, body
+        return 'POST /api/log/dwell-time', 'POST', '/api/log/dwell-time', json_headers, json.dumps(event).encode()
+
+    return None
+
+class EndpointStats:
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.statuses = Counter()
+        self.errors = Counter()
+
+class Replayer:
+    def __init__(self, client, args):
+        self.client = client
+        self.args = args
+        self.stats = {}
+        self.jars = {}
+        self.session_locks = {}
+        self.semaphore = asyncio.Semaphore(args.concurrency)
+        self.max_lag = 0.0
+        self.sent = 0
+
+    def _stats(self, label):
+        stats = self.stats.get(label)
+        if stats is None:
+            stats = self.stats[label] = EndpointStats()
+        return stats
+
+    async def _send(self, session_id, request):
+        label, method, path, headers, body = request
+        stats = self._stats(label)
+        lock = self.session_locks.setdefault(session_id, asyncio.Lock())
+        try:
+            # 같은 세션의 요청은 쿠키가 일관되도록 순서대로 전송
+            async with lock:
+                jar = self.jars.setdefault(session_id, CookieJar())
+                if session_id != 'no_session' and jar.cookies:
+                    headers = dict(headers, Cookie=jar.header())
+                started = time.perf_counter()
+                try:
+                    status, response_headers, _ = await self.client.request(method, path, headers, body)
+                except asyncio.TimeoutError:
+                    stats.errors['timeout'] += 1
+                    return
+                except (OSError, ConnectionError, ValueError, asyncio.IncompleteReadError) as e:
+                    stats.errors[type(e).__name__] += 1
+                    return
+                stats.latency.add((time.perf_counter() - started) * 1000)
+                stats.statuses[status] += 1
+                if session_id != 'no_session':
+                    jar.update(response_headers)
+        finally:
+            self.semaphore.release()
+
+    async def run(self, events):
+        loop = asyncio.get_running_loop()
+        tasks = set()
+        started = loop.time()
+        first_time = None
+
+        for index, (event_time, record) in enumerate(events):
+            request = build_request(record, self.args)
+            if request is None:
+                continue
+            if first_time is None:
+                first_time = event_time
+
+            # 예정 시각: 고정 비율이면 순번 기준, 아니면 원래 타임라인을 speedup 배속으로
+            if self.args.rate:
+                due = self.sent / self.args.rate
+            else:
+                due = (event_time - first_time).total_seconds() / self.args.speedup
+            if self.args.duration and due > self.args.duration:
+                break
+            delay = started + due - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            # 동시 요청 수 제한 - 서버가 느리면 예정 시각보다 늦어짐 (lag 으로 보고)
+            await self.semaphore.acquire()
+            self.max_lag = max(self.max_lag, loop.time() - (started + due))
+
+            task = asyncio.create_task(self._send(record.get('session_id') or 'no_session', request))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            self.sent += 1
+            if self.args.max_events and self.sent >= self.args.max_events:
+                break
+
+        if tasks:
+            await asyncio.gather(*tasks)
+        return loop.time() - started
+
+def iter_events(paths):
+    """활동 로그를 시간순으로 (datetime, record) 스트리밍"""
+    for timestamp, line in iter_lines_by_time(paths):
+        try:
+            record = json.loads(line)
+            yield datetime.fromisoformat(timestamp), record
+        except ValueError:
+            continue
+
+def start_local_server():
+    """
+    로컬 Flask 서버를 백그라운드 스레드에서 실행 (DATABASE_URL/DB_* 환경 변수 사용)
+    SQLite 이면 테이블이 없을 때 생성
+    :return: base_url
+    """
+    import logging
+    from werkzeug.serving import make_server
+    from app import create_app, db
+
+    # 요청마다 출력되는 접근 로그는 보고서를 가리므로 끔
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+
+    app = create_app()
+    if app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
+        with app.app_context():
+            db.create_all()
+
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, name='replay-local-server', daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}"
+
+def print_report(replayer, elapsed):
+    total = sum(stats.latency.count for stats in replayer.stats.values())
+    errors = sum(sum(stats.errors.values()) for stats in replayer.stats.values())
+    print(f"재생 완료: 요청 {replayer.sent:,}건, 응답 {total:,}건, 오류 {errors:,}건 "
+          f"({elapsed:.2f}초, {total / max(elapsed, 1e-9):,.1f} req/s, 최대 지연 {replayer.max_lag:.2f}초)")
+    print(f"\n  {'엔드포인트':<28}{'건수':>8}{'req/s':>9}{'p50':>9}{'p90':>9}{'p99':>9}{'max 근사':>10}  상태 코드")
+    for label in sorted(replayer.stats):
+        stats = replayer.stats[label]
+        count = stats.latency.count
+        percentiles = stats.latency.percentiles((50, 90, 99, 100))
+        statuses = ', '.join(f"{status}:{n}" for status, n in sorted(stats.statuses.items()))
+        if stats.errors:
+            statuses += ', ' + ', '.join(f"{name}:{n}" for name, n in stats.errors.items())
+        print(f"  {label:<28}{count:>8,}{count / max(elapsed, 1e-9):>9.1f}"
+              f"{percentiles.get(50, 0):>9.1f}{percentiles.get(90, 0):>9.1f}{percentiles.get(99, 0):>9.1f}"
+              f"{percentiles.get(100, 0):>10.1f}  {statuses}")
+    print("  (지연 시간 단위: ms)")
+
+def report_json(replayer, elapsed):
+    return {
+        'elapsed_seconds': elapsed,
+        'sent': replayer.sent,
+        'max_lag_seconds': replayer.max_lag,
+        'endpoints': {
+            label: {
+                'count': stats.latency.count,
+                'rps': stats.latency.count / max(elapsed, 1e-9),
+                'latency_ms': stats.latency.percentiles((50, 90, 95, 99)),
+                'statuses': dict(stats.statuses),
+                'errors': dict(stats.errors),
+            }
+            for label, stats in replayer.stats.items()
+        },
+    }
+
+def main():
+    # 명령행 인자 파싱
+    parser = argparse.ArgumentParser(description='활동 로그 기반 트래픽 재생/부하 생성')
+    parser.add_argument('--log-dir', type=str, default='../logs', help='활동 로그 경로 (generate_log.py 출력)')
+    parser.add_argument('--start-date', type=str, default=None, help='시작 날짜 (YYYY-MM-DD)')
+    parser.add_argument('--end-date', type=str, default=None, help='종료 날짜 (YYYY-MM-DD)')
+    parser.add_argument('--base-url', type=str, default='http://localhost:5001', help='대상 서버 주소')
+    parser.add_argument('--local', action='store_true', help='로컬 Flask 서버를 띄워 대상으로 사용')
+    parser.add_argument('--speedup', type=float, default=1.0, help='원래 타임라인 대비 재생 배속 (기본값: 1)')
+    parser.add_argument('--rate', type=float, default=None, help='초당 요청 수 고정 (지정하면 --speedup 무시)')
+    parser.add_argument('--concurrency', type=int, default=50, help='최대 동시 요청 수 (기본값: 50)')
+    parser.add_argument('--max-events', type=int, default=None, help='보낼 최대 요청 수')
+    parser.add_argument('--duration', type=float, default=None, help='최대 재생 시간 (초)')
+    parser.add_argument('--timeout', type=float, default=30.0, help='요청 타임아웃 (초)')
+    parser.add_argument('--client-log', choices=['batch', 'single'], default='batch',
+                        help='체류 시간 이벤트 전송 방식 (/api/log/batch 또는 /api/log/dwell-time)')
+    parser.add_argument('--username', type=str, default=None, help='login_success 이벤트에 사용할 계정')
+    parser.add_argument('--password', type=str, default=None, help='login_success 이벤트에 사용할 비밀번호')
+    parser.add_argument('--json', type=str, default=None, help='결과를 JSON 파일로 저장')
+    args = parser.parse_args()
+
+    paths = list_log_files(args.log_dir, 'user_activity', args.start_date, args.end_date)
+    if not paths:
+        print("재생할 활동 로그가 없습니다.", file=sys.stderr)
+        sys.exit(1)
+
+    base_url = start_local_server() if args.local else args.base_url
+    print(f"재생 시작: {len(paths)}개 파일 -> {base_url}")
+
+    async def run():
+        client = HttpClient(base_url, args.timeout)
+        replayer = Replayer(client, args)
+        try:
+            elapsed = await replayer.run(iter_events(paths))
+        finally:
+            client.close()
+        return replayer, elapsed
+
+    replayer, elapsed = asyncio.run(run())
+    print_report(replayer, elapsed)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report_json(replayer, elapsed), f, ensure_ascii=False, indent=2)
+        print(f"\n결과 저장: {args.json}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+성능 테스트용 대량 데이터 적재 (database/schema.sql 구조)
+사용자, 다단계 카테고리 트리, 상품, 리뷰, 주문/주문 상세, DB 활동 로그를 배치 단위 multi-row INSERT 로 적재
+MySQL 과 로컬 SQLite 대체 DB 모두 지원 (접속 정보는 --database-url, DATABASE_URL, DB_* 순으로 사용)
+
+사용 예: python seed_database.py --database-url sqlite:////tmp/de_shop.db --create-tables --users 1000000 --products 2000000
+        python seed_database.py --users 0 --category-depth 0 --products 0 --orders 5000000 --seed 7   (기존 데이터에 주문만 추가)
+"""
+import os
+import sys
+import time
+import argparse
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app import db
+import app.models  # noqa: F401 (메타데이터에 테이블 등록)
+from app.utils.db_seeder import DatabaseSeeder, create_seed_engine
+
+def default_database_url():
+    return os.getenv('DATABASE_URL') or f"mysql+pymysql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
+
+def print_progress(table, rows, elapsed):
+    rate = rows / elapsed if elapsed > 0 else 0
+    print(f"\r  {table}: {rows:,}행 ({rate:,.0f}행/초)", end='', file=sys.stderr, flush=True)
+
+def main():
+    # 명령행 인자 파싱
+    parser = argparse.ArgumentParser(description='성능 테스트용 대량 데이터 적재')
+    parser.add_argument('--database-url', type=str, default=None, help='접속 URL (기본값: DATABASE_URL 또는 DB_* 환경 변수)')
+    parser.add_argument('--create-tables', action='store_true', help='테이블이 없으면 모델 정의로 생성 (SQLite 용)')
+    parser.add_argument('--users', type=int, default=10000, help='사용자 수')
+    parser.add_argument('--category-depth', type=int, default=4, help='카테고리 트리 깊이 (0 이면 기존 카테고리 사용)')
+    parser.add_argument('--category-fanout', type=int, default=5, help='카테고리별 하위 카테고리 수')
+    parser.add_argument('--products', type=int, default=50000, help='상품 수')
+    parser.add_argument('--reviews', type=int, default=100000, help='리뷰 수')
+    parser.add_argument('--orders', type=int, default=100000, help='주문 수')
+    parser.add_argument('--activity-logs', type=int, default=500000, help='DB 활동 로그 수')
+    parser.add_argument('--batch-size', type=int, default=5000, help='INSERT 한 번에 적재할 행 수')
+    parser.add_argument('--seed', type=int, default=None, help='난수 시드 (같은 시드면 같은 데이터)')
+    parser.add_argument('--start-date', type=str, default=None, help='생성 데이터 시작 날짜 (YYYY-MM-DD, 기본값: --days 일 전)')
+    parser.add_argument('--days', type=int, default=365, help='생성 데이터의 기간 (일)')
+    parser.add_argument('--product-skew', type=float, default=1.1, help='상품 인기도 Zipf 지수 (0 이면 균등)')
+    parser.add_argument('--user-skew', type=float, default=0.8, help='사용자 구매/활동량 Zipf 지수 (0 이면 균등)')
+    parser.add_argument('--price-median', type=float, default=30000, help='상품 가격 중앙값 (로그 정규 분포)')
+    parser.add_argument('--price-sigma', type=float, default=1.0, help='상품 가격 로그 표준편차')
+    parser.add_argument('--items-per-order', type=float, default=2.5, help='주문당 평균 상품 수')
+    parser.add_argument('--anonymous-ratio', type=float, default=0.3, help='활동 로그 중 비로그인 비율')
+    parser.add_argument('--password', type=str, default='password123', help='생성 사용자 공통 비밀번호')
+    parser.add_argument('--skip-analyze', action='store_true', help='적재 후 통계 갱신(ANALYZE) 생략')
+    args = parser.parse_args()
+
+    engine = create_seed_engine(args.database_url or default_database_url())
+    if args.create_tables:
+        db.metadata.create_all(engine)
+
+    seeder = DatabaseSeeder(
+        engine, db.metadata,
+        seed=args.seed,
+        batch_size=args.batch_size,
+        start_date=datetime.strptime(args.start_date, '%Y-%m-%d').date() if args.start_date else None,
+        days=args.days,
+        product_skew=args.product_skew,
+        user_skew=args.user_skew,
+        price_median=args.price_median,
+        price_sigma=args.price_sigma,
+        items_per_order=args.items_per_order,
+        anonymous_ratio=args.anonymous_ratio,
+        password=args.password,
+        progress=print_progress,
+    )
+
+    started = time.perf_counter()
+    steps = [
+        ('users', args.users, lambda: seeder.seed_users(args.users)),
+        ('categories', args.category_depth, lambda: seeder.seed_categories(args.category_depth, args.category_fanout)),
+        ('products', args.products, lambda: seeder.seed_products(args.products)),
+        ('product_reviews', args.reviews, lambda: seeder.seed_reviews(args.reviews)),
+        ('orders', args.orders, lambda: seeder.seed_orders(args.orders)),
+        ('user_activity_logs', args.activity_logs, lambda: seeder.seed_activity_logs(args.activity_logs)),
+    ]
+    for table, amount, step in steps:
+        if amount > 0:
+            step()
+            print(file=sys.stderr)
+
+    if not args.skip_analyze:
+        seeder.analyze()
+
+    elapsed = time.perf_counter() - started
+    print(f"적재 완료 ({elapsed:.1f}초)")
+    for table, rows in seeder.counts.items():
+        print(f"  {table}: {rows:,}행")
+
+if __name__ == '__main__':
+    main()
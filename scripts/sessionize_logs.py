@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+사용자 활동 로그(user_activity-*.log)를 세션 단위로 묶는 스크립트
+여러 날짜 파일을 시간순으로 병합하고, 비활동 시간(--timeout)이 지나면 세션을 종료하여 JSON Lines 로 출력
+세션 레코드: 페이지 순서, 페이지별 체류 시간, 진입/이탈 페이지, 전환 여부
+
+사용 예: python sessionize_logs.py --log-dir ../logs --start-date 2025-03-10 --end-date 2025-03-17 --output sessions.jsonl
+"""
+import os
+import sys
+import json
+import time
+import argparse
+from datetime import timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.utils.log_reader import list_log_files
+from app.utils.sessionizer import Sessionizer, sessionize_files, CONVERSION_EVENTS, CONVERSION_PATHS
+
+def main():
+    # 명령행 인자 파싱
+    parser = argparse.ArgumentParser(description='사용자 활동 로그 세션화')
+    parser.add_argument('--log-dir', type=str, default='../logs', help='로그 파일 경로')
+    parser.add_argument('--start-date', type=str, default=None, help='시작 날짜 (YYYY-MM-DD)')
+    parser.add_argument('--end-date', type=str, default=None, help='종료 날짜 (YYYY-MM-DD)')
+    parser.add_argument('--timeout', type=float, default=30, help='세션 비활동 시간 (분, 기본값: 30)')
+    parser.add_argument('--max-open-sessions', type=int, default=100000, help='동시에 유지할 최대 세션 수')
+    parser.add_argument('--max-pages', type=int, default=500, help='세션당 기록할 최대 페이지 수')
+    parser.add_argument('--run-size', type=int, default=200000, help='정렬되지 않은 파일의 외부 정렬 단위 (줄)')
+    parser.add_argument('--conversion-event', action='append', default=None,
+                        help=f"전환으로 볼 event_type (기본값: {', '.join(CONVERSION_EVENTS)})")
+    parser.add_argument('--conversion-path', action='append', default=None,
+                        help=f"전환으로 볼 페이지 경로 접두사 (기본값: {', '.join(CONVERSION_PATHS)})")
+    parser.add_argument('--output', type=str, default=None, help='세션 JSON Lines 출력 파일 (기본값: 표준 출력)')
+    args = parser.parse_args()
+
+    paths = list_log_files(args.log_dir, 'user_activity', args.start_date, args.end_date)
+    if not paths:
+        print("분석할 로그 파일이 없습니다.", file=sys.stderr)
+        sys.exit(1)
+
+    sessionizer = Sessionizer(
+        timeout=timedelta(minutes=args.timeout),
+        max_open_sessions=args.max_open_sessions,
+        max_pages=args.max_pages,
+        conversion_events=args.conversion_event or CONVERSION_EVENTS,
+        conversion_paths=args.conversion_path or CONVERSION_PATHS
+    )
+
+    started = time.perf_counter()
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    converted = 0
+    pages = 0
+    try:
+        for session in sessionize_files(paths, sessionizer, args.run_size):
+            converted += session['converted']
+            pages += session['page_count']
+            output.write(json.dumps(session, ensure_ascii=False) + '\n')
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    elapsed = time.perf_counter() - started
+
+    counters = sessionizer.counters
+    sessions = counters['sessions']
+    print(f"세션화 완료: 파일 {len(paths)}개, 이벤트 {counters['events']:,}건 ({elapsed:.2f}초)", file=sys.stderr)
+    print(f"  - 세션: {sessions:,}개 (강제 종료 {counters['evicted']:,}개)", file=sys.stderr)
+    if sessions:
+        print(f"  - 세션당 평균 페이지: {pages / sessions:.2f}", file=sys.stderr)
+        print(f"  - 전환율: {converted / sessions * 100:.2f}%", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
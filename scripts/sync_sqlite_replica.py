@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+로컬 읽기 복제본 테스트용 SQLite 파일 복제 스크립트
+주 DB 파일을 sqlite3 백업 API 로 복제본 파일에 복사 (--interval 을 주면 주기적으로 반복해 복제 지연을 흉내)
+
+사용 예: python sync_sqlite_replica.py --primary /tmp/de_shop.db --replica /tmp/de_shop_replica.db --interval 2
+"""
+import sys
+import time
+import sqlite3
+import argparse
+
+def sync_replica(primary_path, replica_path):
+    """주 DB 의 현재 스냅샷을 복제본 파일에 기록"""
+    source = sqlite3.connect(primary_path)
+    target = sqlite3.connect(replica_path)
+    try:
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
+
+# 명령행 인자 파싱
+parser = argparse.ArgumentParser(description='SQLite 읽기 복제본 동기화')
+parser.add_argument('--primary', type=str, required=True, help='주 DB 파일 경로')
+parser.add_argument('--replica', type=str, required=True, help='복제본 DB 파일 경로')
+parser.add_argument('--interval', type=float, default=0, help='반복 간격 (초, 0 이면 한 번만 실행)')
+args = parser.parse_args()
+
+try:
+    while True:
+        started = time.perf_counter()
+        sync_replica(args.primary, args.replica)
+        print(f"복제 완료: {args.primary} -> {args.replica} ({time.perf_counter() - started:.2f}초)")
+        if args.interval <= 0:
+            break
+        time.sleep(args.interval)
+except KeyboardInterrupt:
+    sys.exit(0)
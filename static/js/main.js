@@ -175,22 +175,21 @@ function setupPageDwellTimeTracking() {
                 referrer: document.referrer || "직접 접속"
             };
             
-            // 비동기로 데이터 전송
-            fetch('/api/log/dwell-time', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify(logData),
-                // 페이지 이탈 중에도 요청이 완료되도록 keepalive 설정
-                keepalive: true
-            }).catch(error => console.error('체류 시간 로깅 오류:', error));
+            // 이벤트 버퍼에 추가 후 즉시 전송 (페이지 이탈 중)
+            queueLogEvent('dwell_time', logData);
+            flushLogEvents();
         }
     }
     
-    // 페이지 이탈 이벤트에 리스너 등록
-    window.addEventListener('beforeunload', logDwellTime);
-    window.addEventListener('pagehide', logDwellTime);
+    // 페이지 이탈 이벤트에 리스너 등록 (한 번만 기록)
+    let dwellTimeLogged = false;
+    function logDwellTimeOnce() {
+        if (dwellTimeLogged) return;
+        dwellTimeLogged = true;
+        logDwellTime();
+    }
+    window.addEventListener('beforeunload', logDwellTimeOnce);
+    window.addEventListener('pagehide', logDwellTimeOnce);
     
     // 클릭 이벤트 추적
     document.addEventListener('click', function(event) {
@@ -219,14 +218,61 @@ function setupPageDwellTimeTracking() {
                 is_cart_action: (nearestButton && nearestButton.textContent?.includes('장바구니')) || false
             };
             
-            // 비동기로 클릭 이벤트 전송
-            fetch('/api/log/click-event', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify(logData)
-            }).catch(error => console.error('클릭 이벤트 로깅 오류:', error));
+            // 이벤트 버퍼에 추가 (일정 개수/시간마다 일괄 전송)
+            queueLogEvent('click_event', logData);
         }
     });
-} 
\ No newline at end of file
+}
+
+// 클라이언트 이벤트 버퍼 - /api/log/batch 로 일괄 전송
+const LOG_BATCH_URL = '/api/log/batch';
+const LOG_BATCH_MAX_EVENTS = 20;        // 버퍼가 이 개수에 도달하면 전송
+const LOG_BATCH_FLUSH_INTERVAL = 10000; // 최대 10초마다 전송
+let logEventBuffer = [];
+let logFlushTimer = null;
+
+// 이벤트를 버퍼에 추가
+function queueLogEvent(type, data) {
+    logEventBuffer.push(Object.assign({ type: type, client_timestamp: new Date().toISOString() }, data));
+    
+    if (logEventBuffer.length >= LOG_BATCH_MAX_EVENTS) {
+        flushLogEvents();
+    } else if (!logFlushTimer) {
+        logFlushTimer = setTimeout(flushLogEvents, LOG_BATCH_FLUSH_INTERVAL);
+    }
+}
+
+// 버퍼의 이벤트를 한 번에 전송
+function flushLogEvents() {
+    if (logFlushTimer) {
+        clearTimeout(logFlushTimer);
+        logFlushTimer = null;
+    }
+    if (logEventBuffer.length === 0) return;
+    
+    const body = JSON.stringify({ events: logEventBuffer });
+    logEventBuffer = [];
+    
+    // sendBeacon은 페이지 이탈 중에도 전송이 보장됨
+    if (navigator.sendBeacon && navigator.sendBeacon(LOG_BATCH_URL, new Blob([body], { type: 'application/json' }))) {
+        return;
+    }
+    
+    // sendBeacon을 사용할 수 없으면 keepalive fetch로 대체
+    fetch(LOG_BATCH_URL, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: body,
+        keepalive: true
+    }).catch(error => console.error('이벤트 일괄 로깅 오류:', error));
+}
+
+// 탭이 숨겨지거나 페이지를 떠날 때 남은 이벤트 전송
+document.addEventListener('visibilitychange', function() {
+    if (document.visibilityState === 'hidden') {
+        flushLogEvents();
+    }
+});
+window.addEventListener('pagehide', flushLogEvents); 
\ No newline at end of file